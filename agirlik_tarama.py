@@ -0,0 +1,264 @@
+import sys
+import os
+import time
+import argparse
+import warnings
+import numpy as np
+from simulasyon import (YapayZekaSurucusu, MCDMKararVerici, AKSIYON_LISTESI, MODEL_DOSYA_ADI, YZ_AGIRLIGI,
+                        karar_matrisleri_toplu)
+from veri_yukleyici import bloklari_oku, VARSAYILAN_BLOK
+from bolum_kaydi import bolum_oku
+
+# ---------- TOPSIS AĞIRLIĞI / FÜZYON ORANI TARAMASI ----------
+# Kayıtlı veri (CSV/.f32 veri seti ya da .bkd bölüm kaydı) üzerinde ağırlık/füzyon ızgarasını çevrimdışı dener.
+# Ağırlıktan bağımsız ara sonuçlar satır başına bir kez hesaplanır:
+#   - normalize karar matrisi (N, 4, 3) ile ideal ve negatif ideal (N, 1, 3); w >= 0 iken ağırlıklı
+#     matrisin ideali w * (normalize ideal) ile bit düzeyinde aynıdır (çarpma yuvarlaması monotondur)
+#   - KNN olasılıkları (N, 4) tek toplu çağrıyla; istenirse (--onbellek) diske önbelleklenir
+# G ağırlık seti için uzaklıklar MCDMKararVerici.topsis_hesapla ile aynı işlem sırasıyla (kriter kriter
+# w çarpımı, fark, kare, soldan toplama) hesaplanır: skorlar canlı yolla aynıdır, yakın eşitlikler de aynı
+# eyleme düşer. Her füzyon oranı bir karışım + argmax'a iner.
+# Kararlar kayıtlı etiketle ve varsayılan ayarların (MCDMKararVerici, YZ_AGIRLIGI) kararıyla karşılaştırılır.
+
+KRITERLER = ("mesafe", "hiz", "risk")
+VARSAYILAN_YZ_AGIRLIKLARI = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)
+ARA_DIZI_SINIRI = 1 << 22   # alt blokta (satır x 4 x ayar) eleman sayısı üst sınırı
+TOPSIS_BLOGU = 128          # topsis_izgara ara dizilerinin satır sayısı (4 x 128 x ayar, önbellekte kalır)
+
+def agirlik_izgarasi(adim, ekle=()):
+    # Toplamı 1 olan, adim katlarından oluşan tüm (w_mesafe, w_hiz, w_risk) üçlüleri
+    n = int(round(1 / adim))
+    izgara = [(i / n, j / n, (n - i - j) / n) for i in range(n + 1) for j in range(n + 1 - i)]
+    for w in ekle:
+        if not any(np.allclose(w, g) for g in izgara):
+            izgara.append(tuple(w))
+    return np.array(izgara)
+
+def kayitlari_oku(yol, blok_boyu=VARSAYILAN_BLOK):
+    # (X (n, 42), etiket indeksleri (n,)) blokları; .bkd kaydında etiket kayıtlı karardır
+    if yol.endswith(".bkd"):
+        _, kareler = bolum_oku(yol)
+        for bas in range(0, len(kareler), blok_boyu):
+            blok = kareler[bas:bas + blok_boyu]
+            yield np.column_stack((blok["lidar"], blok["hiz"], blok["ivme"])), blok["aksiyon"].astype(np.int8)
+        return
+    yield from bloklari_oku(yol, blok_boyu)
+
+def topsis_ara_sonuclari(lidar, hiz, impacts):
+    # Ağırlıktan bağımsız kısım: normalize matris (N, 4, 3), ideal ve negatif ideal (N, 1, 3)
+    matrisler, _ = karar_matrisleri_toplu(np.asarray(lidar, dtype=np.float64), np.asarray(hiz, dtype=np.float64))
+    payda = np.sqrt(np.sum(matrisler**2, axis=1, keepdims=True))
+    payda[payda == 0] = 1
+    normal = matrisler / payda
+    en_buyuk = normal.max(axis=1, keepdims=True); en_kucuk = normal.min(axis=1, keepdims=True)
+    fayda = np.asarray(impacts) == 1
+    return normal, np.where(fayda, en_buyuk, en_kucuk), np.where(fayda, en_kucuk, en_buyuk)
+
+def topsis_izgara(normal, ideal, negatif_ideal, agirliklar, blok=TOPSIS_BLOGU):
+    # (eylem, satır, ayar) düzeninde TOPSIS skorları; her ağırlık seti için MCDMKararVerici.topsis_hesapla ile
+    # aynı işlem sırası: sqrt(((n0*w0 - i0*w0)^2 + (n1*w1 - i1*w1)^2) + (n2*w2 - i2*w2)^2). Ara diziler
+    # blok satırlık parçalarda önbellekte kalır
+    N, E, K = normal.shape
+    G = len(agirliklar)
+    skorlar = np.empty((E, N, G))
+    normal = np.ascontiguousarray(np.moveaxis(normal, 1, 0))   # (eylem, satır, kriter)
+    ideal = ideal[:, 0, :]; negatif_ideal = negatif_ideal[:, 0, :]
+    agirlikli, fark = np.empty((E, blok, G)), np.empty((E, blok, G))
+    dist_pos, dist_neg = np.empty((E, blok, G)), np.empty((E, blok, G))
+    for bas in range(0, N, blok):
+        n = min(blok, N - bas); sl = slice(bas, bas + n)
+        a, f, dp, dn = agirlikli[:, :n], fark[:, :n], dist_pos[:, :n], dist_neg[:, :n]
+        for c in range(K):
+            w = agirliklar[:, c]
+            np.multiply(normal[:, sl, c, None], w, out=a)
+            for hedef, uzaklik in ((ideal, dp), (negatif_ideal, dn)):
+                kare = f if c else uzaklik
+                np.subtract(a, hedef[sl, c, None] * w, out=kare); np.square(kare, out=kare)
+                if c:
+                    uzaklik += kare
+        np.sqrt(dp, out=dp); np.sqrt(dn, out=dn)
+        dp += dn
+        dp[dp == 0] = 1
+        np.divide(dn, dp, out=skorlar[:, sl])
+    return skorlar
+
+def _argmax_ilk_eksen(skorlar):
+    # np.argmax(skorlar, axis=0) ile aynı (eşitlikte ilk indeks), int8; 4 eylem için eleme usulü
+    s0, s1, s2, s3 = skorlar
+    sol = (s1 > s0).view(np.int8); sag = (s3 > s2).view(np.int8) + np.int8(2)
+    return np.where(np.maximum(s2, s3) > np.maximum(s0, s1), sag, sol)
+
+def onbellek_yolu(veri_yolu, model_dosyasi):
+    model_adi = os.path.splitext(os.path.basename(model_dosyasi))[0]
+    return f"{os.path.splitext(veri_yolu)[0]}.{model_adi}.olasilik.npy"
+
+def knn_olasiliklari(veri_yolu, yz_surucu, satir_sayisi=None, blok_boyu=VARSAYILAN_BLOK, onbellek=False):
+    # Tüm satırlar için (N, 4) float64 KNN olasılıkları (canlı füzyonla aynı hassasiyet: yakın eşitlikler
+    # aynı yöne düşer). onbellek: veri dosyasının yanındaki <veri>.<model>.olasilik.npy okunur/yazılır;
+    # geçerliyse diskten memmap ile okunur
+    yol = onbellek_yolu(veri_yolu, yz_surucu.model_dosyasi)
+    if (onbellek and os.path.exists(yol) and os.path.getmtime(yol) >= os.path.getmtime(veri_yolu)
+            and os.path.getmtime(yol) >= os.path.getmtime(yz_surucu.model_dosyasi)):
+        olasiliklar = np.load(yol, mmap_mode="r")
+        if olasiliklar.dtype == np.float64 and (satir_sayisi is None or len(olasiliklar) == satir_sayisi):
+            print(f"BİLGİ: KNN olasılıkları önbellekten okundu: '{yol}'")
+            return olasiliklar
+    baslangic = time.perf_counter()
+    parcalar = []
+    for X, _ in kayitlari_oku(veri_yolu, blok_boyu):
+        parcalar.append(yz_surucu.olasiliklari_getir_toplu(np.nan_to_num(X)))
+        print(f"\r[İŞLEM] KNN olasılıkları: {sum(len(p) for p in parcalar)} satır", end="", flush=True)
+    olasiliklar = np.concatenate(parcalar) if parcalar else np.zeros((0, len(AKSIYON_LISTESI)))
+    print(f"\r[İŞLEM] KNN olasılıkları: {len(olasiliklar)} satır, {time.perf_counter() - baslangic:.1f} sn")
+    if onbellek:
+        np.save(yol, olasiliklar)
+        print(f"BİLGİ: Önbellek yazıldı: '{yol}'")
+    return olasiliklar
+
+def tara(veri_yolu, agirliklar, yz_agirliklari, yz_surucu=None, impacts=None, referans=None,
+         blok_boyu=VARSAYILAN_BLOK, onbellek=False):
+    """Her (ağırlık, füzyon oranı) ayarı için etiket uyumu, referans uyumu ve eylem dağılımını sayar.
+
+    Dönüş sözlüğündeki diziler (füzyon oranı, ağırlık seti[, eylem]) boyutludur.
+    """
+    impacts = MCDMKararVerici().impacts if impacts is None else np.asarray(impacts)
+    referans_w, referans_a = referans if referans is not None else (MCDMKararVerici().weights, YZ_AGIRLIGI)
+    yz_agirliklari = np.asarray(yz_agirliklari, dtype=np.float64)
+    olasiliklar = None
+    if yz_surucu is not None and yz_surucu.egitildi:
+        olasiliklar = knn_olasiliklari(veri_yolu, yz_surucu, blok_boyu=blok_boyu, onbellek=onbellek)
+    A, G, E = len(yz_agirliklari), len(agirliklar), len(AKSIYON_LISTESI)
+    etiket_uyumu = np.zeros((A, G), dtype=np.int64)
+    referans_uyumu = np.zeros((A, G), dtype=np.int64)
+    dagilim = np.zeros((A, G, E), dtype=np.int64)
+    referans_dagilim = np.zeros(E, dtype=np.int64)
+    satir = 0
+    alt_blok = max(1, ARA_DIZI_SINIRI // (E * (G + 1)))
+
+    baslangic = time.perf_counter()
+    for X, y in kayitlari_oku(veri_yolu, blok_boyu):
+        X = np.nan_to_num(np.asarray(X, dtype=np.float64))
+        for bas in range(0, len(X), alt_blok):
+            Xb = X[bas:bas + alt_blok]; yb = np.asarray(y[bas:bas + alt_blok], dtype=np.int8)
+            n = len(Xb)
+            ara = topsis_ara_sonuclari(Xb[:, :-2], Xb[:, -2], impacts)
+            # (eylem, satır, ayar) düzeni: eylem dilimleri bitişik, argmax karşılaştırma zinciriyle
+            skorlar = topsis_izgara(*ara, np.vstack((agirliklar, referans_w)))
+            P = None if olasiliklar is None else np.asarray(olasiliklar[satir + bas:satir + bas + n], dtype=np.float64).T
+            # Referans karar: yz_surucu yoksa füzyon uygulanmaz (Simulasyon ile aynı)
+            ref_skor = skorlar[:, :, -1] if P is None else skorlar[:, :, -1] * (1 - referans_a) + P * referans_a
+            ref_karar = np.argmax(ref_skor, axis=0).astype(np.int8)
+            referans_dagilim += np.bincount(ref_karar, minlength=E)
+            skorlar = skorlar[:, :, :-1]
+            tampon = np.empty_like(skorlar)
+            for ai, a in enumerate(yz_agirliklari):
+                # Simulasyon.karar_ver ile aynı işlem sırası: s * (1 - a) + p * a (yakın eşitlikler aynı yöne düşer)
+                if P is None or a == 0:
+                    final = skorlar
+                else:
+                    final = np.multiply(skorlar, 1 - a, out=tampon); final += (P * a)[:, :, None]
+                karar = _argmax_ilk_eksen(final)                       # (n, G)
+                etiket_uyumu[ai] += (karar == yb[:, None]).sum(axis=0)
+                referans_uyumu[ai] += (karar == ref_karar[:, None]).sum(axis=0)
+                for e in range(E):
+                    dagilim[ai, :, e] += (karar == e).sum(axis=0)
+        satir += len(X)
+    sure = time.perf_counter() - baslangic
+    return {"satir": satir, "sure": sure, "agirliklar": agirliklar, "yz_agirliklari": yz_agirliklari,
+            "etiket_uyumu": etiket_uyumu, "referans_uyumu": referans_uyumu, "dagilim": dagilim,
+            "referans": (np.asarray(referans_w, dtype=float), referans_a), "referans_dagilim": referans_dagilim}
+
+def _satir(w, a, etiket, ref, dagilim, n):
+    return (f"{w[0]:>7.2f}{w[1]:>7.2f}{w[2]:>7.2f}{a:>6.2f} |{100 * etiket / n:>8.2f}{100 * ref / n:>8.2f} |"
+            + "".join(f"{100 * d / n:>12.1f}" for d in dagilim))
+
+def rapor_yazdir(sonuc, en_iyi=10):
+    n = max(sonuc["satir"], 1)
+    agirliklar, yz_agirliklari = sonuc["agirliklar"], sonuc["yz_agirliklari"]
+    baslik = (f"{'w_' + KRITERLER[0]:>7}{'w_hiz':>7}{'w_risk':>7}{'yz':>6} |{'etiket%':>8}{'ref%':>8} |"
+              + "".join(f"{ad + '%':>12}" for ad in AKSIYON_LISTESI))
+    ref_w, ref_a = sonuc["referans"]
+    # Referans ayar ızgarada varsa kendi satırı, yoksa yalnızca dağılımı yazılır
+    ai = np.flatnonzero(np.isclose(yz_agirliklari, ref_a))
+    gi = np.flatnonzero(np.all(np.isclose(agirliklar, ref_w), axis=1))
+
+    print(f"\n--- Referans ayar: ağırlıklar {ref_w.tolist()}, YZ ağırlığı {ref_a} ---")
+    print(baslik)
+    if len(ai) and len(gi):
+        a, g = ai[0], gi[0]
+        print(_satir(agirliklar[g], ref_a, sonuc["etiket_uyumu"][a, g], sonuc["referans_uyumu"][a, g],
+                     sonuc["dagilim"][a, g], n))
+    else:
+        print(f"{'(ızgara dışında)':>27} |{'':>8}{100.0:>8.2f} |" + "".join(f"{100 * d / n:>12.1f}" for d in sonuc["referans_dagilim"]))
+
+    sira = np.argsort(-sonuc["etiket_uyumu"], axis=None, kind="stable")[:en_iyi]
+    print(f"\n--- Kayıtlı etiketle en uyumlu {len(sira)} ayar ({sonuc['etiket_uyumu'].size} ayar içinden) ---")
+    print(baslik)
+    for a, g in zip(*np.unravel_index(sira, sonuc["etiket_uyumu"].shape)):
+        print(_satir(agirliklar[g], yz_agirliklari[a], sonuc["etiket_uyumu"][a, g], sonuc["referans_uyumu"][a, g],
+                     sonuc["dagilim"][a, g], n))
+
+    print("\n--- Füzyon oranına göre en iyi ağırlıklar ---")
+    print(baslik)
+    for a, oran in enumerate(yz_agirliklari):
+        g = int(np.argmax(sonuc["etiket_uyumu"][a]))
+        print(_satir(agirliklar[g], oran, sonuc["etiket_uyumu"][a, g], sonuc["referans_uyumu"][a, g],
+                     sonuc["dagilim"][a, g], n))
+
+def csv_yaz(sonuc, yol):
+    n = max(sonuc["satir"], 1)
+    with open(yol, "w", encoding="utf-8") as f:
+        f.write(",".join([f"w_{k}" for k in KRITERLER] + ["yz_agirligi", "etiket_uyumu", "referans_uyumu"]
+                         + [f"oran_{ad}" for ad in AKSIYON_LISTESI]) + "\n")
+        for a, oran in enumerate(sonuc["yz_agirliklari"]):
+            for g, w in enumerate(sonuc["agirliklar"]):
+                degerler = list(w) + [oran, sonuc["etiket_uyumu"][a, g] / n, sonuc["referans_uyumu"][a, g] / n]
+                degerler += (sonuc["dagilim"][a, g] / n).tolist()
+                f.write(",".join(f"{v:.6g}" for v in degerler) + "\n")
+
+def ana():
+    parser = argparse.ArgumentParser(description="TOPSIS ağırlıklarını ve füzyon oranını kayıtlı veri üzerinde tarar")
+    parser.add_argument("veri", help="Veri seti (.csv / .f32) ya da bölüm kaydı (.bkd)")
+    parser.add_argument("--model", default=MODEL_DOSYA_ADI, help="KNN modeli ('' = yalnızca TOPSIS)")
+    parser.add_argument("--agirlik-adimi", type=float, default=0.1, help="Ağırlık ızgarası adımı (toplam 1)")
+    parser.add_argument("--yz-agirliklari", type=float, nargs="+", default=list(VARSAYILAN_YZ_AGIRLIKLARI),
+                        help="Denenecek füzyon oranları (KNN ağırlığı)")
+    parser.add_argument("--en-iyi", type=int, default=10, help="Listelenecek en iyi ayar sayısı")
+    parser.add_argument("--blok", type=int, default=VARSAYILAN_BLOK, help="Okuma blok boyu (satır)")
+    parser.add_argument("--onbellek", action="store_true",
+                        help="KNN olasılıklarını veri dosyasının yanında <veri>.<model>.olasilik.npy olarak önbellekle")
+    parser.add_argument("--cikti", default=None, help="Tüm ayarların sonuçlarını bu CSV'ye yaz")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.veri):
+        print(f"HATA: '{args.veri}' bulunamadı.")
+        return 1
+    warnings.filterwarnings("ignore")
+    yz_surucu = YapayZekaSurucusu(model_dosyasi=args.model) if args.model else None
+    yz_agirliklari = args.yz_agirliklari
+    if yz_surucu is None or not yz_surucu.egitildi:
+        yz_surucu = None
+        yz_agirliklari = [0.0]
+        print("BİLGİ: Model yok; yalnızca TOPSIS ağırlıkları taranıyor.")
+    mcdm = MCDMKararVerici()
+    agirliklar = agirlik_izgarasi(args.agirlik_adimi, ekle=[mcdm.weights])
+    referans = (mcdm.weights, YZ_AGIRLIGI if yz_surucu is not None else 0.0)
+
+    print(f"[İŞLEM] {len(agirliklar)} ağırlık seti x {len(yz_agirliklari)} füzyon oranı taranıyor...")
+    try:
+        sonuc = tara(args.veri, agirliklar, yz_agirliklari, yz_surucu, referans=referans,
+                     blok_boyu=args.blok, onbellek=args.onbellek)
+    except ValueError as e:
+        print(f"HATA: {e}")
+        return 1
+    rapor_yazdir(sonuc, args.en_iyi)
+    ayar_sayisi = len(agirliklar) * len(yz_agirliklari)
+    print(f"\n[SONUÇ] {sonuc['satir']} satır x {ayar_sayisi} ayar {sonuc['sure']:.2f} sn'de değerlendirildi "
+          f"({sonuc['satir'] * ayar_sayisi / max(sonuc['sure'], 1e-9) / 1e6:.1f} M karar/sn).")
+    if args.cikti:
+        csv_yaz(sonuc, args.cikti)
+        print(f"BİLGİ: Tüm sonuçlar '{args.cikti}' dosyasına yazıldı.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(ana())
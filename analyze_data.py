@@ -1,22 +1,283 @@
-import pandas as pd
+import sys
+import os
+import json
+import time
+import argparse
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from simulasyon import CSV_DOSYA_ADI, LIDAR_ACILAR, LIDAR_MESAFE, MAKS_HIZ, AKSIYON_LISTESI
+from veri_yukleyici import bloklari_oku, parcalara_bol, VARSAYILAN_BLOK
+from veri_toplayici import isci_hazirla
 
-try:
-    df = pd.read_csv('veri_seti.csv', header=None)
-    
-    # sayıya çeviriyoruz ve hata olursa 300 yap çünkü max mesafe 300
-    X = df.iloc[:, :-1].apply(pd.to_numeric, errors='coerce').fillna(300)
-    y = df.iloc[:, -1]
-    
-    # tüm girdiler 300 (veya 300'e yakın) olan satırları filtrele
-    mask = (X == 300).all(axis=1)
-    
-    empty_road_data = y[mask]
-    
-    print(f"Toplam satır: {len(df)}")
-    print(f"Tüm girdiler 300 (veya 300'e yakın) olan satır sayısı: {len(empty_road_data)}")
-    print("Etiket dağılımı:")
-    print(empty_road_data.value_counts())
-    
-except Exception as e:
-    print(f"Hata: {e}")
+# ---------- AKAN VERİ SETİ ANALİZİ ----------
+# Veri seti(leri) tek geçişte, bloklar halinde işlenir; her parça (dosya aralığı) ayrı süreçte
+# sabit boyutlu, birleştirilebilir bir VeriIstatistikleri üretir ve sonunda bunlar birleştirilir.
+# Bellek kullanımı satır sayısından bağımsızdır:
+#   - ışın / HIZ / IVME dağılımları sabit kutulu histogramlardır
+#   - tekrar ve etiket çelişkisi, ayrık girdilerin sınırlı bir örneklemi (AyrikOrneklem) üzerinden
+#     tahmin edilir; ayrık girdi sayısı kapasitenin altındaysa sonuçlar kesindir
+# "Birebir aynı" girdi CSV hassasiyetinde (0.1) karşılaştırılır; "neredeyse aynı" girdi, ışınların
+# YAKIN_ADIMLAR ile kabalaştırılmış halinin aynı olmasıdır.
+
+ISIN_KUTU_SAYISI = 25                 # [0, LIDAR_MESAFE) aralığında 10 px'lik kutular
+HIZ_KUTU_SAYISI = 20
+IVME_ARALIGI = (-200.0, 100.0)        # main.py'deki ivmeler -150 .. 50
+IVME_KUTU_SAYISI = 30
+ORNEKLEM_KAPASITESI = 1 << 16
+YAKIN_ADIMLAR = (10.0, 5.0, 10.0)     # lidar (px), hız, ivme kabalaştırma adımları
+BILINMEYEN = len(AKSIYON_LISTESI)     # sınıf sayaçlarında tanınmayan etiket kutusu
+
+_CARPAN = np.uint64(0x9E3779B97F4A7C15)
+
+def satir_ozetleri(anahtar):
+    # (n, d) tamsayı anahtar satırlarının 64 bitlik özetleri (sütun sütun çarp-karıştır + splitmix64 sonu)
+    sutunlar = np.ascontiguousarray(anahtar, dtype=np.int64).view(np.uint64)
+    h = np.zeros(len(sutunlar), dtype=np.uint64)
+    for j in range(sutunlar.shape[1]):
+        h = (h ^ sutunlar[:, j]) * _CARPAN
+        h ^= h >> np.uint64(29)
+    h ^= h >> np.uint64(33); h *= np.uint64(0xFF51AFD7ED558CCD)
+    h ^= h >> np.uint64(33); h *= np.uint64(0xC4CEB9FE1A85EC53)
+    h ^= h >> np.uint64(33)
+    return h
+
+
+class AyrikOrneklem:
+    # Ayrık anahtarlardan özeti en küçük 'kapasite' tanesini (KMV örneklemi) tam tekrar sayısı ve
+    # etiket maskesiyle tutar. Bir anahtarın bütün tekrarları aynı özete sahip olduğundan örneğe
+    # giren anahtarın sayacı kesindir; örneklem anahtar kümesinin düzgün bir örneğidir.
+    def __init__(self, kapasite=ORNEKLEM_KAPASITESI):
+        self.kapasite = kapasite
+        self.ozetler = np.zeros(0, dtype=np.uint64)
+        self.sayilar = np.zeros(0, dtype=np.int64)
+        self.maskeler = np.zeros(0, dtype=np.uint8)
+
+    def dolu(self):
+        return len(self.ozetler) >= self.kapasite
+
+    def ekle(self, ozetler, sayilar, maskeler):
+        if self.dolu():
+            secili = ozetler <= self.ozetler[-1]
+            ozetler, sayilar, maskeler = ozetler[secili], sayilar[secili], maskeler[secili]
+        ozetler = np.concatenate((self.ozetler, ozetler))
+        if len(ozetler) == 0:
+            return
+        sira = np.argsort(ozetler, kind="stable")
+        ozetler = ozetler[sira]
+        sayilar = np.concatenate((self.sayilar, sayilar))[sira]
+        maskeler = np.concatenate((self.maskeler, maskeler))[sira]
+        bas = np.flatnonzero(np.r_[True, ozetler[1:] != ozetler[:-1]])
+        self.ozetler = ozetler[bas][:self.kapasite]
+        self.sayilar = np.add.reduceat(sayilar, bas)[:self.kapasite]
+        self.maskeler = np.bitwise_or.reduceat(maskeler, bas)[:self.kapasite]
+
+    def birlestir(self, diger):
+        self.ekle(diger.ozetler, diger.sayilar, diger.maskeler)
+
+    def ayrik_tahmini(self):
+        # Dolu değilse kesin sayı; doluysa KMV tahmini (k - 1) / (k. en küçük özet / 2^64)
+        if not self.dolu():
+            return float(len(self.ozetler))
+        return (self.kapasite - 1) / (float(self.ozetler[-1]) / 2.0**64)
+
+    def ozet(self, satir):
+        ayrik = self.ayrik_tahmini()
+        if len(self.ozetler) == 0:
+            return {"ayrik": 0.0, "tekrar_orani": 0.0, "tekrarlanan_girdi_orani": 0.0,
+                    "celiskili_girdi_orani": 0.0, "celiskili_satir_orani": 0.0, "kesin": True}
+        etiket_sayisi = np.unpackbits(self.maskeler[:, None], axis=1).sum(axis=1)
+        celiskili = etiket_sayisi > 1
+        return {"ayrik": ayrik,
+                "tekrar_orani": max(0.0, 1.0 - ayrik / max(satir, 1)),               # önceki bir satırın tekrarı olan satırlar
+                "tekrarlanan_girdi_orani": float(np.mean(self.sayilar > 1)),          # birden çok kez görülen ayrık girdiler
+                "celiskili_girdi_orani": float(np.mean(celiskili)),                   # farklı etiketlerle görülen ayrık girdiler
+                "celiskili_satir_orani": float(self.sayilar[celiskili].sum() / self.sayilar.sum()),
+                "kesin": not self.dolu()}
+
+
+class VeriIstatistikleri:
+    def __init__(self, kapasite=ORNEKLEM_KAPASITESI, yakin_adimlar=YAKIN_ADIMLAR):
+        isin_sayisi = len(LIDAR_ACILAR)
+        self.yakin_adimlar = yakin_adimlar
+        self.satir = 0
+        self.eksik = 0                                           # en az bir eksik değer içeren satır
+        self.sinif = np.zeros(BILINMEYEN + 1, dtype=np.int64)
+        self.bos_yol_sinif = np.zeros(BILINMEYEN + 1, dtype=np.int64)   # tüm ışınlar menzilde
+        self.isin_hist = np.zeros((isin_sayisi, ISIN_KUTU_SAYISI), dtype=np.int64)
+        self.isin_bos = np.zeros(isin_sayisi, dtype=np.int64)           # çarpma yok (mesafe >= menzil)
+        self.isin_toplam = np.zeros(isin_sayisi)                         # çarpan ışınların mesafe toplamı
+        self.hiz_hist = np.zeros(HIZ_KUTU_SAYISI, dtype=np.int64)
+        self.ivme_hist = np.zeros(IVME_KUTU_SAYISI, dtype=np.int64)
+        self.moment = np.zeros((2, 2))                                   # HIZ/IVME için (toplam, kare toplam)
+        self.en_kucuk = np.full(2, np.inf); self.en_buyuk = np.full(2, -np.inf)
+        self.tam = AyrikOrneklem(kapasite)
+        self.yakin = AyrikOrneklem(kapasite)
+
+    def blok_isle(self, X, y):
+        n = len(X)
+        if n == 0:
+            return
+        self.satir += n
+        eksik = np.isnan(X)
+        self.eksik += int(eksik.any(axis=1).sum())
+        # Eksik ışın boş yol (menzil), eksik hız/ivme 0 sayılır
+        lidar = np.where(eksik[:, :-2], LIDAR_MESAFE, X[:, :-2]).astype(np.float64)
+        hiz_ivme = np.where(eksik[:, -2:], 0.0, X[:, -2:]).astype(np.float64)
+        sinif = np.where((y >= 0) & (y < BILINMEYEN), y, BILINMEYEN).astype(np.intp)
+        self.sinif += np.bincount(sinif, minlength=BILINMEYEN + 1)
+
+        bos = lidar >= LIDAR_MESAFE
+        self.bos_yol_sinif += np.bincount(sinif[bos.all(axis=1)], minlength=BILINMEYEN + 1)
+        self.isin_bos += bos.sum(axis=0)
+        self.isin_toplam += np.where(bos, 0.0, lidar).sum(axis=0)
+        r = lidar.shape[1]
+        kutu = np.clip((lidar * (ISIN_KUTU_SAYISI / LIDAR_MESAFE)).astype(np.intp), 0, ISIN_KUTU_SAYISI - 1)
+        duz = (np.arange(r) * ISIN_KUTU_SAYISI + kutu)[~bos]
+        self.isin_hist += np.bincount(duz, minlength=r * ISIN_KUTU_SAYISI).reshape(r, ISIN_KUTU_SAYISI)
+
+        self.hiz_hist += np.histogram(np.clip(hiz_ivme[:, 0], 0, MAKS_HIZ), HIZ_KUTU_SAYISI, (0, MAKS_HIZ))[0]
+        self.ivme_hist += np.histogram(np.clip(hiz_ivme[:, 1], *IVME_ARALIGI), IVME_KUTU_SAYISI, IVME_ARALIGI)[0]
+        self.moment[:, 0] += hiz_ivme.sum(axis=0); self.moment[:, 1] += (hiz_ivme**2).sum(axis=0)
+        self.en_kucuk = np.minimum(self.en_kucuk, hiz_ivme.min(axis=0))
+        self.en_buyuk = np.maximum(self.en_buyuk, hiz_ivme.max(axis=0))
+
+        # Tekrar / çelişki örneklemleri; bilinmeyen etiket maskede 7. bit
+        maske = np.left_shift(1, np.minimum(sinif, 7)).astype(np.uint8)
+        birler = np.ones(n, dtype=np.int64)
+        tam_anahtar = np.rint(np.column_stack((lidar, hiz_ivme)) * 10).astype(np.int64)
+        self.tam.ekle(satir_ozetleri(tam_anahtar), birler, maske)
+        isin_adim, hiz_adim, ivme_adim = self.yakin_adimlar
+        yakin_anahtar = np.column_stack((np.floor(lidar / isin_adim), np.floor(hiz_ivme[:, 0] / hiz_adim),
+                                         np.floor(hiz_ivme[:, 1] / ivme_adim))).astype(np.int64)
+        self.yakin.ekle(satir_ozetleri(yakin_anahtar), birler, maske)
+
+    def birlestir(self, diger):
+        for ad in ("satir", "eksik", "sinif", "bos_yol_sinif", "isin_hist", "isin_bos", "isin_toplam",
+                   "hiz_hist", "ivme_hist", "moment"):
+            setattr(self, ad, getattr(self, ad) + getattr(diger, ad))
+        self.en_kucuk = np.minimum(self.en_kucuk, diger.en_kucuk)
+        self.en_buyuk = np.maximum(self.en_buyuk, diger.en_buyuk)
+        self.tam.birlestir(diger.tam)
+        self.yakin.birlestir(diger.yakin)
+        return self
+
+    def dagilim_ozeti(self, i, hist, aralik):
+        n = max(self.satir, 1)
+        ortalama = self.moment[i, 0] / n
+        sapma = np.sqrt(max(self.moment[i, 1] / n - ortalama**2, 0.0))
+        return {"ortalama": float(ortalama), "std": float(sapma), "min": float(self.en_kucuk[i]),
+                "maks": float(self.en_buyuk[i]), "aralik": list(aralik), "histogram": hist.tolist()}
+
+    def sozluk(self):
+        cakisan = self.isin_hist.sum(axis=1)
+        return {"satir": self.satir, "eksik_satir": self.eksik,
+                "sinif": dict(zip(AKSIYON_LISTESI + ["?"], self.sinif.tolist())),
+                "bos_yol_sinif": dict(zip(AKSIYON_LISTESI + ["?"], self.bos_yol_sinif.tolist())),
+                "isin": {"menzil": LIDAR_MESAFE, "kutu_sayisi": ISIN_KUTU_SAYISI, "histogram": self.isin_hist.tolist(),
+                         "carpma_yok": self.isin_bos.tolist(),
+                         "ortalama_carpma": (self.isin_toplam / np.maximum(cakisan, 1)).tolist()},
+                "hiz": self.dagilim_ozeti(0, self.hiz_hist, (0.0, MAKS_HIZ)),
+                "ivme": self.dagilim_ozeti(1, self.ivme_hist, IVME_ARALIGI),
+                "birebir_tekrar": self.tam.ozet(self.satir),
+                "yakin_tekrar": dict(self.yakin.ozet(self.satir), adimlar=list(self.yakin_adimlar))}
+
+
+def _parca_analiz_et(gorev):
+    yol, aralik, blok, kapasite, yakin_adimlar = gorev
+    istatistik = VeriIstatistikleri(kapasite, yakin_adimlar)
+    for X, y in bloklari_oku(yol, blok, aralik=aralik):
+        istatistik.blok_isle(X, y)
+    return istatistik
+
+def analiz_et(yollar, isci=None, parca=None, blok=VARSAYILAN_BLOK, kapasite=ORNEKLEM_KAPASITESI,
+              yakin_adimlar=YAKIN_ADIMLAR):
+    isci = isci or os.cpu_count() or 1
+    parca = parca or isci
+    gorevler = [(yol, aralik, blok, kapasite, yakin_adimlar) for yol in yollar for aralik in parcalara_bol(yol, parca)]
+    toplam = VeriIstatistikleri(kapasite, yakin_adimlar)
+    if isci == 1 or len(gorevler) <= 1:
+        for gorev in gorevler:
+            toplam.birlestir(_parca_analiz_et(gorev))
+    else:
+        with ProcessPoolExecutor(max_workers=min(isci, len(gorevler)), initializer=isci_hazirla) as havuz:
+            for istatistik in havuz.map(_parca_analiz_et, gorevler):
+                toplam.birlestir(istatistik)
+    return toplam
+
+_SEVIYELER = " .:-=+*#%@"
+
+def cubuk(hist):
+    # Histogramı tek satırlık yoğunluk şeridine çevirir
+    tepe = max(int(np.max(hist)), 1) if len(hist) else 1
+    return "".join(_SEVIYELER[min(int(np.ceil(h / tepe * (len(_SEVIYELER) - 1))), len(_SEVIYELER) - 1)] for h in hist)
+
+def rapor_yazdir(istatistik):
+    s = istatistik.sozluk()
+    n = max(s["satir"], 1)
+    print(f"Toplam satır: {s['satir']} (eksik değer içeren: {s['eksik_satir']})")
+
+    print("\n--- Sınıf Dengesi ---")
+    for ad, sayi in s["sinif"].items():
+        if ad != "?" or sayi:
+            print(f"  {ad:<12}{sayi:>10} (%{100 * sayi / n:5.1f})  {'#' * round(40 * sayi / n)}")
+    bos_toplam = sum(s["bos_yol_sinif"].values())
+    print(f"  Tüm ışınları {LIDAR_MESAFE} (maksimum menzil) olan satır: {bos_toplam} -> "
+          + ", ".join(f"{ad}: {sayi}" for ad, sayi in s["bos_yol_sinif"].items() if sayi))
+
+    print(f"\n--- Işın Mesafe Dağılımları (0-{LIDAR_MESAFE} px, {ISIN_KUTU_SAYISI} kutu) ---")
+    print(f"  {'ışın':>4} {'açı':>6} {'çarpma%':>8} {'ort.':>6}  dağılım")
+    for i, aci in enumerate(LIDAR_ACILAR):
+        carpma = 100 * (1 - s["isin"]["carpma_yok"][i] / n)
+        print(f"  {i:>4} {np.degrees(aci):>6.1f} {carpma:>8.1f} {s['isin']['ortalama_carpma'][i]:>6.1f}  "
+              f"|{cubuk(s['isin']['histogram'][i])}|")
+
+    print("\n--- HIZ / IVME ---")
+    for ad in ("hiz", "ivme"):
+        d = s[ad]
+        print(f"  {ad.upper():<5} ort {d['ortalama']:8.2f}  std {d['std']:7.2f}  min {d['min']:8.2f}  maks {d['maks']:8.2f}"
+              f"  [{d['aralik'][0]:g}, {d['aralik'][1]:g}] |{cubuk(d['histogram'])}|")
+
+    print("\n--- Tekrar ve Etiket Çelişkisi ---")
+    for ad, baslik in (("birebir_tekrar", "Birebir aynı girdi"), ("yakin_tekrar", "Neredeyse aynı girdi")):
+        t = s[ad]
+        print(f"  {baslik} ({'kesin' if t['kesin'] else 'örneklem tahmini'}): ayrık girdi ~{t['ayrik']:.0f}, "
+              f"tekrar eden satır %{100 * t['tekrar_orani']:.2f}, birden çok görülen girdi %{100 * t['tekrarlanan_girdi_orani']:.2f}")
+        print(f"    çelişkili etiketli girdi %{100 * t['celiskili_girdi_orani']:.2f} "
+              f"(bu girdilere düşen satır %{100 * t['celiskili_satir_orani']:.2f})")
+    return s
+
+def ana():
+    parser = argparse.ArgumentParser(description="Veri setini tek geçişte, sınırlı bellekle ve paralel analiz eder")
+    parser.add_argument("veri", nargs="*", default=[CSV_DOSYA_ADI], help="Veri seti(leri) (.csv veya ikili .f32)")
+    parser.add_argument("--isci", type=int, default=None, help="İşçi süreç sayısı (varsayılan: çekirdek sayısı)")
+    parser.add_argument("--parca", type=int, default=None, help="Dosya başına parça sayısı (varsayılan: işçi sayısı)")
+    parser.add_argument("--blok", type=int, default=VARSAYILAN_BLOK, help="Okuma blok boyu (satır)")
+    parser.add_argument("--orneklem", type=int, default=ORNEKLEM_KAPASITESI,
+                        help="Tekrar/çelişki tahmini için tutulan ayrık girdi sayısı")
+    parser.add_argument("--yakin-adimlar", type=float, nargs=3, default=YAKIN_ADIMLAR,
+                        help="Neredeyse aynı girdi için lidar/hız/ivme kabalaştırma adımları")
+    parser.add_argument("--json", default=None, help="Raporu ayrıca bu JSON dosyasına yaz")
+    args = parser.parse_args()
+
+    for yol in args.veri:
+        if not os.path.exists(yol):
+            print(f"HATA: '{yol}' bulunamadı.")
+            return 1
+    baslangic = time.perf_counter()
+    try:
+        istatistik = analiz_et(args.veri, isci=args.isci, parca=args.parca, blok=args.blok,
+                               kapasite=args.orneklem, yakin_adimlar=tuple(args.yakin_adimlar))
+    except ValueError as e:
+        print(f"HATA: {e}")
+        return 1
+    sure = time.perf_counter() - baslangic
+    s = rapor_yazdir(istatistik)
+    print(f"\n[SONUÇ] {s['satir']} satır {sure:.2f} sn'de analiz edildi ({s['satir'] / max(sure, 1e-9):.0f} satır/sn).")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(s, f, ensure_ascii=False, indent=2)
+        print(f"BİLGİ: Rapor '{args.json}' dosyasına yazıldı.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(ana())
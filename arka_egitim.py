@@ -0,0 +1,126 @@
+import os
+import time
+import threading
+import multiprocessing
+from simulasyon import MODEL_DOSYA_ADI
+from knn_cikarim import prototip_sema_yolu
+
+# ---------- ARKA PLAN YENİDEN EĞİTİMİ ----------
+# Kayıt sürerken son eğitimden beri esik kadar yeni satır yazıldığında egitici.modeli_egit ayrı bir
+# süreçte çalıştırılır (spawn: pygame süreci fork edilmez). Süreç veri dosyasının o anki boyutuna kadar
+# olan satırları okur, modeli geçici dosyaya yazıp os.replace ile model dosyasının yerine koyar.
+# Model dosyası sürücünün kullandığı dosyadır: prototip modeli (knn_prototip.bin) yine prototip
+# modeli olarak yeniden üretilir, tam KNN'ye dönüşmez.
+# Çıkarım motoru (KD-ağacı vb.) da o süreçte kurulur: kurulum GIL'i yüzlerce ms tutabilir, sonucu
+# açmak ise birkaç ms'dir. Kare döngüsü guncelle() ile yalnızca hazır model/motor çiftini
+# YapayZekaSurucusu'na atar (takas). Aynı anda en fazla bir eğitim sürer.
+
+YENIDEN_EGITIM_ESIGI = 500
+
+def _surec_hazirla():
+    # Eğitim kare döngüsüyle aynı çekirdekleri paylaşır: düşük öncelik, tek BLAS/OpenMP iş parçacığı
+    if hasattr(os, "nice"):
+        os.nice(10)
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(1)
+    except ImportError:
+        pass
+
+def _egit(veri_dosyasi, model_dosyasi, boyut, gecici):
+    # egitici (sklearn) yalnızca eğitim sürecine yüklenir
+    from egitici import modeli_egit
+    from knn_cikarim import KNNCikarimMotoru
+    sonuc = modeli_egit(veri_dosyasi, model_dosyasi, boyut=boyut, gecici=gecici)
+    baslangic = time.perf_counter()
+    model = sonuc["model"]
+    sonuc["motor"] = KNNCikarimMotoru(model) if KNNCikarimMotoru.destekleniyor(model) else None
+    sonuc["motor_sure"] = time.perf_counter() - baslangic
+    return sonuc
+
+def model_satiri(model):
+    # Modelin referans (eğitim) satırı sayısı; prototip modelinde prototip sayısı
+    if model is None:
+        return 0
+    if hasattr(model, "etiketler"):
+        return len(model.etiketler)
+    return int(getattr(model, "n_samples_fit_", 0))
+
+
+class ArkaPlanEgitici:
+    def __init__(self, yz_surucu, veri_dosyasi, model_dosyasi=None, esik=YENIDEN_EGITIM_ESIGI):
+        self.yz_surucu = yz_surucu
+        self.veri_dosyasi = veri_dosyasi
+        # Verilmezse sürücünün yüklediği dosya yeniden eğitilir
+        model_dosyasi = model_dosyasi or yz_surucu.model_dosyasi or MODEL_DOSYA_ADI
+        self.model_dosyasi = model_dosyasi
+        self.esik = esik
+        self.gecici = f"{model_dosyasi}.{os.getpid()}.gecici"   # kapatmada yarım kalan yazım silinir
+        self._kilit = threading.Lock()
+        # Süreç baştan başlatılır: spawn maliyeti (~20 ms) ilk eğitimde kare döngüsüne binmesin
+        self._havuz = multiprocessing.get_context("spawn").Pool(1, initializer=_surec_hazirla)
+        self._suruyor = False
+        self._hazir = None        # _egit sonucu; havuzun sonuç iş parçacığında doldurulur
+        self._son_satir = 0       # son eğitim başlatılırken kaydedicinin satır sayısı
+
+        # Panel ölçümleri
+        self.surum = 0            # oturumdaki takas sayısı (0: başlangıç modeli)
+        self.satir = model_satiri(yz_surucu.model)
+        self.takas_ms = 0.0       # kare döngüsünde takasın süresi
+        self.son_sonuc = None     # son takas edilen eğitimin bilgileri (satır, K, doğruluk, süreler)
+        self.hata = None
+
+    def _baslat(self, kaydedici):
+        kaydedici.bosalt()   # tampondaki satırlar da bu eğitime girsin
+        self._son_satir = kaydedici.satir_sayisi
+        if not os.path.exists(self.veri_dosyasi):
+            return
+        self._suruyor = True
+        self._havuz.apply_async(_egit, (self.veri_dosyasi, self.model_dosyasi, os.path.getsize(self.veri_dosyasi),
+                                        self.gecici),
+                                callback=self._egitim_bitti, error_callback=self._egitim_basarisiz)
+
+    def _egitim_bitti(self, sonuc):
+        with self._kilit:
+            self._hazir = sonuc
+            self._suruyor = False
+
+    def _egitim_basarisiz(self, hata):
+        print(f"UYARI: Arka plan eğitimi başarısız, mevcut model kullanılmaya devam ediliyor: {hata}")
+        with self._kilit:
+            self.hata = str(hata)
+            self._suruyor = False
+
+    def guncelle(self, kaydedici):
+        # Her karede çağrılır: hazır model varsa takas eder (True döner), yoksa gerekirse eğitimi başlatır
+        with self._kilit:
+            hazir, self._hazir = self._hazir, None
+            suruyor = self._suruyor
+        if hazir is not None:
+            model, motor = hazir.pop("model"), hazir.pop("motor")
+            baslangic = time.perf_counter()
+            self.yz_surucu.modeli_ayarla(model, motor)
+            self.takas_ms = (time.perf_counter() - baslangic) * 1000.0
+            self.surum += 1
+            self.satir = hazir["satir"]
+            self.son_sonuc = hazir
+            self.hata = None
+            return True
+        if not suruyor and kaydedici.satir_sayisi - self._son_satir >= self.esik:
+            self._baslat(kaydedici)
+        return False
+
+    def ozet(self):
+        # Panel için: model sürümü, eğitim satırı, son takas süresi ve durum
+        durum = "EĞİTİLİYOR" if self._suruyor else ("HATA" if self.hata else "")
+        return {"surum": self.surum, "satir": self.satir, "takas_ms": self.takas_ms, "durum": durum}
+
+    def kapat(self):
+        # Süren eğitim beklenmez; model dosyası os.replace sayesinde ya eski ya yeni haliyle kalır
+        if self._havuz is not None:
+            self._havuz.terminate()
+            self._havuz.join()
+            self._havuz = None
+        for dosya in (self.gecici, prototip_sema_yolu(self.gecici)):
+            if os.path.exists(dosya):
+                os.remove(dosya)
@@ -0,0 +1,91 @@
+import time
+import threading
+import numpy as np
+
+# ---------- ASENKRON KARAR İŞÇİSİ ----------
+# Sensör anlık görüntüleri tek yuvalı bir kutuya bırakılır; arka plan iş parçacığı her seferinde
+# en yenisini alıp karar fonksiyonunu (TOPSIS + KNN + füzyon) çalıştırır. Ana döngü en son kararı
+# kullanır. Karar, istenen kareden bayatlik_siniri kareden daha eskiyse ana döngü taze kararı bekler
+# (bayatlik_siniri=0 eşzamanlı çalışmaya eşdeğerdir).
+
+
+class AsenkronKararVerici:
+    def __init__(self, karar_fn, bayatlik_siniri=2, gecmis=256):
+        self.karar_fn = karar_fn
+        self.bayatlik_siniri = bayatlik_siniri
+        self._kosul = threading.Condition()
+        self._bekleyen = None    # (kare, gönderim zamanı, girdiler); işçi almadan yenisi gelirse üzerine yazılır
+        self._son = None         # (kare, sonuç veya hata)
+        self._calisiyor = True
+
+        # Ölçümler
+        self.gecikmeler = np.zeros(gecmis)   # gönderimden sonucun hazır olmasına kadar (sn), halka tampon
+        self._gecikme_idx = 0
+        self._gecikme_dolu = 0
+        self.atlanan = 0         # hiç karar verilmeden üzerine yazılan anlık görüntüler
+        self.bekleme = 0         # bayatlık sınırı yüzünden ana döngünün beklediği kareler
+        self.son_yas = 0         # kullanılan kararın yaşı (kare)
+
+        self._is = threading.Thread(target=self._dongu, name="karar-iscisi", daemon=True)
+        self._is.start()
+
+    def _dongu(self):
+        while True:
+            with self._kosul:
+                while self._bekleyen is None and self._calisiyor:
+                    self._kosul.wait()
+                if not self._calisiyor:
+                    return
+                kare, zaman, girdiler = self._bekleyen
+                self._bekleyen = None
+            try:
+                sonuc = self.karar_fn(*girdiler)
+            except Exception as e:   # hata ana iş parçacığında karar_al ile yeniden fırlatılır
+                sonuc = e
+            gecikme = time.perf_counter() - zaman
+            with self._kosul:
+                self._son = (kare, sonuc)
+                self.gecikmeler[self._gecikme_idx] = gecikme
+                self._gecikme_idx = (self._gecikme_idx + 1) % len(self.gecikmeler)
+                self._gecikme_dolu = min(self._gecikme_dolu + 1, len(self.gecikmeler))
+                self._kosul.notify_all()
+
+    def gonder(self, kare, *girdiler):
+        # Girdiler işçiye devredilir; çağıran bunları sonradan değiştirmemelidir
+        with self._kosul:
+            if self._bekleyen is not None:
+                self.atlanan += 1
+            self._bekleyen = (kare, time.perf_counter(), girdiler)
+            self._kosul.notify_all()
+
+    def _bayat(self, kare):
+        return self._son is None or kare - self._son[0] > self.bayatlik_siniri
+
+    def karar_al(self, kare):
+        # En son karar; 'kare'ye göre bayatlık sınırını aşıyorsa yenisi gelene kadar bekler
+        with self._kosul:
+            if self._bayat(kare):
+                self.bekleme += 1
+                while self._bayat(kare):
+                    if not self._is.is_alive():
+                        raise RuntimeError("Karar işçisi durmuş")
+                    self._kosul.wait(0.5)
+            son_kare, sonuc = self._son
+        if isinstance(sonuc, Exception):
+            raise sonuc
+        self.son_yas = kare - son_kare
+        return sonuc
+
+    def ozet(self):
+        # Panel için: gecikme p50/p95 (ms), son kararın yaşı, atlanan ve beklenen kareler
+        with self._kosul:
+            gecikmeler = self.gecikmeler[:self._gecikme_dolu].copy()
+        p50, p95 = np.percentile(gecikmeler, (50, 95)) * 1000.0 if len(gecikmeler) else (0.0, 0.0)
+        return {"gecikme_p50": float(p50), "gecikme_p95": float(p95), "yas": self.son_yas,
+                "atlanan": self.atlanan, "bekleme": self.bekleme}
+
+    def kapat(self):
+        with self._kosul:
+            self._calisiyor = False
+            self._kosul.notify_all()
+        self._is.join(timeout=1.0)
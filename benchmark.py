@@ -0,0 +1,237 @@
+import sys
+import os
+import io
+import json
+import math
+import time
+import random
+import platform
+import argparse
+import tempfile
+import warnings
+import contextlib
+import numpy as np
+
+from lidar import engel_dizisi, lidar_tara, lidar_tara_izgara, UzamsalIzgara, ArtimsalLidar
+from simulasyon import (Simulasyon, YapayZekaSurucusu, MCDMKararVerici, CSV_DOSYA_ADI, LIDAR_MESAFE,
+                        LIDAR_ACILAR, FPS, engelleri_rastgele_olustur, karar_matrisi_olustur, line_rect_collision)
+from vektorel_dunya import VektorelDunya
+from veri_yukleyici import tamamini_yukle, etiket_adlari
+
+# ---------- BENCHMARK SÜİTİ ----------
+# Sabit tohumlu senaryolarla sıcak yolları ölçer ve makinece okunabilir JSON yazar:
+#   raycast (tarama/sn), TOPSIS (skor/sn), KNN (çıkarım/sn), ekransız simülasyon (adım/sn), eğitim (sn)
+# --karsilastir ile kayıtlı bir referansa göre oranlar raporlanır; tolerans aşılırsa çıkış kodu 1.
+
+TOHUM = 1234
+VARSAYILAN_CIKTI = "benchmark_sonuclari.json"
+
+# Senaryolar: (ışın sayısı, engel sayısı)
+RAYCAST_SENARYOLARI = [(40, 12), (360, 12), (40, 200), (360, 200)]
+# Kare dizisi senaryoları (engel sayısı): hareketli bölümde tam ve artımsal tarama
+KARE_DIZISI_SENARYOLARI = [3, 12, 40]
+KARE_DIZISI_UZUNLUGU = 300
+# KNN model boyutları: veri setinden alt örnek / tamamı / gürültülü 10x çoğaltma
+KNN_MODEL_BOYUTLARI = ["1000", "tam", "x10"]
+SIM_SENARYOLARI = [("matematik", 12), ("hibrit", 12), ("matematik", 200)]
+VEKTOREL_ORTAMLAR = [64, 1024]
+
+
+def olc(fn, is_sayisi=1, min_sure=0.2, tekrar=5):
+    # fn'i en az min_sure boyunca döngüde çalıştırır; tekrarların medyan hızını (iş/sn) döndürür
+    fn()
+    hizlar = []
+    for _ in range(tekrar):
+        n = 0
+        baslangic = time.perf_counter()
+        while True:
+            fn(); n += 1
+            gecen = time.perf_counter() - baslangic
+            if gecen >= min_sure:
+                break
+        hizlar.append(n * is_sayisi / gecen)
+    return float(np.median(hizlar))
+
+
+def _dunya(engel_sayisi, tohum):
+    rng = random.Random(tohum)
+    engeller = engelleri_rastgele_olustur(engel_sayisi, rng)
+    for e in engeller:
+        e.rect.x -= 250   # engeller aracın görüş konisine girsin
+    return engeller
+
+
+def raycast_olc(sonuclar, hizli):
+    for isin, engel in RAYCAST_SENARYOLARI:
+        acilar = np.linspace(-60, 60, isin) * math.pi / 180
+        engeller = _dunya(engel, TOHUM)
+        x, y, yon = 100.0, 325.0, 0.0
+        ad = f"r{isin}_m{engel}"
+
+        def referans():
+            for aci in acilar:
+                dx, dy = math.cos(yon + aci), math.sin(yon + aci)
+                min_k = 1.0
+                for e in engeller:
+                    k = line_rect_collision(x, y, x + dx*LIDAR_MESAFE, y + dy*LIDAR_MESAFE, e.rect)
+                    if k and k < min_k: min_k = k
+        if not hizli or isin * engel <= 40 * 200:
+            sonuclar[f"raycast/dongu/{ad}"] = (olc(referans, min_sure=0.1, tekrar=3), "tarama/sn")
+
+        sonuclar[f"raycast/vektorel/{ad}"] = (olc(lambda: lidar_tara(x, y, yon, engel_dizisi(engeller), acilar, LIDAR_MESAFE)), "tarama/sn")
+
+        izgara = UzamsalIzgara()
+        for e in engeller: izgara.ekle(e)
+        sonuclar[f"raycast/izgara/{ad}"] = (olc(lambda: lidar_tara_izgara(x, y, yon, izgara, acilar, LIDAR_MESAFE)), "tarama/sn")
+
+    # Ardışık karelerde (araç ve engeller hareket ederken) tam tarama ile artımsal tarama
+    for engel in KARE_DIZISI_SENARYOLARI:
+        sim = Simulasyon(yz_surucu=YapayZekaSurucusu(model_dosyasi=None), engel_sayisi=engel, tohum=TOHUM, izgara=False)
+        kareler = []
+        for _ in range(KARE_DIZISI_UZUNLUGU):
+            sim.adim(1.0 / FPS)
+            kareler.append((sim.arac.x, sim.arac.y, sim.arac.yon,
+                            [(e.rect.left, e.rect.top, e.rect.right, e.rect.bottom) for e in sim.engeller]))
+
+        def tam():
+            for x, y, yon, kutular in kareler:
+                lidar_tara(x, y, yon, np.array(kutular), LIDAR_ACILAR, LIDAR_MESAFE)
+        def artimsal():
+            artimsal_lidar = ArtimsalLidar(LIDAR_ACILAR, LIDAR_MESAFE)
+            for x, y, yon, kutular in kareler:
+                artimsal_lidar.tara(x, y, yon, kutular)
+        sonuclar[f"raycast/kare_tam/m{engel}"] = (olc(tam, is_sayisi=len(kareler)), "tarama/sn")
+        sonuclar[f"raycast/kare_artimsal/m{engel}"] = (olc(artimsal, is_sayisi=len(kareler)), "tarama/sn")
+
+
+def topsis_olc(sonuclar, hizli):
+    rng = np.random.default_rng(TOHUM)
+    mcdm = MCDMKararVerici()
+    matris, _ = karar_matrisi_olustur(list(rng.uniform(0, LIDAR_MESAFE, len(LIDAR_ACILAR))), 50.0)
+    sonuclar["topsis/tekil"] = (olc(lambda: mcdm.topsis_hesapla(matris)), "skor/sn")
+    for b in (1024,) if hizli else (1024, 65536):
+        yigin = np.stack([karar_matrisi_olustur(list(rng.uniform(0, LIDAR_MESAFE, len(LIDAR_ACILAR))), h)[0]
+                          for h in rng.uniform(0, 100, b)])
+        sonuclar[f"topsis/toplu_{b}"] = (olc(lambda: mcdm.topsis_hesapla_toplu(yigin), is_sayisi=b), "skor/sn")
+
+
+def knn_modelleri(X, y, boyutlar):
+    from sklearn.neighbors import KNeighborsClassifier
+    rng = np.random.default_rng(TOHUM)
+    modeller = {}
+    for boyut in boyutlar:
+        if boyut == "tam":
+            Xb, yb = X, y
+        elif boyut.startswith("x"):
+            kat = int(boyut[1:])
+            Xb = np.tile(X, (kat, 1)) + rng.normal(0, 1.0, (len(X) * kat, X.shape[1])).astype(np.float32)
+            yb = np.tile(y, kat)
+        else:
+            secim = rng.choice(len(X), size=min(int(boyut), len(X)), replace=False)
+            Xb, yb = X[secim], y[secim]
+        modeller[boyut] = KNeighborsClassifier(n_neighbors=3).fit(Xb, yb)
+    return modeller
+
+
+def knn_olc(sonuclar, modeller, X):
+    sorgular = X[np.random.default_rng(TOHUM).integers(0, len(X), 64)].astype(np.float64)
+    sorgu_listeleri = [(q[:-2].tolist(), float(q[-2]), float(q[-1])) for q in sorgular]
+    for boyut, model in modeller.items():
+        yz = YapayZekaSurucusu(model_dosyasi=None)
+        yz.modeli_ayarla(model)
+        motor = yz.motor
+        def sorgula():
+            for q in sorgu_listeleri: yz.olasiliklari_getir(*q)
+        sonuclar[f"knn/motor/{boyut}"] = (olc(sorgula, is_sayisi=len(sorgular)), "çıkarım/sn")
+        yz.motor = None
+        sonuclar[f"knn/predict_proba/{boyut}"] = (olc(sorgula, is_sayisi=len(sorgular), min_sure=0.1, tekrar=3), "çıkarım/sn")
+        yz.motor = motor
+
+
+def sim_olc(sonuclar, modeller, hizli):
+    min_sure = 0.2 if hizli else 1.0
+    for mod, engel in SIM_SENARYOLARI:
+        yz = YapayZekaSurucusu(model_dosyasi=None)
+        if mod == "hibrit":
+            yz.modeli_ayarla(modeller["tam"])
+        sim = Simulasyon(yz_surucu=yz, engel_sayisi=engel, tohum=TOHUM)
+        sonuclar[f"sim/{mod}/m{engel}"] = (olc(lambda: sim.calistir(50, 1.0 / FPS), is_sayisi=50, min_sure=min_sure), "adım/sn")
+    for n in VEKTOREL_ORTAMLAR:
+        dunya = VektorelDunya(n, tohum=TOHUM, yz_surucu=YapayZekaSurucusu(model_dosyasi=None))
+        sonuclar[f"sim/vektorel/n{n}"] = (olc(lambda: dunya.calistir(5, 1.0 / FPS), is_sayisi=5 * n, min_sure=min_sure), "ortam-adım/sn")
+
+
+def egitim_olc(sonuclar, veri_yolu):
+    import egitici
+    with tempfile.TemporaryDirectory() as gecici:
+        baslangic = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            egitici.modeli_egit_ve_raporla(veri_yolu, model_dosya_adi=os.path.join(gecici, "model.pkl"))
+        sonuclar["egitim/egitici"] = (time.perf_counter() - baslangic, "sn")
+
+
+def karsilastir(sonuclar, referans_yolu, tolerans):
+    # Oran > 1 daha iyi demektir (süre ölçülerinde ters çevrilir)
+    with open(referans_yolu, "r", encoding="utf-8") as f:
+        referans = json.load(f)["sonuclar"]
+    gerileme = 0
+    print(f"\n{'ÖLÇÜM':<34}{'REFERANS':>14}{'ŞİMDİ':>14}{'ORAN':>8}")
+    for ad, kayit in sonuclar.items():
+        if ad not in referans:
+            continue
+        eski, yeni = referans[ad]["deger"], kayit["deger"]
+        oran = (eski / yeni) if kayit["birim"] == "sn" else (yeni / eski)
+        isaret = ""
+        if oran < 1 - tolerans:
+            isaret = "  <-- GERİLEME"; gerileme += 1
+        print(f"{ad:<34}{eski:>14.1f}{yeni:>14.1f}{oran:>7.2f}x{isaret}")
+    return gerileme
+
+
+def ana():
+    parser = argparse.ArgumentParser(description="Simülasyon ve karar sıcak yolları için benchmark süiti")
+    parser.add_argument("--veri", default=CSV_DOSYA_ADI, help="KNN modellerinin ve eğitimin kurulacağı veri seti")
+    parser.add_argument("--cikti", default=VARSAYILAN_CIKTI, help="Sonuç JSON dosyası")
+    parser.add_argument("--karsilastir", default=None, help="Karşılaştırılacak referans JSON")
+    parser.add_argument("--tolerans", type=float, default=0.10, help="İzin verilen göreli yavaşlama")
+    parser.add_argument("--hizli", action="store_true", help="Kısa koşu (daha az senaryo/süre)")
+    parser.add_argument("--grup", nargs="*", default=["raycast", "topsis", "knn", "sim", "egitim"],
+                        help="Çalıştırılacak gruplar")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    np.random.seed(TOHUM); random.seed(TOHUM)
+    ham = {}
+    print("[İŞLEM] Benchmark çalışıyor...")
+    if "raycast" in args.grup: raycast_olc(ham, args.hizli)
+    if "topsis" in args.grup: topsis_olc(ham, args.hizli)
+    if "knn" in args.grup or "sim" in args.grup:
+        X, y = tamamini_yukle(args.veri)
+        bilinen = y >= 0   # tanınmayan AKSIYON etiketleri
+        X, y = X[bilinen], y[bilinen]
+        boyutlar = KNN_MODEL_BOYUTLARI[:2] if args.hizli else KNN_MODEL_BOYUTLARI
+        modeller = knn_modelleri(np.asarray(X), etiket_adlari(y), boyutlar)
+        if "knn" in args.grup: knn_olc(ham, modeller, np.asarray(X))
+        if "sim" in args.grup: sim_olc(ham, modeller, args.hizli)
+    if "egitim" in args.grup: egitim_olc(ham, args.veri)
+
+    sonuclar = {ad: {"deger": deger, "birim": birim} for ad, (deger, birim) in ham.items()}
+    for ad, kayit in sonuclar.items():
+        print(f"  {ad:<34}{kayit['deger']:>14.1f} {kayit['birim']}")
+
+    cikti = {"ortam": {"python": platform.python_version(), "numpy": np.__version__,
+                       "platform": platform.platform(), "cpu": os.cpu_count(),
+                       "tarih": time.strftime("%Y-%m-%d %H:%M:%S"), "hizli": args.hizli, "tohum": TOHUM},
+             "sonuclar": sonuclar}
+    with open(args.cikti, "w", encoding="utf-8") as f:
+        json.dump(cikti, f, ensure_ascii=False, indent=2)
+    print(f"[SONUÇ] Sonuçlar '{args.cikti}' dosyasına yazıldı.")
+
+    if args.karsilastir:
+        gerileme = karsilastir(sonuclar, args.karsilastir, args.tolerans)
+        print(f"\n[SONUÇ] {gerileme} ölçümde %{args.tolerans*100:.0f} üzeri gerileme.")
+        return 1 if gerileme else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(ana())
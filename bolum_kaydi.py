@@ -0,0 +1,101 @@
+import json
+import struct
+import numpy as np
+from simulasyon import LIDAR_ACILAR, LIDAR_MESAFE, AKSIYON_LISTESI, AKSIYON_DICT
+
+# ---------- BÖLÜM KAYDI ----------
+# Simülasyonun kare kare ikili kaydı. Dosya düzeni:
+#   "OTBK" | başlık uzunluğu (uint32, little-endian) | JSON başlık | sabit boyutlu kare kayıtları
+# Başlıkta tohum, engel/ışın sayısı, TOPSIS ağırlıkları, füzyon oranı ve model bilgisi bulunur.
+# Kararın girdileri (lidar, hız, ivme) ve dt float64 saklanır ki tekrar oynatmada karar birebir
+# yeniden üretilebilsin; çizim/inceleme amaçlı alanlar (konum, engeller, skorlar) float32'dir.
+# Kareler np.memmap ile kopyasız okunur (bkz. bolum_oku).
+
+SIHIRLI = b"OTBK"
+SURUM = 1
+OTOMATIK_SIFIRLAMA = 1   # bayraklar: kare içinde engel ekrandan çıktığı için sıfırlandı
+
+def kare_tipi(engel_sayisi, isin_sayisi=len(LIDAR_ACILAR)):
+    return np.dtype([
+        ("kare", "<u4"), ("dt", "<f8"), ("bayraklar", "u1"), ("aksiyon", "u1"),
+        ("sifirlama", "<u4"),                     # bu kareden sonraki toplam sıfırlama sayısı
+        ("arac", "<f4", 3),                       # karar anındaki x, y, yon
+        ("hiz", "<f8"), ("ivme", "<f8"),
+        ("engeller", "<f4", (engel_sayisi, 5)),   # x, y, w, h, hiz_x
+        ("lidar", "<f8", isin_sayisi),
+        ("topsis", "<f4", 4), ("yz", "<f4", 4), ("final", "<f4", 4),
+    ])
+
+def bolum_oku(yol, mmap=True):
+    # (başlık sözlüğü, kareler yapılandırılmış dizisi)
+    with open(yol, "rb") as f:
+        if f.read(4) != SIHIRLI:
+            raise ValueError(f"'{yol}' bir bölüm kaydı değil")
+        uzunluk, = struct.unpack("<I", f.read(4))
+        baslik = json.loads(f.read(uzunluk).decode("utf-8"))
+        veri_baslangici = f.tell()
+        f.seek(0, 2)
+        boyut = f.tell() - veri_baslangici
+    tip = kare_tipi(baslik["engel_sayisi"], baslik["isin_sayisi"])
+    n = boyut // tip.itemsize   # yarım kalmış son kare yok sayılır
+    if mmap and n > 0:
+        return baslik, np.memmap(yol, dtype=tip, mode="r", offset=veri_baslangici, shape=(n,))
+    with open(yol, "rb") as f:
+        f.seek(veri_baslangici)
+        return baslik, np.fromfile(f, dtype=tip, count=n)
+
+class BolumKaydedici:
+    # Simulasyon gözlemcisi: sim.gozlemciler.append(kaydedici) ile her adımı kaydeder
+    def __init__(self, yol, sim, blok_boyu=256, **ek_bilgi):
+        self.yol = yol
+        self.sim = sim
+        self.tip = kare_tipi(sim.engel_sayisi)
+        self.tampon = np.zeros(blok_boyu, dtype=self.tip)
+        self.dolu = 0
+        self.toplam = 0
+        yz = sim.yz_surucu
+        baslik = {"surum": SURUM, "tohum": sim.tohum, "engel_sayisi": sim.engel_sayisi,
+                  "isin_sayisi": len(LIDAR_ACILAR), "lidar_mesafe": LIDAR_MESAFE, "aksiyonlar": AKSIYON_LISTESI,
+                  "agirliklar": [float(w) for w in sim.mcdm.weights], "etkiler": [int(i) for i in sim.mcdm.impacts],
+                  "yz_agirligi": sim.yz_agirligi, "model": yz.model_dosyasi if yz.egitildi else None,
+                  "asenkron": sim.karar_iscisi is not None, "izgara": sim.izgara_kullan}
+        baslik.update(ek_bilgi)
+        ham = json.dumps(baslik, ensure_ascii=False).encode("utf-8")
+        self._dosya = open(yol, "wb")
+        self._dosya.write(SIHIRLI + struct.pack("<I", len(ham)) + ham)
+
+    def __call__(self, sim, sonuc):
+        satir = self.tampon[self.dolu]
+        satir["kare"] = sim.adim_sayac - 1
+        satir["dt"] = sonuc["dt"]
+        satir["bayraklar"] = OTOMATIK_SIFIRLAMA if sonuc["sifirlandi"] else 0
+        satir["aksiyon"] = AKSIYON_DICT[sonuc["aksiyon"]]
+        satir["sifirlama"] = sim.sifirlama_sayaci
+        x, y, yon, hiz, ivme = sonuc["arac"]
+        satir["arac"] = (x, y, yon); satir["hiz"] = hiz; satir["ivme"] = ivme
+        satir["engeller"] = [(e.rect.x, e.rect.y, e.rect.w, e.rect.h, e.hiz_x) for e in sim.engeller]
+        satir["lidar"] = sonuc["lidar"]
+        satir["topsis"] = sonuc["topsis"]; satir["yz"] = sonuc["yz"]; satir["final"] = sonuc["final"]
+        self.dolu += 1
+        if self.dolu == len(self.tampon):
+            self.bosalt()
+
+    def bosalt(self):
+        if self.dolu == 0 or self._dosya is None:
+            return
+        self._dosya.write(self.tampon[:self.dolu].tobytes())
+        self._dosya.flush()
+        self.toplam += self.dolu
+        self.dolu = 0
+
+    def kapat(self):
+        self.bosalt()
+        if self._dosya is not None:
+            self._dosya.close()
+            self._dosya = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *hata):
+        self.kapat()
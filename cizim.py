@@ -0,0 +1,70 @@
+import pygame
+from collections import OrderedDict
+
+# ---------- ÖNBELLEKLİ ÇİZİM ----------
+# Değişmeyen katmanlar (ızgaralı zemin, panel başlıkları) bir kez çizilip yüzey olarak saklanır,
+# değişen yazıların glif yüzeyleri içeriğe göre LRU önbellekte tutulur ve ekranda yalnızca
+# değişen (kirli) bölgeler güncellenir.
+
+
+class YaziOnbellegi:
+    # (metin, renk) -> font.render yüzeyi; kapasite aşılınca en uzun süredir kullanılmayan atılır
+    def __init__(self, font, kapasite=256):
+        self.font = font
+        self.kapasite = kapasite
+        self._yuzeyler = OrderedDict()
+
+    def yaz(self, metin, renk):
+        anahtar = (metin, renk)
+        yuzey = self._yuzeyler.get(anahtar)
+        if yuzey is None:
+            yuzey = self._yuzeyler[anahtar] = self.font.render(metin, True, renk)
+            if len(self._yuzeyler) > self.kapasite:
+                self._yuzeyler.popitem(last=False)
+        else:
+            self._yuzeyler.move_to_end(anahtar)
+        return yuzey
+
+    def ciz(self, hedef, metin, renk, konum):
+        return hedef.blit(self.yaz(metin, renk), konum)
+
+
+def izgara_yuzeyi(genislik, yukseklik, aralik, renk_zemin, renk_grid):
+    # Izgaralı arka plan; her karede çizgi çizgi çizmek yerine bölge bölge kopyalanır
+    yuzey = pygame.Surface((genislik, yukseklik)).convert()
+    yuzey.fill(renk_zemin)
+    for x in range(0, genislik, aralik): pygame.draw.line(yuzey, renk_grid, (x, 0), (x, yukseklik))
+    for y in range(0, yukseklik, aralik): pygame.draw.line(yuzey, renk_grid, (0, y), (genislik, y))
+    return yuzey
+
+
+class KirliBolgeler:
+    """Bir alanın önceki ve bu karede çizilen bölgelerini izler.
+
+    sil() önceki karenin bölgelerini zemin yüzeyiyle örter, ekle() yeni çizimlerin döndürdüğü
+    Rect'leri toplar, guncellenecekler() ise display.update için iki karenin birleşimini verir
+    (eski konumun silinmesi de ekrana yansısın diye).
+    """
+    def __init__(self, zemin, konum=(0, 0)):
+        self.zemin = zemin
+        self.alan = zemin.get_rect(topleft=konum)
+        self.onceki = []
+        self.simdiki = []
+
+    def sil(self, hedef):
+        for r in self.onceki:
+            hedef.blit(self.zemin, r, r.move(-self.alan.x, -self.alan.y))
+
+    def ekle(self, rect):
+        if rect.width and rect.height:
+            self.simdiki.append(rect)
+
+    def guncellenecekler(self):
+        bolgeler = self.onceki + self.simdiki
+        self.onceki, self.simdiki = self.simdiki, []
+        return bolgeler
+
+    def zemini_ciz(self, hedef):
+        # Tam yeniden çizim (ilk kare, sıfırlama, duraklatma sonrası): önceki bölgeler artık geçersiz
+        hedef.blit(self.zemin, self.alan)
+        self.onceki = []
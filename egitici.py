@@ -1,57 +1,221 @@
-import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.neighbors import KNeighborsClassifier
 from sklearn.metrics import classification_report, confusion_matrix, accuracy_score
 import joblib
+from veri_yukleyici import tamamini_yukle, etiket_adlari, anlik_aralik
+from knn_cikarim import prototip_kaydet, prototip_sema_yolu, prototip_semasi, prototip_yukle
 import os
+import time
+import argparse
 
 # Dosya Adları
 CSV_DOSYA_ADI = "otonom_veri_seti.csv"
 MODEL_DOSYA_ADI = "knn_model.pkl"
+KOMPAKT_MODEL_DOSYA_ADI = "knn_prototip.bin"
 
-def modeli_egit_ve_raporla():
+# K araması: 1..K_MAKS
+K_MAKS = 14
+
+def k_dogruluklari(X_train, y_train, X_test, y_test, k_maks=K_MAKS):
+    # En yakın k_maks komşu test noktası başına bir kez bulunur; her K için doğruluk bu
+    # önbellek listelerinin ilk K elemanındaki çoğunluk oyundan gelir (K başına yeniden fit/arama yok).
+    # Eğitim satırından büyük K'lar 0 kalır (dizi boyu k_maks: CV katmanları aynı boyda birleşir)
+    k_ust = min(k_maks, len(X_train))
+    siniflar, y_kod = np.unique(y_train, return_inverse=True)
+    knn = KNeighborsClassifier(n_neighbors=k_ust).fit(X_train, y_kod)
+    komsu_etiket = y_kod[knn.kneighbors(X_test, return_distance=False)]
+    gercek = np.searchsorted(siniflar, y_test)
+    gecerli = (gercek < len(siniflar)) & (siniflar[np.minimum(gercek, len(siniflar) - 1)] == y_test)
+
+    dogruluklar = np.zeros(k_maks)
+    sayilar = np.zeros((len(X_test), len(siniflar)), dtype=np.int32)
+    satirlar = np.arange(len(X_test))
+    for k in range(1, k_ust + 1):
+        sayilar[satirlar, komsu_etiket[:, k - 1]] += 1
+        # predict ile aynı: eşit oyda sınıf sırasındaki ilk sınıf
+        tahmin = np.argmax(sayilar, axis=1)
+        dogruluklar[k - 1] = np.mean(gecerli & (tahmin == gercek))
+    return dogruluklar
+
+def cv_k_dogruluklari(X, y, katman, isci=None):
+    # K-katlı CV: her katman ayrı süreçte k_dogruluklari; sonuç katman ortalaması
+    from joblib import Parallel, delayed
+    from sklearn.model_selection import KFold
+    bolucu = KFold(n_splits=katman, shuffle=True, random_state=42)
+    sonuclar = Parallel(n_jobs=isci or -1)(
+        delayed(k_dogruluklari)(X[egitim], y[egitim], X[test], y[test]) for egitim, test in bolucu.split(X))
+    return np.mean(sonuclar, axis=0)
+
+# ---------- PROTOTİP SEÇİMİ ----------
+# ENN (Wilson düzenleme): k komşusunun çoğunluğuyla çelişen (gürültülü / sınır) satırlar atılır.
+# CNN (Hart yoğunlaştırma): 1-NN ile mevcut küme tarafından yanlış sınıflanan satırlar kümeye eklenir;
+#   ekleme olmayana kadar tekrarlanır. Neredeyse aynı kareler tek prototipe iner.
+#   Satırlar bloklar halinde sınıflanır (blok içinde yanlış sınıflananların hepsi eklenir); bu, sıralı
+#   Hart algoritmasından biraz daha fazla prototip bırakır ama tur başına tek matris çarpımıdır.
+
+def _en_yakin(X, sorgu, normlar):
+    # Her sorgu satırının X içindeki en yakın komşusunun indeksi (||x||^2 - 2 x·q)
+    return np.argmin(normlar[None, :] - 2.0 * (sorgu @ X.T), axis=1)
+
+def enn_duzenle(X, y, k=3):
+    from sklearn.neighbors import NearestNeighbors
+    _, y_kod = np.unique(y, return_inverse=True)
+    komsular = NearestNeighbors(n_neighbors=k + 1).fit(X).kneighbors(X, return_distance=False)[:, 1:]
+    sayilar = np.zeros((len(X), y_kod.max() + 1), dtype=np.int32)
+    np.add.at(sayilar, (np.arange(len(X))[:, None], y_kod[komsular]), 1)
+    tut = sayilar[np.arange(len(X)), y_kod] * 2 > k
+    return X[tut], y[tut]
+
+def cnn_yogunlastir(X, y, blok_boyu=256, maks_tur=10, tohum=42):
+    X = np.asarray(X, dtype=np.float64)
+    sira = np.random.default_rng(tohum).permutation(len(X))
+    # Her sınıftan ilk satırla başla
+    secili = np.zeros(len(X), dtype=bool)
+    secili[sira[np.unique(y[sira], return_index=True)[1]]] = True
+    for _ in range(maks_tur):
+        eklenen = 0
+        for bas in range(0, len(sira), blok_boyu):
+            blok = sira[bas:bas + blok_boyu]
+            blok = blok[~secili[blok]]
+            if len(blok) == 0:
+                continue
+            kume = np.flatnonzero(secili)
+            P = X[kume]
+            tahmin = y[kume[_en_yakin(P, X[blok], np.einsum("ij,ij->i", P, P))]]
+            yanlis = blok[tahmin != y[blok]]
+            secili[yanlis] = True
+            eklenen += len(yanlis)
+        if eklenen == 0:
+            break
+    return X[secili], y[secili]
+
+def prototip_sec(X, y, yontem="enn+cnn"):
+    if "enn" in yontem:
+        X, y = enn_duzenle(X, y)
+    if "cnn" in yontem:
+        X, y = cnn_yogunlastir(X, y)
+    return X, y
+
+def kompakt_modeli_disa_aktar(X_train, y_train, X_test, y_test, tam_dogruluk, yontem, dosya_adi, gecici=None,
+                              rapor=True):
+    if rapor:
+        print(f"\n[İŞLEM] Prototip seçimi ({yontem})...")
+    P, yP = prototip_sec(X_train, y_train, yontem)
+    # K prototip kümesi için yeniden seçilir (tek geçişli K araması)
+    dogruluklar = k_dogruluklari(P, yP, X_test, y_test)
+    k = int(np.argmax(dogruluklar)) + 1
+    dogruluk = dogruluklar[k - 1]
+    prototipi_kaydet(dosya_adi, P, yP, k, gecici, yontem=yontem, kaynak_satir=len(X_train),
+                     dogruluk=float(dogruluk), tam_dogruluk=float(tam_dogruluk))
+    if rapor:
+        print(f"[SONUÇ] {len(X_train)} satır -> {len(P)} prototip (%{100 * len(P) / len(X_train):.1f}), K={k}")
+        print(f"[SONUÇ] Doğruluk: tam model %{tam_dogruluk*100:.2f} | kompakt %{dogruluk*100:.2f} "
+              f"| fark {(dogruluk - tam_dogruluk)*100:+.2f} puan")
+        print(f" Kompakt model kaydedildi: {dosya_adi} ({os.path.getsize(dosya_adi) / 1024:.0f} KB)")
+        print(f" Simülasyonda kullanmak için main.py'de MODEL_DOSYASI = \"{dosya_adi}\" yapın.")
+    return {"prototip": len(P), "k": k, "dogruluk": float(dogruluk)}
+
+def prototipi_kaydet(yol, P, yP, k, gecici=None, **bilgi):
+    # modeli_kaydet gibi: ikili dosya ve .json şeması önce geçici adlarla yazılır, sonra os.replace ile
+    # yerine konur (önce veri, sonra şema). Çalışan simülasyonun eşlediği eski dosya etkilenmez
+    gecici = gecici or f"{yol}.{os.getpid()}.gecici"
+    gecici_sema = prototip_sema_yolu(gecici)
+    try:
+        prototip_kaydet(gecici, P, yP, k, **bilgi)
+        os.replace(gecici, yol)
+        os.replace(gecici_sema, prototip_sema_yolu(yol))
+    except BaseException:
+        for dosya in (gecici, gecici_sema):
+            if os.path.exists(dosya):
+                os.remove(dosya)
+        raise
+
+def modeli_kaydet(model, yol, gecici=None):
+    # Önce geçici dosyaya yazılır, sonra os.replace ile tek adımda yerine konur: modeli okuyan
+    # (ör. çalışan simülasyon) hiçbir zaman yarım yazılmış dosya görmez
+    gecici = gecici or f"{yol}.{os.getpid()}.gecici"
+    try:
+        joblib.dump(model, gecici)
+        os.replace(gecici, yol)
+    except BaseException:
+        if os.path.exists(gecici):
+            os.remove(gecici)
+        raise
+
+def modeli_egit(veri_dosyasi, model_dosyasi=MODEL_DOSYA_ADI, boyut=None, gecici=None):
+    """Raporsuz eğitim (arka plan yeniden eğitimi için): K seçimi, eğitim ve atomik kayıt.
+
+    boyut verilirse veri dosyasının yalnızca ilk 'boyut' baytındaki satırlar okunur (dosyaya
+    yazılmaya devam edilirken tutarlı bir görüntü). model_dosyasi bir prototip modeliyse (egitici.py
+    --kompakt) model aynı yöntemle kompakt olarak yeniden üretilir; biçim değişmez. Model, referans
+    satırı (prototip modelinde prototip sayısı), K, test doğruluğu ve süreyi döndürür.
+    """
+    baslangic = time.perf_counter()
+    X, y_kod = tamamini_yukle(veri_dosyasi, aralik=anlik_aralik(veri_dosyasi, boyut))
+    bilinen = y_kod >= 0
+    X, y = X[bilinen], etiket_adlari(y_kod[bilinen])
+    if len(X) < 20:
+        raise ValueError(f"'{veri_dosyasi}' içinde eğitim için yeterli satır yok ({len(X)})")
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    dogruluklar = k_dogruluklari(X_train, y_train, X_test, y_test)
+    k = int(np.argmax(dogruluklar)) + 1
+    sema = prototip_semasi(model_dosyasi)
+    if sema is not None:
+        kompakt = kompakt_modeli_disa_aktar(X_train, y_train, X_test, y_test, dogruluklar[k - 1],
+                                            sema.get("yontem", "enn+cnn"), model_dosyasi, gecici, rapor=False)
+        return {"model": prototip_yukle(model_dosyasi, mmap=False), "yol": model_dosyasi,
+                "satir": kompakt["prototip"], "k": kompakt["k"], "dogruluk": kompakt["dogruluk"],
+                "sure": time.perf_counter() - baslangic}
+    knn = KNeighborsClassifier(n_neighbors=k).fit(X_train, y_train)
+    modeli_kaydet(knn, model_dosyasi, gecici)
+    return {"model": knn, "yol": model_dosyasi, "satir": len(X_train), "k": k, "dogruluk": float(dogruluklar[k - 1]),
+            "sure": time.perf_counter() - baslangic}
+
+def modeli_egit_ve_raporla(csv_dosya_adi=CSV_DOSYA_ADI, cv_katman=0, isci=None, model_dosya_adi=MODEL_DOSYA_ADI,
+                           kompakt=None, kompakt_dosya_adi=KOMPAKT_MODEL_DOSYA_ADI):
     print("\n" + "="*50)
     print("   OTONOM ARAÇ YAPAY ZEKA EĞİTİM MODÜLÜ")
     print("="*50 + "\n")
     
     # 1. Veri Kontrolü
-    if not os.path.exists(CSV_DOSYA_ADI):
-        print(f"HATA: '{CSV_DOSYA_ADI}' bulunamadı! Önce veri toplayın.")
+    if not os.path.exists(csv_dosya_adi):
+        print(f"HATA: '{csv_dosya_adi}' bulunamadı! Önce veri toplayın.")
         return
 
     try:
-        df = pd.read_csv(CSV_DOSYA_ADI)
-        print(f"[BİLGİ] Veri seti yüklendi. Toplam Satır: {len(df)}")
+        # Ortak yükleyici: bloklar halinde float32 okuma + şema doğrulama (.csv veya ikili .f32)
+        X, y_kod = tamamini_yukle(csv_dosya_adi)  # Girdiler (Lidar + Hız + İvme), Çıktı (Aksiyon kodu)
+        print(f"[BİLGİ] Veri seti yüklendi. Toplam Satır: {len(X)}")
     except Exception as e:
         print("Okuma hatası:", e)
         return
 
-    if len(df) < 20:
+    bilinmeyen = y_kod < 0
+    if bilinmeyen.any():
+        print(f"UYARI: {int(bilinmeyen.sum())} satırın AKSIYON etiketi tanınmadı, atlanıyor.")
+        X, y_kod = X[~bilinmeyen], y_kod[~bilinmeyen]
+    y = etiket_adlari(y_kod)   # model.classes_ metin kalır (YapayZekaSurucusu eşlemesi için)
+
+    if len(X) < 20:
         print("UYARI: Veri sayısı çok az. Doğru sonuç için en az 100 satır veri önerilir.")
         return
 
-    # 2. Veri Hazırlığı
-    X = df.iloc[:, :-1].values  # Girdiler (Lidar + Hız + İvme)
-    y = df.iloc[:, -1].values   # Çıktı (Aksiyon)
-
     # %80 Eğitim, %20 Test
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
 
     # 3. KNN İŞLEMLERİ
     print("[İŞLEM] En iyi 'K' (Komşu Sayısı) değeri aranıyor...")
-    best_k = 1
-    best_acc = 0
-    
-    # 1'den 15'e kadar dene
-    for k in range(1, 15):
-        knn_temp = KNeighborsClassifier(n_neighbors=k)
-        knn_temp.fit(X_train, y_train)
-        acc = knn_temp.score(X_test, y_test)
-        if acc > best_acc:
-            best_k = k
-            best_acc = acc
-            
+    if cv_katman > 1:
+        print(f"[İŞLEM] {cv_katman} katlı çapraz doğrulama (katmanlar paralel)...")
+        dogruluklar = cv_k_dogruluklari(X_train, y_train, cv_katman, isci=isci)
+    else:
+        dogruluklar = k_dogruluklari(X_train, y_train, X_test, y_test)
+
+    # 1'den 15'e kadar: eşitlikte küçük K tercih edilir
+    best_k = int(np.argmax(dogruluklar)) + 1
+    best_acc = dogruluklar[best_k - 1]
+
     print(f"[SONUÇ] Optimum K Değeri: {best_k} (Başarı: %{best_acc*100:.1f})")
 
     # 4. Modeli En İyi K ile Eğitme
@@ -65,7 +229,8 @@ def modeli_egit_ve_raporla():
     print("\n" + "-"*30)
     print("   PERFORMANS RAPORU")
     print("-"*30)
-    print(f"Genel Doğruluk (Accuracy): %{accuracy_score(y_test, y_pred)*100:.2f}")
+    tam_dogruluk = accuracy_score(y_test, y_pred)
+    print(f"Genel Doğruluk (Accuracy): %{tam_dogruluk*100:.2f}")
     
     print("\n--- Detaylı Metrikler (Precision / Recall / F1) ---")
     print(classification_report(y_test, y_pred))
@@ -75,11 +240,24 @@ def modeli_egit_ve_raporla():
     print(confusion_matrix(y_test, y_pred))
     
     # 6. Kayıt
-    joblib.dump(knn, MODEL_DOSYA_ADI)
+    modeli_kaydet(knn, model_dosya_adi)
     print("\n" + "="*50)
-    print(f" Model başarıyla kaydedildi: {MODEL_DOSYA_ADI}")
+    print(f" Model başarıyla kaydedildi: {model_dosya_adi}")
+    if kompakt:
+        kompakt_modeli_disa_aktar(X_train, y_train, X_test, y_test, tam_dogruluk, kompakt, kompakt_dosya_adi)
     print(" Simülasyonu çalıştırabilirsiniz.")
     print("="*50 + "\n")
 
 if __name__ == "__main__":
-    modeli_egit_ve_raporla()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="KNN modelini eğitir ve raporlar")
+    parser.add_argument("veri", nargs="?", default=CSV_DOSYA_ADI,
+                        help="Veri seti (.csv veya ikili .f32; örn. veri_toplayici.py çıktısı)")
+    parser.add_argument("--cv", type=int, default=0, help="K seçimi için katman sayısı (0: tek test bölmesi)")
+    parser.add_argument("--isci", type=int, default=None, help="CV için paralel süreç sayısı (varsayılan: tüm çekirdekler)")
+    parser.add_argument("--model", default=MODEL_DOSYA_ADI, help="Kaydedilecek model dosyası")
+    parser.add_argument("--kompakt", nargs="?", const="enn+cnn", default=None, choices=("enn", "cnn", "enn+cnn"),
+                        help="Ayrıca prototip seçimiyle küçültülmüş float32 model yaz (varsayılan yöntem: enn+cnn)")
+    parser.add_argument("--kompakt-dosya", default=KOMPAKT_MODEL_DOSYA_ADI, help="Kompakt model dosyası")
+    args = parser.parse_args()
+    modeli_egit_ve_raporla(args.veri, cv_katman=args.cv, isci=args.isci, model_dosya_adi=args.model,
+                           kompakt=args.kompakt, kompakt_dosya_adi=args.kompakt_dosya)
\ No newline at end of file
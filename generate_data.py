@@ -1,77 +1,188 @@
-# otomobilin sensörlerine göre veri seti oluşturur
+# otomobilin sensörlerine göre sentetik veri seti oluşturur
 
-import csv
+import sys
+import os
+import time
+import shutil
+import tempfile
+import argparse
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from simulasyon import (LIDAR_ACILAR, LIDAR_MESAFE, MAKS_HIZ, AKSIYON_LISTESI, AKSIYON_DICT,
+                        MCDMKararVerici, karar_matrisleri_toplu)
+from lidar import en_yakin_kesisim
+from kayit import VeriKaydedici
+from veri_toplayici import isci_hazirla, parcalari_birlestir
 
-CSV_DOSYA = "veri_seti.csv"
-LIDAR_ISIN_SAYISI = 25
-LIDAR_MESAFE = 300
-
-def generate_data():
-    with open(CSV_DOSYA, "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        
-        # 1. (SÜRDÜR) - 50 örnek
-        for _ in range(50):
-            # Tüm sensörler max mesafede
-            row = [LIDAR_MESAFE] * LIDAR_ISIN_SAYISI
-            row.append("SÜRDÜR")
-            writer.writerow(row)
-            
-        # 2. (FREN/YAVAŞLA) - 10 örnek
-        for _ in range(10):
-            row = [LIDAR_MESAFE] * LIDAR_ISIN_SAYISI
-            # Orta sensörler engelleniyor
-            for i in range(9, 17):
-                row[i] = np.random.randint(50, 100)
-            row.append("FREN")
-            writer.writerow(row)
-
-        # 3. (SOLA_KAÇIN) - 20 örnek
-        for _ in range(20):
-            row = [LIDAR_MESAFE] * LIDAR_ISIN_SAYISI
-            # Orta sensörler engelleniyor
-            for i in range(9, 17):
-                row[i] = np.random.randint(50, 150)
-            # Sağ sensörler engelleniyor
-            for i in range(17, 25):
-                row[i] = np.random.randint(50, 150)
-            # Sol sensörler açık
-            row.append("SOLA_KAÇIN")
-            writer.writerow(row)
-
-        # 4. (SAĞA_KAÇIN) - 20 örnek
-        for _ in range(20):
-            row = [LIDAR_MESAFE] * LIDAR_ISIN_SAYISI
-            # Orta sensörler engelleniyor
-            for i in range(9, 17):
-                row[i] = np.random.randint(50, 150)
-            # Sol sensörler engelleniyor
-            for i in range(0, 9):
-                row[i] = np.random.randint(50, 150)
-            # Sağ sensörler açık
-            row.append("SAĞA_KAÇIN")
-            writer.writerow(row)
-
-        # 5. (SAĞA_KAÇIN) - 10 örnek
-        for _ in range(10):
-            row = [LIDAR_MESAFE] * LIDAR_ISIN_SAYISI
-            # Sol sensörler engelleniyor
-            for i in range(0, 9):
-                row[i] = np.random.randint(50, 150)
-            row.append("SAĞA_KAÇIN")
-            writer.writerow(row)
-
-        # 6. (SOLA_KAÇIN) - 10 örnek
-        for _ in range(10):
-            row = [LIDAR_MESAFE] * LIDAR_ISIN_SAYISI
-            # Sağ sensörler engelleniyor
-            for i in range(17, 25):
-                row[i] = np.random.randint(50, 150)
-            row.append("SOLA_KAÇIN")
-            writer.writerow(row)
-            
-    print(f"Veri seti başarıyla oluşturuldu: {CSV_DOSYA}")
+# ---------- SENTETİK VERİ ÜRETİCİ ----------
+# main.py'nin kaydettiği şemada (40 Lidar + HIZ + IVME + AKSIYON) etiketli örnekler üretir.
+# Her örnek bir engel şablonundan gelir: şablonun kapattığı sol/orta/sağ dilimlere belirtilen mesafe
+# aralığında kutular yerleştirilir ve LIDAR bu kutulara toplu olarak (lidar.en_yakin_kesisim) taranır,
+# böylece mesafeler gerçek taramadaki gibi geometrik olarak tutarlıdır.
+# Örnekler PARCA_BOYU satırlık parçalar halinde üretilir; parça p'nin tohumu (tohum, p)'dir ve işçiler
+# ardışık parça bloklarını alır, böylece çıktı işçi sayısından bağımsız olarak aynıdır.
+
+CSV_DOSYA = "sentetik_veri_seti.csv"
+PARCA_BOYU = 65536
+ALT_BLOK = 8192            # (örnek, ışın, kutu) ara dizilerini sınırlı tutmak için tarama bloğu
+KUTU_BOYU = (30, 60)       # kutu kenar uzunluğu aralığı (px)
+DILIM_KUTU_SAYISI = 2      # kapalı dilim başına en fazla kutu (ikincisi %50 olasılıkla)
+IVME_DEGERLERI = np.array([-150.0, -30.0, -10.0, 0.0, 50.0])   # main.py'deki fren/sürtünme/gaz ivmeleri
+
+# Sol/orta/sağ dilimler karar_matrisi_olustur ile aynı bölünmedir
+_DILIM = len(LIDAR_ACILAR) // 3
+DILIM_ACILARI = {"sol": (LIDAR_ACILAR[0], LIDAR_ACILAR[_DILIM - 1]),
+                 "orta": (LIDAR_ACILAR[_DILIM], LIDAR_ACILAR[2 * _DILIM - 1]),
+                 "sag": (LIDAR_ACILAR[2 * _DILIM], LIDAR_ACILAR[-1])}
+
+# şablon: (kapalı dilimler, engel mesafe aralığı, etiket)
+SABLONLAR = {
+    "bos_yol":    ((), (0, 0), "SÜRDÜR"),
+    "orta_uzak":  (("orta",), (150, 240), "SÜRDÜR"),
+    "orta_yakin": (("orta",), (40, 100), "FREN"),
+    "orta_sag":   (("orta", "sag"), (50, 150), "SOLA_KAÇIN"),
+    "orta_sol":   (("orta", "sol"), (50, 150), "SAĞA_KAÇIN"),
+    "sol":        (("sol",), (50, 150), "SAĞA_KAÇIN"),
+    "sag":        (("sag",), (50, 150), "SOLA_KAÇIN"),
+}
+
+def sablon_olasiliklari(sablonlar, sinif_oranlari):
+    # Sınıf oranları sınıfın seçili şablonları arasında eşit bölünür
+    oranlar = np.asarray(sinif_oranlari, dtype=float)
+    etiketler = [AKSIYON_DICT[SABLONLAR[s][2]] for s in sablonlar]
+    sayac = np.bincount(etiketler, minlength=len(AKSIYON_LISTESI))
+    for i, ad in enumerate(AKSIYON_LISTESI):
+        if oranlar[i] > 0 and sayac[i] == 0:
+            print(f"UYARI: '{ad}' sınıfını üreten şablon seçilmedi, bu sınıf üretilmeyecek.")
+    olasiliklar = np.array([oranlar[e] / sayac[e] for e in etiketler])
+    if olasiliklar.sum() <= 0:
+        raise ValueError("Seçili şablonlar ve sınıf oranlarıyla hiç örnek üretilemez")
+    return olasiliklar / olasiliklar.sum()
+
+def ornek_uret(rng, sablon_idx, sablonlar):
+    # (X (n, 42), şablon etiketleri (n,)); sablon_idx seçili şablonlar listesine indekstir
+    n = len(sablon_idx)
+    dilimler = list(DILIM_ACILARI)
+    kapali = np.array([[d in SABLONLAR[s][0] for d in dilimler] for s in sablonlar])[sablon_idx]   # (n, 3)
+    araliklar = np.array([SABLONLAR[s][1] for s in sablonlar], dtype=float)[sablon_idx]             # (n, 2)
+
+    m = len(dilimler) * DILIM_KUTU_SAYISI
+    kutular = np.full((n, m, 4), 1e9)   # kullanılmayan kutular menzilin çok dışında
+    for j, dilim in enumerate(dilimler):
+        a0, a1 = DILIM_ACILARI[dilim]
+        for k in range(DILIM_KUTU_SAYISI):
+            aktif = kapali[:, j] if k == 0 else kapali[:, j] & (rng.random(n) < 0.5)
+            aci = rng.uniform(a0, a1, n)
+            mesafe = rng.uniform(araliklar[:, 0], araliklar[:, 1])
+            w, h = rng.uniform(*KUTU_BOYU, (2, n))
+            # Kutu merkezi ışın doğrultusunda, yakın kenarı yaklaşık 'mesafe'de olacak şekilde
+            merkez = mesafe + np.maximum(w, h) / 2
+            cx, cy = merkez * np.cos(aci), merkez * np.sin(aci)
+            kutu = np.stack((cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2), axis=-1)
+            kutular[:, j * DILIM_KUTU_SAYISI + k] = np.where(aktif[:, None], kutu, 1e9)
+
+    # Araç başlangıçta, yönü 0: ışınlar LIDAR_ACILAR doğrultusunda
+    dx = np.broadcast_to(np.cos(LIDAR_ACILAR) * LIDAR_MESAFE, (n, len(LIDAR_ACILAR)))
+    dy = np.broadcast_to(np.sin(LIDAR_ACILAR) * LIDAR_MESAFE, (n, len(LIDAR_ACILAR)))
+    sifir = np.zeros((n, len(LIDAR_ACILAR)))
+    t, _ = en_yakin_kesisim(sifir, sifir, dx, dy, kutular)
+
+    X = np.empty((n, len(LIDAR_ACILAR) + 2))
+    X[:, :-2] = t * LIDAR_MESAFE
+    X[:, -2] = rng.uniform(0, MAKS_HIZ, n)
+    X[:, -1] = rng.choice(IVME_DEGERLERI, n)
+    etiketler = np.array([AKSIYON_DICT[SABLONLAR[s][2]] for s in sablonlar])[sablon_idx]
+    return X, etiketler
+
+def topsis_etiketle(X, mcdm):
+    matrisler, _ = karar_matrisleri_toplu(X[:, :-2], X[:, -2])
+    return np.argmax(mcdm.topsis_hesapla_toplu(matrisler), axis=1)
+
+def _parcalari_uret(gorev):
+    isci_no, parcalar, ayarlar = gorev
+    uzanti = "f32" if ayarlar["cikti"].endswith(".f32") else "csv"
+    parca_yolu = os.path.join(ayarlar["parca_dizini"], f"parca_{isci_no:03d}.{uzanti}")
+    if os.path.exists(parca_yolu): os.remove(parca_yolu)
+    sablonlar = ayarlar["sablonlar"]
+    mcdm = MCDMKararVerici() if ayarlar["etiket"] == "topsis" else None
+    sinif_sayilari = np.zeros(len(AKSIYON_LISTESI), dtype=np.int64)
+    baslangic = time.perf_counter()
+    with VeriKaydedici(parca_yolu, blok_boyu=ayarlar["blok"]) as kaydedici:
+        for parca_no, satir in parcalar:
+            rng = np.random.default_rng((ayarlar["tohum"], parca_no))
+            # Şablon sayıları çok terimli çekilir, sıra karıştırılır
+            sayilar = rng.multinomial(satir, ayarlar["olasiliklar"])
+            sablon_idx = rng.permutation(np.repeat(np.arange(len(sablonlar)), sayilar))
+            for bas in range(0, satir, ALT_BLOK):
+                X, y = ornek_uret(rng, sablon_idx[bas:bas + ALT_BLOK], sablonlar)
+                if mcdm is not None:
+                    y = topsis_etiketle(X, mcdm)
+                sinif_sayilari += np.bincount(y, minlength=len(AKSIYON_LISTESI))
+                kaydedici.blok_ekle(X, y)
+    sure = time.perf_counter() - baslangic
+    return isci_no, parca_yolu, kaydedici.toplam, sure, sinif_sayilari
+
+def generate_data(satir_sayisi, cikti=CSV_DOSYA, isci=None, tohum=0, sablonlar=None, sinif_oranlari=None,
+                  etiket="sablon", blok=PARCA_BOYU, parca_dizini=None):
+    sablonlar = list(sablonlar or SABLONLAR)
+    for s in sablonlar:
+        if s not in SABLONLAR:
+            raise ValueError(f"Bilinmeyen şablon '{s}' (seçenekler: {', '.join(SABLONLAR)})")
+    sinif_oranlari = sinif_oranlari or [1.0] * len(AKSIYON_LISTESI)
+    olasiliklar = sablon_olasiliklari(sablonlar, sinif_oranlari)
+
+    # Parçalar (parça no, satır) sabittir; işçiler ardışık bloklar alır
+    parcalar = [(p, min(PARCA_BOYU, satir_sayisi - bas)) for p, bas in enumerate(range(0, satir_sayisi, PARCA_BOYU))]
+    isci = isci or os.cpu_count() or 1
+    isci = max(1, min(isci, len(parcalar)))
+    # Parçalar bu çalıştırmanın oluşturduğu geçici dizine yazılır (parca_dizini: geçici dizinin konumu,
+    # varsayılan çıktının dizini); sonunda yalnızca o dizin silinir
+    parca_dizini = tempfile.mkdtemp(prefix=os.path.basename(os.path.splitext(cikti)[0]) + "_parcalar_",
+                                    dir=parca_dizini or os.path.dirname(cikti) or ".")
+    ayarlar = {"tohum": tohum, "sablonlar": sablonlar, "olasiliklar": olasiliklar, "etiket": etiket,
+               "blok": blok, "parca_dizini": parca_dizini, "cikti": cikti}
+    sinirlar = [len(parcalar) * w // isci for w in range(isci + 1)]
+    gorevler = [(w, parcalar[sinirlar[w]:sinirlar[w + 1]], ayarlar) for w in range(isci)]
+
+    print(f"[İŞLEM] {satir_sayisi} satır ({len(sablonlar)} şablon, etiket: {etiket}), {isci} işçi ile üretiliyor...")
+    baslangic = time.perf_counter()
+    try:
+        if isci == 1:
+            sonuclar = [_parcalari_uret(gorevler[0])]
+        else:
+            with ProcessPoolExecutor(max_workers=isci, initializer=isci_hazirla) as havuz:
+                sonuclar = sorted(havuz.map(_parcalari_uret, gorevler), key=lambda s: s[0])
+        parcalari_birlestir([yol for _, yol, _, _, _ in sonuclar], cikti)
+    finally:
+        shutil.rmtree(parca_dizini, ignore_errors=True)
+    toplam_sure = time.perf_counter() - baslangic
+
+    sinif_sayilari = sum(s[4] for s in sonuclar)
+    for isci_no, _, satir, sure, _ in sonuclar:
+        print(f"  İşçi {isci_no:03d}: {satir} satır, {sure:.2f} sn ({satir / max(sure, 1e-9):.0f} satır/sn)")
+    print("  Sınıf dağılımı: " + ", ".join(f"{ad}: {n} (%{100 * n / max(satir_sayisi, 1):.1f})"
+                                           for ad, n in zip(AKSIYON_LISTESI, sinif_sayilari)))
+    print(f"[SONUÇ] {satir_sayisi} satır {toplam_sure:.2f} sn'de üretildi "
+          f"({satir_sayisi / max(toplam_sure, 1e-9):.0f} satır/sn). Çıktı: {cikti}")
+    return sinif_sayilari
+
+def ana():
+    parser = argparse.ArgumentParser(description="Canlı 40 ışınlı şemada sentetik etiketli veri seti üretir")
+    parser.add_argument("--satir", type=int, default=1_000_000, help="Üretilecek satır sayısı")
+    parser.add_argument("--cikti", default=CSV_DOSYA, help="Çıktı dosyası (.csv veya ikili .f32)")
+    parser.add_argument("--isci", type=int, default=None, help="İşçi süreç sayısı (varsayılan: çekirdek sayısı)")
+    parser.add_argument("--tohum", type=int, default=0, help="Temel tohum; parça p için (tohum, p)")
+    parser.add_argument("--sablonlar", nargs="+", default=None, choices=list(SABLONLAR),
+                        help="Kullanılacak engel şablonları (varsayılan: hepsi)")
+    parser.add_argument("--sinif-oranlari", type=float, nargs=len(AKSIYON_LISTESI), default=None,
+                        help=f"Sınıf ağırlıkları ({' '.join(AKSIYON_LISTESI)} sırasıyla; varsayılan: eşit)")
+    parser.add_argument("--etiket", choices=("sablon", "topsis"), default="sablon",
+                        help="sablon: şablonun etiketi, topsis: MCDM kararı (sınıf oranları yaklaşık kalır)")
+    parser.add_argument("--blok", type=int, default=PARCA_BOYU, help="Diske yazma blok boyu (satır)")
+    args = parser.parse_args()
+
+    generate_data(args.satir, args.cikti, isci=args.isci, tohum=args.tohum, sablonlar=args.sablonlar,
+                  sinif_oranlari=args.sinif_oranlari, etiket=args.etiket, blok=args.blok)
 
 if __name__ == "__main__":
-    generate_data()
+    sys.exit(ana())
@@ -0,0 +1,237 @@
+import os
+import csv
+import json
+import random
+import numpy as np
+from simulasyon import CSV_BASLIKLARI, AKSIYON_LISTESI, AKSIYON_DICT
+
+# ---------- TAMPONLU VERİ KAYDEDİCİ ----------
+# Dosya açık tutulur, satırlar önceden ayrılmış tamponda biriktirilir ve bloklar halinde yazılır. CSV
+# tamponu float64'tür: float32'ye çevirip yuvarlamak bazı değerlerde kayit_satiri'ndan farklı ondalık verir.
+# İki biçim desteklenir:
+#   "csv": otonom_veri_seti.csv ile aynı başlıklı metin dosyası (uyumluluk için)
+#   "f32": ham float32 satırlar (40 Lidar + HIZ + IVME + AKSIYON indeksi) + yanında .json şema;
+#          np.memmap ile kopyasız açılabilir (bkz. ikili_yukle)
+
+SUTUN_SAYISI = len(CSV_BASLIKLARI)   # son sütun aksiyonun AKSIYON_LISTESI indeksi
+OZELLIK_SAYISI = SUTUN_SAYISI - 1
+CSV_SATIR_BICIMI = "%.1f," * OZELLIK_SAYISI + "%s\r\n"   # csv.writer'ın varsayılan satır sonu
+
+def sema_yolu(ikili_yol):
+    return os.path.splitext(ikili_yol)[0] + ".json"
+
+def sema_yaz(ikili_yol):
+    with open(sema_yolu(ikili_yol), "w", encoding="utf-8") as f:
+        json.dump({"sutunlar": CSV_BASLIKLARI, "aksiyonlar": AKSIYON_LISTESI, "dtype": "float32"},
+                  f, ensure_ascii=False, indent=2)
+
+def ikili_ac(ikili_yol, mmap=True):
+    # Ham (n, 43) float32 görünüm; son sütun aksiyon indeksi
+    with open(sema_yolu(ikili_yol), "r", encoding="utf-8") as f:
+        sema = json.load(f)
+    if sema["sutunlar"] != CSV_BASLIKLARI:
+        raise ValueError(f"'{ikili_yol}' şeması beklenen {SUTUN_SAYISI} sütunla uyuşmuyor")
+    satir = os.path.getsize(ikili_yol) // (SUTUN_SAYISI * 4)   # yarım kalmış son satır yok sayılır
+    if mmap and satir > 0:
+        return np.memmap(ikili_yol, dtype=np.float32, mode="r", shape=(satir, SUTUN_SAYISI))
+    return np.fromfile(ikili_yol, dtype=np.float32, count=satir * SUTUN_SAYISI).reshape(satir, SUTUN_SAYISI)
+
+def ikili_yukle(ikili_yol, mmap=True):
+    # (X (n, 42) float32, y (n,) aksiyon adları); mmap=True iken X diske eşlenmiş görünümdür
+    veri = ikili_ac(ikili_yol, mmap)
+    return veri[:, :-1], np.array(AKSIYON_LISTESI, dtype=object)[veri[:, -1].astype(np.intp)]
+
+def csv_disa_aktar(ikili_yol, csv_yol, blok_boyu=65536):
+    # İkili kaydı egitici.py/analyze_data.py'nin okuduğu CSV biçimine çevirir
+    X, y = ikili_yukle(ikili_yol)
+    with VeriKaydedici(csv_yol, bicim="csv", blok_boyu=blok_boyu, ekle=False) as kaydedici:
+        for bas in range(0, len(X), blok_boyu):
+            kaydedici.blok_ekle(X[bas:bas + blok_boyu], y[bas:bas + blok_boyu])
+
+class VeriKaydedici:
+    def __init__(self, yol, bicim=None, blok_boyu=4096, ekle=True):
+        self.yol = yol
+        self.bicim = bicim or ("f32" if yol.endswith(".f32") else "csv")
+        self.tampon = np.empty((blok_boyu, SUTUN_SAYISI), dtype=np.float64 if self.bicim == "csv" else np.float32)
+        self.dolu = 0
+        self.toplam = 0
+        self._dosya = None
+        self._ekle = ekle
+
+    def _ac(self):
+        yeni = not self._ekle or not os.path.exists(self.yol) or os.path.getsize(self.yol) == 0
+        if self.bicim == "csv":
+            self._dosya = open(self.yol, "w" if yeni else "a", newline="", encoding="utf-8")
+            self._writer = csv.writer(self._dosya)
+            if yeni:
+                self._writer.writerow(CSV_BASLIKLARI)
+        else:
+            self._dosya = open(self.yol, "wb" if yeni else "ab")
+            sema_yaz(self.yol)
+
+    def kaydet(self, lidar_verisi, arac_hizi, arac_ivmesi, aksiyon):
+        satir = self.tampon[self.dolu]
+        satir[:-3] = lidar_verisi
+        satir[-3] = arac_hizi; satir[-2] = arac_ivmesi; satir[-1] = AKSIYON_DICT[aksiyon]
+        self.dolu += 1
+        if self.dolu == len(self.tampon):
+            self.bosalt()
+
+    def blok_ekle(self, X, y):
+        # Çok satırı birden ekler; y aksiyon adları veya indeksleri olabilir
+        y = np.asarray(y)
+        if y.dtype.kind not in "iu":
+            y = np.array([AKSIYON_DICT[a] for a in y])
+        bas = 0
+        while bas < len(X):
+            n = min(len(X) - bas, len(self.tampon) - self.dolu)
+            self.tampon[self.dolu:self.dolu + n, :-1] = X[bas:bas + n]
+            self.tampon[self.dolu:self.dolu + n, -1] = y[bas:bas + n]
+            self.dolu += n; bas += n
+            if self.dolu == len(self.tampon):
+                self.bosalt()
+
+    def bosalt(self):
+        if self.dolu == 0:
+            return
+        if self._dosya is None:
+            self._ac()
+        blok = self.tampon[:self.dolu]
+        if self.bicim == "csv":
+            # float girdilerde kayit_satiri + csv.writer ile aynı metin (float64 değerde "%.1f" = str(round(x, 1));
+            # tamsayı girdi "0.0" olarak yazılır). Tek biçim dizgesi np.char.mod + writerows yolundan ~4 kat
+            # hızlıdır (arka plan eğitimi öncesi boşaltma kare döngüsünde yapılır)
+            etiketler = np.array(AKSIYON_LISTESI, dtype=object)[blok[:, -1].astype(np.intp)]
+            self._dosya.write("".join(CSV_SATIR_BICIMI % (*satir, etiket)
+                                      for satir, etiket in zip(blok[:, :-1].tolist(), etiketler)))
+        else:
+            self._dosya.write(blok.tobytes())
+        self._dosya.flush()
+        self.toplam += self.dolu
+        self.dolu = 0
+
+    @property
+    def satir_sayisi(self):
+        # Bu nesneyle yazılan satırlar (tamponda bekleyenler dahil)
+        return self.toplam + self.dolu
+
+    def kapat(self):
+        self.bosalt()
+        if self._dosya is not None:
+            self._dosya.close()
+            self._dosya = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *hata):
+        self.kapat()
+
+
+# ---------- YENİLİK TABANLI ÖRNEKLEME ----------
+# VeriKaydedici'nin önüne konur: satır yalnızca kabalaştırılmış girdisi (ışınlar isin_adimi, hız
+# hiz_adimi adımlarına yuvarlanır) daha önce saklanmamışsa yazılır. Böylece uzun düz yol kareleri
+# (tüm ışınlar menzilde, "SÜRDÜR") veri setini doldurmaz. Mevcut dosyanın satırları baştan kümeye
+# eklenir (mevcudu_yukle). Ayrıca eylem başına kota uygulanabilir:
+#   rezervuar=False : kota dolunca o eylemin yeni satırları atlanır
+#   rezervuar=True  : oturumdaki yeni satırlardan eylem başına düzgün bir örnek (rezervuar örneklemesi)
+#                     bellekte tutulur ve kapat()'ta yazılır
+
+class YenilikOrnekleyici:
+    def __init__(self, kaydedici, isin_adimi=10.0, hiz_adimi=10.0, kota=None, rezervuar=False, tohum=None):
+        self.kaydedici = kaydedici
+        self.isin_adimi = isin_adimi
+        self.hiz_adimi = hiz_adimi
+        # kota: None (sınırsız), tek sayı (her eylem için) ya da eylem adı -> sayı sözlüğü
+        if kota is None or isinstance(kota, dict):
+            self.kotalar = [None if kota is None else kota.get(a) for a in AKSIYON_LISTESI]
+        else:
+            self.kotalar = [kota] * len(AKSIYON_LISTESI)
+        self.rezervuar = [[] for _ in AKSIYON_LISTESI] if rezervuar else None
+        self.rng = random.Random(tohum)
+        self.anahtarlar = set()
+        self.gorulen = [0] * len(AKSIYON_LISTESI)   # oturumda kotaya aday olan yeni satırlar
+        self.yazilan = [0] * len(AKSIYON_LISTESI)
+        self.mevcut = 0          # dosyada zaten bulunan satırlar
+        self.tekrar = 0          # benzeri saklı olduğu için atlanan satırlar
+        self.kota_disi = 0       # kota/rezervuar yüzünden atlanan satırlar
+        self.cikarilan = 0       # rezervuarda yerini yeni satıra bırakan örnekler
+
+    def anahtarlari_olustur(self, X):
+        # (n, 42) girdiler -> satır başına kabalaştırılmış bayt anahtarı (ivme olduğu gibi)
+        X = np.asarray(X, dtype=np.float64).reshape(-1, OZELLIK_SAYISI)
+        q = np.empty(X.shape, dtype=np.int32)
+        q[:, :-2] = np.floor(X[:, :-2] / self.isin_adimi)
+        q[:, -2] = np.floor(X[:, -2] / self.hiz_adimi)
+        q[:, -1] = np.rint(X[:, -1])
+        return [satir.tobytes() for satir in q]
+
+    def mevcudu_yukle(self, yol):
+        # Hedef dosyada zaten bulunan satırların anahtarlarını kümeye ekler
+        from veri_yukleyici import bloklari_oku
+        if not os.path.exists(yol) or os.path.getsize(yol) == 0:
+            return 0
+        for X, _ in bloklari_oku(yol):
+            self.anahtarlar.update(self.anahtarlari_olustur(np.nan_to_num(X, nan=0.0)))
+            self.mevcut += len(X)
+        return self.mevcut
+
+    def kaydet(self, lidar_verisi, arac_hizi, arac_ivmesi, aksiyon):
+        # Satır saklandıysa (ya da rezervuara alındıysa) True
+        anahtar = self.anahtarlari_olustur(np.append(lidar_verisi, (arac_hizi, arac_ivmesi)))[0]
+        if anahtar in self.anahtarlar:
+            self.tekrar += 1
+            return False
+        a = AKSIYON_DICT[aksiyon]
+        kota = self.kotalar[a]
+        self.gorulen[a] += 1
+        if self.rezervuar is not None and kota is not None:
+            satir = (anahtar, np.array(lidar_verisi, dtype=np.float32), arac_hizi, arac_ivmesi)
+            havuz = self.rezervuar[a]
+            if len(havuz) < kota:
+                havuz.append(satir)
+            else:
+                j = self.rng.randrange(self.gorulen[a])
+                if j >= kota:
+                    self.kota_disi += 1
+                    return False
+                self.anahtarlar.discard(havuz[j][0])   # çıkarılan örnek yeniden yeni sayılabilir
+                havuz[j] = satir
+                self.cikarilan += 1
+            self.anahtarlar.add(anahtar)
+            return True
+        if kota is not None and self.yazilan[a] >= kota:
+            self.kota_disi += 1
+            return False
+        self.anahtarlar.add(anahtar)
+        self.yazilan[a] += 1
+        self.kaydedici.kaydet(lidar_verisi, arac_hizi, arac_ivmesi, aksiyon)
+        return True
+
+    def ozet(self):
+        bekleyen = sum(len(h) for h in self.rezervuar) if self.rezervuar is not None else 0
+        return {"yazilan": sum(self.yazilan), "rezervuarda": bekleyen, "mevcut": self.mevcut,
+                "tekrar": self.tekrar, "kota_disi": self.kota_disi, "atlanan": self.tekrar + self.kota_disi,
+                "cikarilan": self.cikarilan}
+
+    @property
+    def satir_sayisi(self):
+        return self.kaydedici.satir_sayisi
+
+    def bosalt(self):
+        self.kaydedici.bosalt()
+
+    def kapat(self):
+        if self.rezervuar is not None:
+            for a, havuz in enumerate(self.rezervuar):
+                for _, lidar, hiz, ivme in havuz:
+                    self.kaydedici.kaydet(lidar, hiz, ivme, AKSIYON_LISTESI[a])
+                self.yazilan[a] += len(havuz)
+                havuz.clear()
+        self.kaydedici.kapat()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *hata):
+        self.kapat()
@@ -0,0 +1,215 @@
+import os
+import sys
+import json
+import time
+import argparse
+import warnings
+import numpy as np
+from simulasyon import AKSIYON_DICT, AKSIYON_LISTESI, MODEL_DOSYA_ADI, KOMPAKT_MODEL_DOSYA_ADI
+
+# ---------- DÜŞÜK GECİKMELİ KNN ÇIKARIMI ----------
+# predict_proba'nın kare başına maliyeti (girdi doğrulama, liste -> dizi, classes_ eşleme döngüsü) yerine:
+#   - her eğitim satırının AKSIYON_LISTESI indeksi yüklemede bir kez hesaplanır
+#   - girdi için önceden ayrılmış tek bir tampon yeniden kullanılır
+#   - küçük referans kümelerinde düz matris (||x||^2 - 2 x·q), büyüklerde önceden kurulmuş KD-ağacı
+# Olasılıklar predict_proba ile aynıdır (yalnızca eşit uzaklıktaki komşuların seçimi farklı olabilir).
+#
+# 100 µs/çağrı bütçesi tam modelde yalnızca küçük referans kümelerinde tutar. Arama kesin olduğu için
+# maliyet satır sayısıyla büyür: 42 boyutta KD-ağacı budaması zayıftır, düz tarama ise her çağrıda tüm
+# referans matrisini okur. Tek çekirdekte ölçülen:
+#   - 3.4k satır (depodaki model), düz tarama : ~95 µs
+#   - 100k satır, düz tarama                  : ~6.3 ms
+#   - 100k satır, KD-ağacı                    : ~3.6-5.7 ms
+# Büyük veri setlerinde bütçe kompakt prototip modeliyle tutar (egitici.py --kompakt): aynı 100k satır
+# ~800 prototipe iner ve çağrı ~30 µs sürer. gecikme_olc ve bu betiğin CLI'ı bütçe aşımını bildirir.
+
+# Bu satır sayısına kadar düz matris taraması KD-ağacı sorgusunun sabit maliyetinden ucuzdur
+DUZ_TARAMA_SINIRI = 20000
+
+# ---------- KOMPAKT PROTOTİP MODELİ ----------
+# egitici.py --kompakt ile seçilen prototipler (ENN/CNN) float32 olarak ham ikili dosyaya yazılır:
+#   [prototipler (n, d) float32][etiketler (n,) uint8, AKSIYON_LISTESI indeksi] + yanında .json şema
+# Yükleme np.memmap ile yapılır, sklearn/joblib gerekmez.
+
+def prototip_sema_yolu(yol):
+    return os.path.splitext(yol)[0] + ".json"
+
+def prototip_semasi(yol):
+    # Aynı adlı .json başka bir şemaya (ör. .f32 veri seti) ait olabilir; tür alanı kontrol edilir.
+    # Prototip modeli değilse None
+    try:
+        with open(prototip_sema_yolu(yol), "r", encoding="utf-8") as f:
+            sema = json.load(f)
+        return sema if sema.get("tur") == "knn_prototip" else None
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def prototip_mi(yol):
+    return prototip_semasi(yol) is not None
+
+def prototip_kaydet(yol, X, y, k, **bilgi):
+    # y aksiyon adları veya AKSIYON_LISTESI indeksleri olabilir
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    y = np.asarray(y)
+    if y.dtype.kind not in "iu":
+        y = np.array([AKSIYON_DICT[a] for a in y])
+    with open(yol, "wb") as f:
+        f.write(X.tobytes())
+        f.write(y.astype(np.uint8).tobytes())
+    sema = {"tur": "knn_prototip", "surum": 1, "k": int(k), "satir": len(X), "ozellik": X.shape[1],
+            "dtype": "float32", "aksiyonlar": AKSIYON_LISTESI}
+    sema.update(bilgi)
+    with open(prototip_sema_yolu(yol), "w", encoding="utf-8") as f:
+        json.dump(sema, f, ensure_ascii=False, indent=2)
+
+class PrototipModeli:
+    def __init__(self, prototipler, etiketler, k, bilgi=None):
+        self.prototipler = prototipler   # (n, d) float32, çoğunlukla diske eşlenmiş
+        self.etiketler = etiketler       # (n,) AKSIYON_LISTESI indeksi
+        self.n_neighbors = k
+        self.bilgi = bilgi or {}
+
+def prototip_yukle(yol, mmap=True):
+    with open(prototip_sema_yolu(yol), "r", encoding="utf-8") as f:
+        sema = json.load(f)
+    if sema.get("tur") != "knn_prototip" or sema["aksiyonlar"] != AKSIYON_LISTESI:
+        raise ValueError(f"'{yol}' uyumlu bir prototip modeli değil")
+    n, d = sema["satir"], sema["ozellik"]
+    if mmap:
+        X = np.memmap(yol, dtype=np.float32, mode="r", shape=(n, d))
+        y = np.memmap(yol, dtype=np.uint8, mode="r", offset=n * d * 4, shape=(n,))
+    else:
+        ham = np.fromfile(yol, dtype=np.uint8)
+        X = ham[:n * d * 4].view(np.float32).reshape(n, d); y = ham[n * d * 4:n * d * 4 + n]
+    return PrototipModeli(X, y, sema["k"], sema)
+
+class KNNCikarimMotoru:
+    def __init__(self, model, yontem=None, yaprak_boyu=40):
+        if not self.destekleniyor(model):
+            raise ValueError("Yalnızca uniform ağırlıklı, öklid metrikli KNeighborsClassifier desteklenir")
+        self.k = model.n_neighbors
+        if isinstance(model, PrototipModeli):
+            # float32 diskte; sorgu kayan nokta hassasiyeti için float64 kopya (prototip kümesi küçüktür)
+            referans = np.ascontiguousarray(model.prototipler, dtype=np.float64)
+            self.etiketler = np.asarray(model.etiketler, dtype=np.intp)
+        else:
+            referans = np.ascontiguousarray(model._fit_X, dtype=np.float64)
+            # Sınıf -> AKSIYON_LISTESI eşlemesi bir kez; bilinmeyen sınıflar fazladan 5. kutuya düşer
+            sinif_indeksi = np.array([AKSIYON_DICT.get(s, len(AKSIYON_LISTESI)) for s in model.classes_], dtype=np.intp)
+            self.etiketler = sinif_indeksi[model._y]
+        self.kutu_sayisi = len(AKSIYON_LISTESI) + 1
+        self.yontem = yontem or ("duz" if len(referans) <= DUZ_TARAMA_SINIRI else "agac")
+        if self.yontem == "agac":
+            from sklearn.neighbors import KDTree
+            self.agac = KDTree(referans, leaf_size=yaprak_boyu)
+        else:
+            self.referans = referans
+            self.normlar = np.einsum("ij,ij->i", referans, referans)
+            self.uzaklik = np.empty(len(referans))
+        self.tampon = np.empty((1, referans.shape[1]))
+
+    @staticmethod
+    def destekleniyor(model):
+        if isinstance(model, PrototipModeli):
+            return True
+        metrik = getattr(model, "metric", None)
+        oklid = metrik == "euclidean" or (metrik == "minkowski" and getattr(model, "p", 2) == 2)
+        return (getattr(model, "weights", None) == "uniform" and oklid and hasattr(model, "_fit_X")
+                and hasattr(model, "_y") and getattr(model, "outputs_2d_", False) is False)
+
+    def _komsular(self, sorgu):
+        if self.yontem == "agac":
+            return self.agac.query(sorgu, k=self.k, return_distance=False, sort_results=False)[0]
+        # ||x - q||^2 = ||x||^2 - 2 x·q + ||q||^2; son terim sıralamayı değiştirmez
+        uzaklik = np.matmul(self.referans, sorgu[0], out=self.uzaklik)
+        uzaklik *= -2.0
+        uzaklik += self.normlar
+        if self.k >= len(uzaklik):
+            return np.arange(len(uzaklik))
+        return np.argpartition(uzaklik, self.k - 1)[:self.k]
+
+    def olasiliklar(self, lidar_verisi, hiz, ivme):
+        tampon = self.tampon
+        tampon[0, :-2] = lidar_verisi
+        tampon[0, -2] = hiz; tampon[0, -1] = ivme
+        sayilar = np.bincount(self.etiketler[self._komsular(tampon)], minlength=self.kutu_sayisi)
+        return sayilar[:len(AKSIYON_LISTESI)] / self.k
+
+    def olasiliklar_toplu(self, girdiler, blok_boyu=1024):
+        girdiler = np.asarray(girdiler, dtype=np.float64)
+        if self.yontem == "agac":
+            komsular = self.agac.query(girdiler, k=self.k, return_distance=False)
+        else:
+            komsular = np.empty((len(girdiler), self.k), dtype=np.intp)
+            for bas in range(0, len(girdiler), blok_boyu):
+                blok = girdiler[bas:bas + blok_boyu]
+                uzaklik = self.normlar[None, :] - 2.0 * (blok @ self.referans.T)
+                if self.k >= uzaklik.shape[1]:
+                    komsular[bas:bas + len(blok)] = np.arange(uzaklik.shape[1])
+                else:
+                    komsular[bas:bas + len(blok)] = np.argpartition(uzaklik, self.k - 1, axis=1)[:, :self.k]
+        etiketler = self.etiketler[komsular]
+        sayilar = np.zeros((len(girdiler), self.kutu_sayisi))
+        np.add.at(sayilar, (np.arange(len(girdiler))[:, None], etiketler), 1)
+        return sayilar[:, :len(AKSIYON_LISTESI)] / self.k
+
+def gecikme_olc(yz_surucu, girdiler, tekrar=1, butce_us=100.0):
+    # Her iki yol için çağrı başına ortalama gecikme (µs), farklı çıkan olasılık sayısı ve bütçe durumu
+    # (prototip modelinde predict_proba yolu yoktur: eski_us ve farkli None)
+    lidar_listesi = [(g[:-2].tolist(), float(g[-2]), float(g[-1])) for g in girdiler]
+    motor = yz_surucu.motor
+    eski_us = farkli = None
+    if not hasattr(yz_surucu.model, "prototipler"):   # betik olarak çalışırken sınıf __main__'de de tanımlıdır
+        yz_surucu.motor = None
+        baslangic = time.perf_counter()
+        for _ in range(tekrar):
+            eski = [yz_surucu.olasiliklari_getir(*g) for g in lidar_listesi]
+        eski_us = (time.perf_counter() - baslangic) / (tekrar * len(girdiler)) * 1e6
+        yz_surucu.motor = motor
+    baslangic = time.perf_counter()
+    for _ in range(tekrar):
+        yeni = [yz_surucu.olasiliklari_getir(*g) for g in lidar_listesi]
+    yeni_us = (time.perf_counter() - baslangic) / (tekrar * len(girdiler)) * 1e6
+    if eski_us is not None:
+        farkli = int(np.sum(np.any(np.abs(np.array(eski) - np.array(yeni)) > 1e-12, axis=1)))
+    return {"eski_us": eski_us, "yeni_us": yeni_us, "farkli": farkli, "butce_us": butce_us,
+            "asildi": yeni_us > butce_us, "asim_kat": yeni_us / butce_us}
+
+def ana():
+    from simulasyon import YapayZekaSurucusu
+    parser = argparse.ArgumentParser(description="KNN çıkarım gecikmesini ölçer (predict_proba vs. motor)")
+    parser.add_argument("--model", default=MODEL_DOSYA_ADI, help="Ölçülecek model dosyası")
+    parser.add_argument("--sorgu", type=int, default=2000, help="Sorgu sayısı")
+    parser.add_argument("--butce-us", type=float, default=100.0, help="Çağrı başına gecikme bütçesi (µs)")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    yz_surucu = YapayZekaSurucusu(args.model)
+    if yz_surucu.motor is None:
+        print("HATA: Model yüklenemedi ya da motor bu modeli desteklemiyor.")
+        return 1
+    rng = np.random.default_rng(0)
+    model = yz_surucu.model
+    referans = model.prototipler if hasattr(model, "prototipler") else model._fit_X
+    girdiler = np.asarray(referans[rng.integers(0, len(referans), args.sorgu)], dtype=np.float64) + rng.normal(0, 5, (args.sorgu, referans.shape[1]))
+
+    olcum = gecikme_olc(yz_surucu, girdiler, butce_us=args.butce_us)
+    yeni_us = olcum["yeni_us"]
+    print(f"[SONUÇ] Referans satır: {len(referans)}, k={yz_surucu.model.n_neighbors}, yöntem: {yz_surucu.motor.yontem}")
+    if olcum["eski_us"] is None:
+        print(f"  çıkarım motoru     : {yeni_us:8.1f} µs/çağrı (prototip modeli)")
+    else:
+        print(f"  predict_proba yolu : {olcum['eski_us']:8.1f} µs/çağrı")
+        print(f"  çıkarım motoru     : {yeni_us:8.1f} µs/çağrı ({olcum['eski_us'] / yeni_us:.1f}x)")
+        print(f"  farklı olasılık    : {olcum['farkli']}/{len(girdiler)} (eşit uzaklıklı komşu seçimi)")
+    if not olcum["asildi"]:
+        print(f"  bütçe {args.butce_us:.0f} µs     : TAMAM")
+        return 0
+    print(f"  bütçe {args.butce_us:.0f} µs     : AŞILDI ({olcum['asim_kat']:.1f}x)")
+    if olcum["eski_us"] is not None:
+        print(f"UYARI: Kesin KNN araması {len(referans)} satırda bütçeye sığmıyor. Kompakt prototip modeli için:\n"
+              f"       python egitici.py --kompakt  ->  python knn_cikarim.py --model {KOMPAKT_MODEL_DOSYA_ADI}")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(ana())
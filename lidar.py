@@ -0,0 +1,331 @@
+import math
+import bisect
+import numpy as np
+
+# ---------- VEKTÖREL LIDAR ----------
+# Tüm ışınlar tüm engellere karşı tek bir NumPy çağrısında test edilir (slab yöntemi).
+# Işın parçası: (ox, oy) -> (ox + dx, oy + dy), t ∈ [0, 1].
+# Sonuçlar main.py'deki line_rect_collision döngüsüyle aynıdır (kayan nokta toleransı içinde).
+
+
+def engel_dizisi(engeller):
+    # Engel listesini (M, 4) [sol, üst, sağ, alt] dizisine çevirir
+    if not engeller:
+        return np.zeros((0, 4))
+    return np.array([(e.rect.left, e.rect.top, e.rect.right, e.rect.bottom) for e in engeller], dtype=float)
+
+
+def _eksen_araligi(o, d, alt_sinir, ust_sinir):
+    # Tek eksen için ışının kutuya girdiği / çıktığı t aralığı
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t1 = (alt_sinir - o) / d
+        t2 = (ust_sinir - o) / d
+    giris = np.minimum(t1, t2)
+    cikis = np.maximum(t1, t2)
+    # Eksene paralel ışın: içerideyse eksen kısıtı yok, dışarıdaysa hiç kesişmez
+    paralel = d == 0
+    if np.any(paralel):
+        icinde = (o >= alt_sinir) & (o <= ust_sinir)
+        giris = np.where(paralel, np.where(icinde, -np.inf, np.inf), giris)
+        cikis = np.where(paralel, np.where(icinde, np.inf, -np.inf), cikis)
+    return giris, cikis
+
+
+def kesisim_t(ox, oy, dx, dy, kutular):
+    """Her (ışın, kutu) çifti için kenara çarpma parametresini döndürür.
+
+    ox, oy, dx, dy (..., R) ve kutular (..., M, 4) boyutlarında olmalı.
+    Sonuç (..., R, M); çarpma yoksa np.inf.
+    """
+    ox = np.asarray(ox, dtype=float)[..., None]; oy = np.asarray(oy, dtype=float)[..., None]
+    dx = np.asarray(dx, dtype=float)[..., None]; dy = np.asarray(dy, dtype=float)[..., None]
+    kutular = np.asarray(kutular, dtype=float)[..., None, :, :]
+    gx, cx = _eksen_araligi(ox, dx, kutular[..., 0], kutular[..., 2])
+    gy, cy = _eksen_araligi(oy, dy, kutular[..., 1], kutular[..., 3])
+    giris = np.maximum(gx, gy)
+    cikis = np.minimum(cx, cy)
+    # Işın kutunun içinden başlıyorsa ilk kenar teması çıkış noktasıdır
+    t = np.where(giris >= 0, giris, cikis)
+    # line_rect_collision ile aynı: t == 0 çarpma sayılmaz, parça kenara ulaşmalı
+    carpti = (giris <= cikis) & (t > 0) & (t <= 1)
+    return np.where(carpti, t, np.inf)
+
+
+def en_yakin_kesisim(ox, oy, dx, dy, kutular):
+    # Her ışın için en yakın çarpma: (t (..., R) [çarpma yoksa 1.0], engel indeksi (..., R) [yoksa -1])
+    t = kesisim_t(ox, oy, dx, dy, kutular)
+    if t.shape[-1] == 0:
+        bos = t.shape[:-1]
+        return np.ones(bos), np.full(bos, -1, dtype=np.intp)
+    idx = np.argmin(t, axis=-1)
+    t_min = np.take_along_axis(t, idx[..., None], axis=-1)[..., 0]
+    carpti = np.isfinite(t_min)
+    return np.where(carpti, t_min, 1.0), np.where(carpti, idx, -1)
+
+
+def lidar_tara(x, y, yon, kutular, acilar, menzil):
+    # Tek araç için tüm LIDAR taraması: (mesafeler (R,), çarpma noktaları (R, 2))
+    gercek_acilar = yon + np.asarray(acilar, dtype=float)
+    ux, uy = np.cos(gercek_acilar), np.sin(gercek_acilar)
+    t, _ = en_yakin_kesisim(np.full_like(ux, x), np.full_like(uy, y), ux * menzil, uy * menzil, kutular)
+    mesafeler = t * menzil
+    noktalar = np.stack((x + ux * mesafeler, y + uy * mesafeler), axis=-1)
+    return mesafeler, noktalar
+
+
+# ---------- GENİŞ FAZ: DÜZGÜN IZGARA ----------
+# Engeller kapladıkları hücrelere kaydedilir; engel hareket ettikçe yalnızca hücre aralığı değiştiğinde
+# güncellenir. Her ışın sadece geçtiği hücrelerdeki (DDA ile) aday engellerle test edilir.
+
+class UzamsalIzgara:
+    def __init__(self, hucre_boyu=50):
+        self.hucre = float(hucre_boyu)
+        self.hucreler = {}    # (hx, hy) -> engel kümesi
+        self.araliklar = {}   # engel -> (hx0, hy0, hx1, hy1)
+
+    def _aralik(self, kutu):
+        h = self.hucre
+        return (math.floor(kutu.left / h), math.floor(kutu.top / h),
+                math.floor(kutu.right / h), math.floor(kutu.bottom / h))
+
+    def ekle(self, engel):
+        aralik = self._aralik(engel.rect)
+        self.araliklar[engel] = aralik
+        hx0, hy0, hx1, hy1 = aralik
+        for hx in range(hx0, hx1 + 1):
+            for hy in range(hy0, hy1 + 1):
+                self.hucreler.setdefault((hx, hy), set()).add(engel)
+
+    def sil(self, engel):
+        hx0, hy0, hx1, hy1 = self.araliklar.pop(engel)
+        for hx in range(hx0, hx1 + 1):
+            for hy in range(hy0, hy1 + 1):
+                kume = self.hucreler[(hx, hy)]
+                kume.discard(engel)
+                if not kume:
+                    del self.hucreler[(hx, hy)]
+
+    def guncelle(self, engel):
+        # Hücre aralığı değişmediyse hiçbir şey yapılmaz (çoğu karede durum budur)
+        if self._aralik(engel.rect) != self.araliklar.get(engel):
+            if engel in self.araliklar:
+                self.sil(engel)
+            self.ekle(engel)
+
+    def temizle(self):
+        self.hucreler.clear(); self.araliklar.clear()
+
+    def isin_adaylari(self, x0, y0, x1, y1):
+        # Amanatides-Woo DDA: parçanın geçtiği hücrelerdeki engeller
+        h = self.hucre
+        hx, hy = math.floor(x0 / h), math.floor(y0 / h)
+        son_hx, son_hy = math.floor(x1 / h), math.floor(y1 / h)
+        dx, dy = x1 - x0, y1 - y0
+        adim_x = 1 if dx > 0 else -1; adim_y = 1 if dy > 0 else -1
+        t_max_x = ((hx + (dx > 0)) * h - x0) / dx if dx != 0 else math.inf
+        t_max_y = ((hy + (dy > 0)) * h - y0) / dy if dy != 0 else math.inf
+        t_delta_x = h / abs(dx) if dx != 0 else math.inf
+        t_delta_y = h / abs(dy) if dy != 0 else math.inf
+
+        adaylar = set()
+        hucreler = self.hucreler
+        for _ in range(abs(son_hx - hx) + abs(son_hy - hy) + 1):
+            kume = hucreler.get((hx, hy))
+            if kume:
+                adaylar |= kume
+            if t_max_x < t_max_y:
+                hx += adim_x; t_max_x += t_delta_x
+            else:
+                hy += adim_y; t_max_y += t_delta_y
+        return adaylar
+
+
+def lidar_tara_izgara(x, y, yon, izgara, acilar, menzil):
+    # lidar_tara ile aynı sonuç; yalnızca ışın başına aday (ışın, engel) çiftleri test edilir
+    gercek_acilar = yon + np.asarray(acilar, dtype=float)
+    ux, uy = np.cos(gercek_acilar), np.sin(gercek_acilar)
+    uclar_x = (x + ux * menzil).tolist(); uclar_y = (y + uy * menzil).tolist()
+
+    sutun = {}; isin_idx = []; engel_idx = []
+    for i in range(len(uclar_x)):
+        for engel in izgara.isin_adaylari(x, y, uclar_x[i], uclar_y[i]):
+            isin_idx.append(i)
+            engel_idx.append(sutun.setdefault(engel, len(sutun)))
+
+    t_isin = np.ones(len(uclar_x))
+    if isin_idx:
+        isin_idx = np.array(isin_idx); engel_idx = np.array(engel_idx)
+        kutular = engel_dizisi(list(sutun))
+        t = kesisim_t(np.full(len(isin_idx), x)[:, None], np.full(len(isin_idx), y)[:, None],
+                      (ux * menzil)[isin_idx][:, None], (uy * menzil)[isin_idx][:, None],
+                      kutular[engel_idx][:, None, :])[:, 0, 0]
+        np.minimum.at(t_isin, isin_idx, np.minimum(t, 1.0))
+    mesafeler = t_isin * menzil
+    noktalar = np.stack((x + ux * mesafeler, y + uy * mesafeler), axis=-1)
+    return mesafeler, noktalar
+
+
+# ---------- ARTIMSAL (KAREDEN KAREYE) TARAMA ----------
+# İki kare arasında araç ve engeller yalnızca birkaç piksel kayar. ArtimsalLidar ışın başına isabet
+# durumunu (engel, t) ve engel başına menzil payını (menzile uzaklık) kareler arasında saklar:
+#   - menzil dışındaki engel, araç + engel yer değiştirmeleri bu payı tüketene kadar hiç test edilmez
+#   - menzildeki engel yalnızca açısal olarak kapsadığı ışınlara aday olur
+#   - ışın önce önceki karede çarptığı engelle, sonra yakından uzağa diğer adaylarla test edilir;
+#     en yakın noktası bulunan isabetten uzak adaylar atlanır
+#   - hiçbir şey hareket etmediyse önceki tarama aynen döner
+# Sıfırlamadan sonra (gecersiz_kil), engel sayısı değişince ya da büyük yön/konum sıçramasında tam
+# tarama yapılır. Kesişim hesabı kesisim_t ile aynı işlemlerdir; sonuç lidar_tara ile birebir aynıdır.
+
+def _kesisim_t_tek(ox, oy, dx, dy, sol, ust, sag, alt):
+    # kesisim_t'nin tek (ışın, kutu) çifti için skaler karşılığı (aynı işlemler, aynı sonuç)
+    if dx != 0:
+        gx = (sol - ox) / dx; cx = (sag - ox) / dx
+        if gx > cx: gx, cx = cx, gx
+    elif sol <= ox <= sag:
+        gx, cx = -math.inf, math.inf
+    else:
+        return math.inf
+    if dy != 0:
+        gy = (ust - oy) / dy; cy = (alt - oy) / dy
+        if gy > cy: gy, cy = cy, gy
+    elif ust <= oy <= alt:
+        gy, cy = -math.inf, math.inf
+    else:
+        return math.inf
+    giris = gx if gx > gy else gy
+    cikis = cx if cx < cy else cy
+    t = giris if giris >= 0 else cikis
+    return t if giris <= cikis and 0 < t <= 1 else math.inf
+
+
+def _kutu_uzakligi(x, y, kutu):
+    sol, ust, sag, alt = kutu
+    return math.hypot(x - min(max(x, sol), sag), y - min(max(y, ust), alt))
+
+
+class ArtimsalLidar:
+    PAY = 1e-6          # uzaklık karşılaştırmalarında kayan nokta payı (px)
+    ACI_PAYI = 1e-7     # açısal kapsama payı (rad)
+
+    def __init__(self, acilar, menzil, buyuk_donus=0.2, buyuk_sicrama=None):
+        self.acilar = np.asarray(acilar, dtype=float)
+        self._sirali = sorted(self.acilar.tolist())
+        self._sira = np.argsort(self.acilar, kind="stable").tolist()
+        self.menzil = menzil
+        self.buyuk_donus = buyuk_donus
+        self.buyuk_sicrama = buyuk_sicrama if buyuk_sicrama is not None else menzil / 4
+        # Sayaçlar: tam tarama, artımsal tarama, değişmeden dönen kare, test edilen (ışın, engel) çifti
+        self.tam = 0; self.artimsal = 0; self.ayni = 0; self.test_edilen = 0
+        self.gecersiz_kil()
+
+    def gecersiz_kil(self):
+        self._poz = None
+
+    def tara(self, x, y, yon, kutular):
+        """lidar_tara ile aynı (mesafeler (R,), noktalar (R, 2)); kutular [(sol, üst, sağ, alt), ...]."""
+        if isinstance(kutular, np.ndarray):
+            kutular = [tuple(k) for k in kutular.tolist()]
+        if self._poz is None or len(kutular) != len(self._kutular):
+            return self._tam_tara(x, y, yon, kutular)
+        px, py, pyon = self._poz
+        kayma = math.hypot(x - px, y - py)
+        if abs(yon - pyon) > self.buyuk_donus or kayma > self.buyuk_sicrama:
+            return self._tam_tara(x, y, yon, kutular)
+        if kayma == 0 and yon == pyon and kutular == self._kutular:
+            self.ayni += 1
+            return self._sonuc
+        return self._artimsal_tara(x, y, yon, kutular, kayma)
+
+    def _tam_tara(self, x, y, yon, kutular):
+        self.tam += 1
+        ux, uy = np.cos(yon + self.acilar), np.sin(yon + self.acilar)
+        t, idx = en_yakin_kesisim(np.full_like(ux, x), np.full_like(uy, y), ux * self.menzil, uy * self.menzil,
+                                  np.array(kutular, dtype=float).reshape(-1, 4))
+        self._isabet = idx.tolist()
+        self._pay = [_kutu_uzakligi(x, y, k) - self.menzil - self.PAY for k in kutular]
+        return self._bitir(x, y, yon, kutular, ux, uy, t)
+
+    def _bitir(self, x, y, yon, kutular, ux, uy, t):
+        mesafeler = t * self.menzil
+        noktalar = np.empty((len(mesafeler), 2))
+        noktalar[:, 0] = x + ux * mesafeler; noktalar[:, 1] = y + uy * mesafeler
+        self._poz = (x, y, yon)
+        self._kutular = kutular
+        self._sonuc = (mesafeler, noktalar)
+        return self._sonuc
+
+    def _isin_araligi(self, x, y, yon, kutu):
+        # Kutunun araçtan görünen açısal aralığına düşen ışınlar. Araç kutunun dışındadır (aralık < pi);
+        # aralığın uçları bulunduğu bölgeye göre seçilen iki silüet köşesidir.
+        sol, ust, sag, alt = kutu
+        if x < sol:
+            k1, k2 = ((sag, ust), (sol, alt)) if y < ust else ((sol, ust), (sag, alt)) if y > alt else ((sol, ust), (sol, alt))
+        elif x > sag:
+            k1, k2 = ((sol, ust), (sag, alt)) if y < ust else ((sag, ust), (sol, alt)) if y > alt else ((sag, ust), (sag, alt))
+        else:
+            k1, k2 = ((sol, ust), (sag, ust)) if y < ust else ((sol, alt), (sag, alt))
+        a1 = math.remainder(math.atan2(k1[1] - y, k1[0] - x) - yon, math.tau)
+        fark = math.remainder(math.atan2(k2[1] - y, k2[0] - x) - yon - a1, math.tau)
+        alt_aci, ust_aci = (a1, a1 + fark) if fark >= 0 else (a1 + fark, a1)
+        sirali = self._sirali
+        bas = bisect.bisect_left(sirali, alt_aci - self.ACI_PAYI)
+        isinlar = self._sira[bas:bisect.bisect_right(sirali, ust_aci + self.ACI_PAYI, bas)]
+        # -pi / pi sınırını aşan aralığın diğer ucu
+        if ust_aci > math.pi:
+            isinlar += self._sira[:bisect.bisect_right(sirali, ust_aci - math.tau + self.ACI_PAYI)]
+        elif alt_aci < -math.pi:
+            isinlar += self._sira[bisect.bisect_left(sirali, alt_aci + math.tau - self.ACI_PAYI):]
+        return isinlar
+
+    def _artimsal_tara(self, x, y, yon, kutular, kayma):
+        self.artimsal += 1
+        menzil = self.menzil; pay_siniri = self.PAY
+        # 1. Menzildeki engeller; payı tükenmeyen engelin uzaklığı hesaplanmaz bile
+        yakinlar = []
+        eski_kutular = self._kutular; paylar = self._pay
+        for j, kutu in enumerate(kutular):
+            eski = eski_kutular[j]
+            if kutu == eski:
+                hareket = 0.0
+            else:
+                hareket = math.hypot(max(abs(kutu[0] - eski[0]), abs(kutu[2] - eski[2])),
+                                     max(abs(kutu[1] - eski[1]), abs(kutu[3] - eski[3])))
+            pay = paylar[j] - kayma - hareket
+            if pay > 0:
+                paylar[j] = pay
+                continue
+            uzaklik = _kutu_uzakligi(x, y, kutu)
+            paylar[j] = uzaklik - menzil - pay_siniri
+            if paylar[j] <= 0:
+                yakinlar.append((uzaklik, j))
+
+        ux, uy = np.cos(yon + self.acilar), np.sin(yon + self.acilar)
+        isin_sayisi = len(self.acilar)
+        t = [1.0] * isin_sayisi
+        isabet = [-1] * isin_sayisi
+        if yakinlar:
+            dxs = (ux * menzil).tolist(); dys = (uy * menzil).tolist()
+            yakinlar.sort()
+            uzakliklar = {j: u for u, j in yakinlar}
+            # 2. Önceki karede çarpılan engel hâlâ menzildeyse ilk aday odur; sınırı daraltır
+            onceki = self._isabet
+            for i in range(isin_sayisi):
+                j = onceki[i]
+                if j >= 0 and j in uzakliklar:
+                    tj = _kesisim_t_tek(x, y, dxs[i], dys[i], *kutular[j])
+                    self.test_edilen += 1
+                    if tj <= 1:
+                        t[i] = tj; isabet[i] = j
+            # 3. Diğer engeller yakından uzağa, yalnızca kapsadıkları ışınlarda
+            for uzaklik, j in yakinlar:
+                kutu = kutular[j]
+                isinlar = range(isin_sayisi) if uzaklik == 0 else self._isin_araligi(x, y, yon, kutu)
+                for i in isinlar:
+                    if onceki[i] == j or uzaklik > t[i] * menzil + pay_siniri:
+                        continue
+                    tj = _kesisim_t_tek(x, y, dxs[i], dys[i], *kutu)
+                    self.test_edilen += 1
+                    if tj < t[i] or (tj <= 1 and isabet[i] < 0):
+                        t[i] = tj; isabet[i] = j
+        self._isabet = isabet
+        return self._bitir(x, y, yon, kutular, ux, uy, np.array(t))
@@ -1,217 +1,164 @@
+import os
+import time
+_ICE_AKTARMA_BASLANGICI = time.perf_counter()
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")   # içe aktarmada konsola yazı basılmasın
 import pygame
 import sys
 import math
 import numpy as np
-from collections import deque
-import random
-import csv
-import os
-import joblib 
+from simulasyon import (Simulasyon, YapayZekaSurucusu, SIM_GENISLIK, EKRAN_Y, FPS, CSV_DOSYA_ADI, IKILI_DOSYA_ADI, LIDAR_MESAFE,
+                        AKSIYON_LISTESI, MODEL_DOSYA_ADI, lengthdir_x, lengthdir_y)
+from kayit import VeriKaydedici, YenilikOrnekleyici
+from arka_egitim import ArkaPlanEgitici
+from profil import KareProfilleyici, BaslangicRaporu
+from bolum_kaydi import BolumKaydedici
+from cizim import YaziOnbellegi, KirliBolgeler, izgara_yuzeyi
 
 # ---------- AYARLAR ----------
-SIM_GENISLIK = 1000
 PANEL_GENISLIK = 450
-EKRAN_G, EKRAN_Y = SIM_GENISLIK + PANEL_GENISLIK, 650
-FPS = 60
+EKRAN_G = SIM_GENISLIK + PANEL_GENISLIK
 
-# Dosya Adları
-CSV_DOSYA_ADI = "otonom_veri_seti.csv"
-MODEL_DOSYA_ADI = "knn_model.pkl"
+# Kare profili: aşama süreleri panelde p50/p95/p99, çıkışta PROFIL_DOSYA_ADI'na yazılır (varsayılan kapalı)
+PROFIL_AKTIF = False
+PROFIL_DOSYA_ADI = "kare_profili.csv"
 
-# Renkler
-RENK_ZEMIN = (10, 15, 20); RENK_ARAC = (0, 255, 255); RENK_GRID = (40, 50, 60)
-RENK_PANEL_BG = (25, 25, 35); RENK_ENGEL = (255, 50, 50); RENK_LIDAR = (0, 255, 100)
-RENK_YAZI = (220, 220, 220)
+# Sürücü modeli: KNN (MODEL_DOSYA_ADI) ya da egitici.py --kompakt çıktısı (ör. "knn_prototip.bin")
+MODEL_DOSYASI = MODEL_DOSYA_ADI
 
-# Fiziksel Parametreler
-MAKS_HIZ = 100.0
-LIDAR_MESAFE = 250
-LIDAR_ACILAR = np.linspace(-60, 60, 40) * math.pi/180 
+# Asenkron karar: TOPSIS + KNN arka plan iş parçacığında; döngü en son kararı kullanır.
+# Karar KARAR_BAYATLIK_SINIRI kareden eskiyse döngü taze kararı bekler.
+ASENKRON_KARAR = False
+KARAR_BAYATLIK_SINIRI = 2
 
-# Aksiyon kısımları
-AKSIYON_LISTESI = ["SOLA_KAÇIN", "SAĞA_KAÇIN", "FREN", "SÜRDÜR"]
-AKSIYON_DICT = {aks: i for i, aks in enumerate(AKSIYON_LISTESI)}
-# ----------------------------
+# Artımsal LIDAR: ışın başına isabet durumu kareler arasında saklanır, yalnızca etkilenen ışınlar
+# yeniden hesaplanır (sonuç tam taramayla aynıdır)
+ARTIMSAL_LIDAR = True
 
+# Bölüm kaydı: her kare ikili kayda yazılır, tekrar_oynat.py ile yeniden üretilebilir (None: kapalı;
+# açmak için ör. "son_bolum.bkd"; kare başına ~640 B). Tohum her durumda panelde gösterilir.
+# BOLUM_TOHUMU None ise her çalıştırmada rastgele seçilir ve kayda/panele yazılır.
+BOLUM_KAYDI_DOSYASI = None
+BOLUM_TOHUMU = None
 
+# Renkler
+RENK_ZEMIN = (10, 15, 20); RENK_ARAC = (0, 255, 255); RENK_GRID = (40, 50, 60)
+RENK_PANEL_BG = (25, 25, 35); RENK_ENGEL = (255, 50, 50); RENK_LIDAR = (0, 255, 100)
+RENK_YAZI = (220, 220, 220)
 
-#pencere olusturma
-pygame.init()
-ekran = pygame.display.set_mode((EKRAN_G, EKRAN_Y))
-pygame.display.set_caption("Otonom Araç: Adaptif Hız Kontrollü Karar Destek Sistemi")
-saat = pygame.time.Clock()
+# Pencere ve fontlar ana() içinde kurulur; modül içe aktarılırken yan etki yoktur
+font_baslik = font_veri = font_mini = font_buton = None
+yazi_baslik = yazi_veri = yazi_mini = font_buton_yazi = None
 
-font_baslik = pygame.font.SysFont("Consolas", 22, bold=True)
-font_veri = pygame.font.SysFont("Consolas", 16)
-font_mini = pygame.font.SysFont("Consolas", 12)
-font_buton = pygame.font.SysFont("Arial", 20, bold=True)
+def fontlari_yukle():
+    global font_baslik, font_veri, font_mini, font_buton, yazi_baslik, yazi_veri, yazi_mini, font_buton_yazi
+    font_baslik = pygame.font.SysFont("Consolas", 22, bold=True)
+    font_veri = pygame.font.SysFont("Consolas", 16)
+    font_mini = pygame.font.SysFont("Consolas", 12)
+    font_buton = pygame.font.SysFont("Arial", 20, bold=True)
+    # Değişen yazılar (skorlar, aksiyon, profil değerleri) içeriğe göre önbelleklenir
+    yazi_baslik = YaziOnbellegi(font_baslik, 32); yazi_veri = YaziOnbellegi(font_veri, 32)
+    yazi_mini = YaziOnbellegi(font_mini, 512); font_buton_yazi = YaziOnbellegi(font_buton, 4)
 
 BUTON_RECT = pygame.Rect(SIM_GENISLIK + 50, EKRAN_Y - 80, 350, 50)
-
-# --- CSV Fonksiyonu ---
-if not os.path.exists(CSV_DOSYA_ADI):
-    with open(CSV_DOSYA_ADI, "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        basliklar = [f"Lidar_{i}" for i in range(len(LIDAR_ACILAR))] + ["HIZ", "IVME", "AKSIYON"]
-        writer.writerow(basliklar)
-
-def veri_kaydet(lidar_verisi, arac_hizi, arac_ivmesi, aksiyon):
-    with open(CSV_DOSYA_ADI, "a", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        row = [round(x, 1) for x in lidar_verisi] + [round(arac_hizi, 1), round(arac_ivmesi, 1), aksiyon]
-        writer.writerow(row)
-
-# --- YAPAY ZEKA SÜRÜCÜSÜ ---
-class YapayZekaSurucusu:
-    def __init__(self):
-        self.model = self._modeli_yukle()
-        self.egitildi = self.model is not None
-        
-    def _modeli_yukle(self):
-        try:
-            if os.path.exists(MODEL_DOSYA_ADI):
-                model = joblib.load(MODEL_DOSYA_ADI)
-                print(f"BİLGİ: '{MODEL_DOSYA_ADI}' yüklendi. HİBRİT MOD devrede.")
-                return model
-            else:
-                print(f"UYARI: '{MODEL_DOSYA_ADI}' yok. Sadece Matematik Modu çalışıyor.")
-                return None
-        except Exception as e:
-            print(f"HATA: Model yüklenemedi: {e}")
-            return None
-
-    def olasiliklari_getir(self, lidar_verisi, hiz, ivme):
-        if not self.egitildi:
-            return np.array([0.25, 0.25, 0.25, 0.25])
-        
-        giris_verisi = lidar_verisi + [hiz, ivme]
-        
-        try:
-            ham_olasilik = self.model.predict_proba([giris_verisi])[0]
-            sirali_olasiliklar = np.zeros(4)
-            modelin_siniflari = self.model.classes_
-            
-            for i, sinif_adi in enumerate(modelin_siniflari):
-                if sinif_adi in AKSIYON_DICT:
-                    target_idx = AKSIYON_DICT[sinif_adi]
-                    sirali_olasiliklar[target_idx] = ham_olasilik[i]
-            return sirali_olasiliklar
-        except Exception as e:
-            return np.array([0.25, 0.25, 0.25, 0.25])
-
-#  KARAR VERİCİ
-class MCDMKararVerici:
-    def __init__(self):
-        self.weights = np.array([0.60, 0.20, 0.20]) 
-        self.impacts = np.array([1, 1, -1]) 
-
-    def topsis_hesapla(self, karar_matrisi):
-        matris = np.array(karar_matrisi, dtype=float)
-        rows, cols = matris.shape
-        payda = np.sqrt(np.sum(matris**2, axis=0))
-        payda[payda == 0] = 1 
-        norm_matris = matris / payda
-        agirlikli = norm_matris * self.weights
-        ideal = np.zeros(cols)
-        negatif_ideal = np.zeros(cols)
-        for i in range(cols):
-            if self.impacts[i] == 1: 
-                ideal[i] = np.max(agirlikli[:, i])
-                negatif_ideal[i] = np.min(agirlikli[:, i])
-            else: 
-                ideal[i] = np.min(agirlikli[:, i])
-                negatif_ideal[i] = np.max(agirlikli[:, i])
-        dist_pos = np.sqrt(np.sum((agirlikli - ideal)**2, axis=1))
-        dist_neg = np.sqrt(np.sum((agirlikli - negatif_ideal)**2, axis=1))
-        toplam_dist = dist_pos + dist_neg
-        toplam_dist[toplam_dist == 0] = 1
-        skorlar = dist_neg / toplam_dist
-        return skorlar
-
-# ARAC, ENGEL, SENSOR SINIFLARI
-class SensorPaketi:
-    def __init__(self, arac):
-        self.arac = arac
-        self.gps_noise = 2.0 
-    def veri_oku(self):
-        gps_x = self.arac.x + random.uniform(-self.gps_noise, self.gps_noise)
-        gps_y = self.arac.y + random.uniform(-self.gps_noise, self.gps_noise)
-        ivme_x = self.arac.ivme * math.cos(self.arac.yon) / 10.0 
-        return {"gps": (gps_x, gps_y), "imu_ivme": ivme_x}
-
-class Arac:
-    def __init__(self, x, y):
-        self.x = x; self.y = y; self.yon = 0.0; self.hiz = 30.0; self.ivme = 0.0
-        self.gecmis = deque(maxlen=100)
-    def adim(self, dt):
-        self.hiz += self.ivme * dt
-        self.hiz = max(0.0, min(MAKS_HIZ, self.hiz))
-        self.x += math.cos(self.yon) * self.hiz * dt
-        self.y += math.sin(self.yon) * self.hiz * dt
-        self.gecmis.append((self.x, self.y))
-    def ciz(self, ekran):
-        uzunluk = 40
-        p1 = (self.x + lengthdir_x(uzunluk, self.yon), self.y + lengthdir_y(uzunluk, self.yon))
-        p2 = (self.x + lengthdir_x(uzunluk/2, self.yon + 2.5), self.y + lengthdir_y(uzunluk/2, self.yon + 2.5))
-        p3 = (self.x + lengthdir_x(uzunluk/2, self.yon - 2.5), self.y + lengthdir_y(uzunluk/2, self.yon - 2.5))
-        pygame.draw.polygon(ekran, RENK_ARAC, [p1, p2, p3], 2)
-        pygame.draw.circle(ekran, RENK_ARAC, (int(self.x), int(self.y)), 4)
-        if len(self.gecmis) > 2:
-            pygame.draw.lines(ekran, (0, 100, 100), False, list(self.gecmis), 1)
-
-class Engel:
-    def __init__(self, x, y, w, h, hiz_x=0):
-        self.rect = pygame.Rect(x, y, w, h)
-        self.hiz_x = hiz_x; self.tip = "DINAMIK" if hiz_x != 0 else "STATIK"
-    def adim(self, dt): self.rect.x += self.hiz_x * dt
-    def ciz(self, ekran):
-        renk = RENK_ENGEL if self.tip == "DINAMIK" else (150, 50, 50)
-        pygame.draw.rect(ekran, renk, self.rect, 2)
-        pygame.draw.line(ekran, renk, self.rect.topleft, self.rect.bottomright, 1)
-
-def lengthdir_x(len, dir): return len * math.cos(dir)
-def lengthdir_y(len, dir): return len * math.sin(dir)
-def line_rect_collision(x1, y1, x2, y2, rect):
-    min_t = 1.0; hit = False
-    lines = [((rect.left, rect.top), (rect.right, rect.top)),
-             ((rect.right, rect.top), (rect.right, rect.bottom)),
-             ((rect.right, rect.bottom), (rect.left, rect.bottom)),
-             ((rect.left, rect.bottom), (rect.left, rect.top))]
-    for p3, p4 in lines:
-        x3,y3 = p3; x4,y4 = p4
-        denom = (y4-y3)*(x2-x1) - (x4-x3)*(y2-y1)
-        if denom == 0: continue
-        ua = ((x4-x3)*(y1-y3) - (y4-y3)*(x1-x3)) / denom
-        ub = ((x2-x1)*(y1-y3) - (y2-y1)*(x1-x3)) / denom
-        if 0 <= ua <= 1 and 0 <= ub <= 1:
-            if ua < min_t: min_t = ua; hit = True
-    return min_t if hit else None
-
-def engelleri_rastgele_olustur(sayi):
-    liste = []
-    for _ in range(sayi):
-        x = random.randint(300, SIM_GENISLIK + 200) 
-        y = random.randint(50, EKRAN_Y - 100)
-        w = random.randint(30, 60); h = random.randint(30, 60)
-        hiz = random.uniform(-80, -20) if random.random() > 0.4 else 0
-        liste.append(Engel(x, y, w, h, hiz_x=hiz))
-    return liste
-
-def simulasyonu_sifirla():
-    global arac, engeller, sensorler
-    arac = Arac(100, EKRAN_Y/2)
-    engeller = engelleri_rastgele_olustur(12)
-    sensorler = SensorPaketi(arac)
+SIM_ALANI = pygame.Rect(0, 0, SIM_GENISLIK, EKRAN_Y)
+PANEL_ALANI = pygame.Rect(SIM_GENISLIK, 0, PANEL_GENISLIK, EKRAN_Y)
+
+# --- Veri Kaydı ---
+# "csv": otonom_veri_seti.csv (uyumlu), "f32": otonom_veri_seti.f32 (memmap ile yüklenebilir ikili)
+KAYIT_BICIMI = "csv"
+KAYIT_ARALIGI = 10   # kaç karede bir satır adayı alınır
+# Yenilik örneklemesi: yalnızca kabalaştırılmış girdisi (ışın / hız adımları) dosyada henüz olmayan
+# satırlar yazılır. EYLEM_KOTASI: None, tek sayı ya da {"SÜRDÜR": 500, ...}; KOTA_REZERVUAR True ise
+# kota aşılınca oturumdaki satırlardan düzgün örnek tutulur ve çıkışta yazılır.
+YENILIK_ORNEKLEME = False
+YENILIK_ADIMLARI = (10.0, 10.0)
+EYLEM_KOTASI = None
+KOTA_REZERVUAR = False
+# Arka plan yeniden eğitimi: son eğitimden beri YENIDEN_EGITIM_ESIGI yeni satır kaydedilince model ayrı
+# bir süreçte yeniden eğitilir, MODEL_DOSYASI atomik olarak değiştirilir (prototip modeli prototip olarak
+# kalır) ve döngü durmadan devreye alınır.
+# Varsayılan kapalı: açıkken MODEL_DOSYASI (varsayılan: depodaki knn_model.pkl) değişir ve bölüm ortasında
+# model değişebilir
+ARKA_PLAN_EGITIMI = False
+YENIDEN_EGITIM_ESIGI = 500
+
+# --- ÇİZİM (simülasyon çekirdeği pygame'e bağlı değildir) ---
+# Çizim fonksiyonları etkilenen bölgeyi (Rect) döndürür; yalnızca bu bölgeler ekrana aktarılır.
+def arac_ciz(ekran, arac):
+    uzunluk = 40
+    p1 = (arac.x + lengthdir_x(uzunluk, arac.yon), arac.y + lengthdir_y(uzunluk, arac.yon))
+    p2 = (arac.x + lengthdir_x(uzunluk/2, arac.yon + 2.5), arac.y + lengthdir_y(uzunluk/2, arac.yon + 2.5))
+    p3 = (arac.x + lengthdir_x(uzunluk/2, arac.yon - 2.5), arac.y + lengthdir_y(uzunluk/2, arac.yon - 2.5))
+    bolge = pygame.draw.polygon(ekran, RENK_ARAC, [p1, p2, p3], 2)
+    bolge.union_ip(pygame.draw.circle(ekran, RENK_ARAC, (int(arac.x), int(arac.y)), 4))
+    if len(arac.gecmis) > 2:
+        bolge.union_ip(pygame.draw.lines(ekran, (0, 100, 100), False, arac.gecmis, 1))
+    return bolge
+
+def engel_ciz(ekran, engel):
+    renk = RENK_ENGEL if engel.tip == "DINAMIK" else (150, 50, 50)
+    r = engel.rect
+    bolge = pygame.draw.rect(ekran, renk, (r.x, r.y, r.w, r.h), 2)
+    return bolge.union(pygame.draw.line(ekran, renk, (r.left, r.top), (r.right, r.bottom), 1))
+
+def lidar_ciz(ekran, arac, lidar_cizim):
+    bolge = pygame.Rect(int(arac.x), int(arac.y), 1, 1)
+    for p in lidar_cizim:
+        bolge.union_ip(pygame.draw.line(ekran, (0, 40, 0), (arac.x, arac.y), p, 1))
+        if math.sqrt((p[0]-arac.x)**2 + (p[1]-arac.y)**2) < LIDAR_MESAFE - 5:
+            bolge.union_ip(pygame.draw.circle(ekran, RENK_LIDAR, (int(p[0]), int(p[1])), 2))
+    return bolge
+
+def duraklatma_katmani():
+    katman = pygame.Surface((SIM_GENISLIK, EKRAN_Y), pygame.SRCALPHA)
+    katman.fill((0, 0, 0, 128))
+    txt = font_baslik.render("SİMÜLASYON DURDURULDU (Devam için 'P')", True, (255, 255, 255))
+    katman.blit(txt, txt.get_rect(center=(SIM_GENISLIK/2, EKRAN_Y/2)))
+    return katman
 
 # PANEL ÇİZİM
-def paneli_ciz(ekran, topsis_scores, yz_probs, final_scores, aksiyon, kayit_durumu, yz_surucu):
-    panel_rect = pygame.Rect(SIM_GENISLIK, 0, PANEL_GENISLIK, EKRAN_Y)
-    pygame.draw.rect(ekran, RENK_PANEL_BG, panel_rect)
-    pygame.draw.line(ekran, (100, 100, 100), (SIM_GENISLIK, 0), (SIM_GENISLIK, EKRAN_Y), 3)
+# Panel iki katmandır: sabit başlık/etiketler bir kez panel_zemini_olustur ile çizilir,
+# paneli_ciz yalnızca değişen değerleri ekler. Gösterilen içerik değişmediyse panel hiç çizilmez.
+COL1_X = SIM_GENISLIK + 20; COL2_X = COL1_X + 110; COL3_X = COL1_X + 180; COL4_X = COL1_X + 260
+
+def panel_zemini_olustur():
+    zemin = pygame.Surface((EKRAN_G, EKRAN_Y)).convert()   # ekran koordinatlarıyla çizilir, panel kısmı alınır
+    pygame.draw.rect(zemin, RENK_PANEL_BG, PANEL_ALANI)
+    pygame.draw.line(zemin, (100, 100, 100), (SIM_GENISLIK, 0), (SIM_GENISLIK, EKRAN_Y), 3)
+
+    x_off = COL1_X; y_off = 20
+    zemin.blit(font_baslik.render("OTONOM KONTROL", True, RENK_ARAC), (x_off, y_off)); y_off += 40
+    y_off += 25 + 15   # mod satırı, kayıt durumu
+    zemin.blit(font_mini.render("'R': Reset | 'K': Kaydı Başlat/Durdur", True, RENK_YAZI), (x_off, y_off)); y_off += 15
+    y_off += 15 + 25   # YZ durumu
+    zemin.blit(font_veri.render("[KARAR FÜZYONU DETAYI]", True, (255, 200, 0)), (x_off, y_off)); y_off += 25
+
+    zemin.blit(font_mini.render("EYLEM", True, (150,150,150)), (COL1_X, y_off))
+    zemin.blit(font_mini.render("TOPSIS", True, (255,200,0)), (COL2_X, y_off))
+    zemin.blit(font_mini.render("YZ(KNN)", True, (0,255,255)), (COL3_X, y_off))
+    zemin.blit(font_mini.render("SONUÇ", True, (0,255,100)), (COL4_X, y_off)); y_off += 20
+    for i in range(4):
+        pygame.draw.rect(zemin, (50,50,50), (COL4_X, y_off+2, 120, 10)); y_off += 20
 
-    x_off = SIM_GENISLIK + 20; y_off = 20
-    ekran.blit(font_baslik.render("OTONOM KONTROL", True, RENK_ARAC), (x_off, y_off)); y_off += 40
-    
+    y_off += 20
+    zemin.blit(font_veri.render("SON KARAR:", True, (255, 255, 255)), (x_off, y_off))
+    return zemin.subsurface(PANEL_ALANI).copy()
+
+def panel_imzasi(topsis_scores, yz_probs, final_scores, aksiyon, kayit_durumu, yz_surucu, profil_ozeti, karar_ozeti=None,
+                 durum_satiri=None, kayit_ozeti=None, egitim_ozeti=None):
+    # Ekranda görünen her şey: yüzdeler tam sayıya, çubuklar piksele yuvarlanmış halde
+    yuzdeler = np.rint(np.concatenate((topsis_scores, yz_probs, final_scores)) * 100).astype(int)
+    return (tuple(yuzdeler), tuple((np.asarray(final_scores) * 120).astype(int)), int(np.argmax(final_scores)),
+            aksiyon, kayit_durumu, yz_surucu.egitildi, id(profil_ozeti), BUTON_RECT.collidepoint(pygame.mouse.get_pos()),
+            id(karar_ozeti), durum_satiri,
+            kayit_ozeti and (kayit_ozeti["yazilan"] + kayit_ozeti["rezervuarda"], kayit_ozeti["atlanan"]),
+            egitim_ozeti and tuple(egitim_ozeti.values()))
+
+def paneli_ciz(ekran, panel_zemini, topsis_scores, yz_probs, final_scores, aksiyon, kayit_durumu, yz_surucu, profil_ozeti=None,
+               karar_ozeti=None, durum_satiri=None, kayit_ozeti=None, egitim_ozeti=None):
+    ekran.blit(panel_zemini, PANEL_ALANI)
+
+    x_off = COL1_X; y_off = 60
     if yz_surucu.egitildi:
         mod_txt = "MOD: HİBRİT (LİDAR + HIZ + İVME)"
         mod_renk = (0, 255, 100)
@@ -220,192 +167,227 @@ def paneli_ciz(ekran, topsis_scores, yz_probs, final_scores, aksiyon, kayit_duru
         mod_renk = (255, 200, 0)
     
     kayit_mesaj = "Veri Kaydı AÇIK ('K')" if kayit_durumu else "Veri Kaydı KAPALI ('K')"
-    ekran.blit(font_veri.render(mod_txt, True, mod_renk), (x_off, y_off)); y_off += 25
-    
-    bilgiler = [f"[{kayit_mesaj}]", "'R': Reset | 'K': Kaydı Başlat/Durdur"]
-    for b in bilgiler:
-        ekran.blit(font_mini.render(b, True, RENK_YAZI), (x_off, y_off)); y_off += 15
-    y_off += 15
+    if kayit_ozeti:   # yenilik örneklemesi: saklanan / atlanan satırlar
+        kayit_mesaj += f" {kayit_ozeti['yazilan'] + kayit_ozeti['rezervuarda']} yeni, {kayit_ozeti['atlanan']} atlandı"
+    yazi_veri.ciz(ekran, mod_txt, mod_renk, (x_off, y_off)); y_off += 25
+    yazi_mini.ciz(ekran, f"[{kayit_mesaj}]", RENK_YAZI, (x_off, y_off)); y_off += 45   # tuş satırı zeminde
     
     yz_durum = "YZ HAZIR" if yz_surucu.egitildi else "YZ EĞİTİLMEDİ"
     yz_renk = (0,255,0) if yz_surucu.egitildi else (200,50,50)
-    ekran.blit(font_mini.render(yz_durum, True, yz_renk), (x_off, y_off)); y_off += 25
-
-    ekran.blit(font_veri.render("[KARAR FÜZYONU DETAYI]", True, (255, 200, 0)), (x_off, y_off)); y_off += 25
+    yazi_mini.ciz(ekran, yz_durum, yz_renk, (x_off, y_off))
+    if egitim_ozeti:   # arka plan eğitimi: model sürümü, eğitim satırı, son takas süresi
+        model_txt = (f"MODEL v{egitim_ozeti['surum']} {egitim_ozeti['satir']} satır "
+                     f"takas {egitim_ozeti['takas_ms']:.3f}ms {egitim_ozeti['durum']}")
+        yazi_mini.ciz(ekran, model_txt, (150,150,150), (x_off + 110, y_off))
+    y_off += 70   # füzyon başlığı ve sütunlar zeminde
     
     etiketler = AKSIYON_LISTESI
     best_idx = np.argmax(final_scores)
-    col1_x = x_off; col2_x = x_off + 110; col3_x = x_off + 180; col4_x = x_off + 260
-    
-    ekran.blit(font_mini.render("EYLEM", True, (150,150,150)), (col1_x, y_off))
-    ekran.blit(font_mini.render("TOPSIS", True, (255,200,0)), (col2_x, y_off))
-    ekran.blit(font_mini.render("YZ(KNN)", True, (0,255,255)), (col3_x, y_off))
-    ekran.blit(font_mini.render("SONUÇ", True, (0,255,100)), (col4_x, y_off)); y_off += 20
-    
     for i in range(4):
         renk = (0, 255, 0) if i == best_idx else (180, 180, 180)
-        ekran.blit(font_mini.render(etiketler[i], True, renk), (col1_x, y_off))
+        yazi_mini.ciz(ekran, etiketler[i], renk, (COL1_X, y_off))
         
         t_val = f"%{topsis_scores[i]*100:.0f}"
         y_val = f"%{yz_probs[i]*100:.0f}"
         f_val = f"%{final_scores[i]*100:.0f}"
         
-        ekran.blit(font_mini.render(t_val, True, (255,200,0)), (col2_x + 5, y_off))
-        ekran.blit(font_mini.render(y_val, True, (0,255,255)), (col3_x + 5, y_off))
+        yazi_mini.ciz(ekran, t_val, (255,200,0), (COL2_X + 5, y_off))
+        yazi_mini.ciz(ekran, y_val, (0,255,255), (COL3_X + 5, y_off))
         
-        bar_x = col4_x
-        bar_bg = pygame.Rect(bar_x, y_off+2, 120, 10)
-        pygame.draw.rect(ekran, (50,50,50), bar_bg)
         w = int(final_scores[i] * 120)
-        bar_fg = pygame.Rect(bar_x, y_off+2, w, 10)
-        pygame.draw.rect(ekran, renk, bar_fg)
-        ekran.blit(font_mini.render(f_val, True, (255,255,255)), (bar_x + 125, y_off))
+        pygame.draw.rect(ekran, renk, (COL4_X, y_off+2, w, 10))
+        yazi_mini.ciz(ekran, f_val, (255,255,255), (COL4_X + 125, y_off))
         y_off += 20
 
-    y_off += 20
-    ekran.blit(font_veri.render("SON KARAR:", True, (255, 255, 255)), (x_off, y_off)); y_off += 25
+    if durum_satiri:   # kare no ve tohum: pencerede görülen kararı tekrar_oynat.py'de bulmak için
+        yazi_mini.ciz(ekran, durum_satiri, (150,150,150), (x_off + 130, y_off + 23))
+    y_off += 45   # "SON KARAR:" zeminde
     karar_kutusu = pygame.Rect(x_off, y_off, 200, 40)
     renk_karar = (0, 100, 0)
     if aksiyon == "FREN": renk_karar = (200, 0, 0)
     elif "KAÇIN" in aksiyon: renk_karar = (200, 150, 0)
     pygame.draw.rect(ekran, renk_karar, karar_kutusu, 0, 5)
-    ekran.blit(font_baslik.render(aksiyon, True, (255,255,255)), (x_off + 20, y_off + 10))
-
-    mouse_pos = pygame.mouse.get_pos()
-    buton_renk = (255, 140, 0) if BUTON_RECT.collidepoint(mouse_pos) else (200, 100, 0)
+    yazi_baslik.ciz(ekran, aksiyon, (255,255,255), (x_off + 20, y_off + 10))
+
+    # Asenkron karar ölçümleri (karar kutusunun sağında)
+    if karar_ozeti:
+        satirlar = (f"GECİKME p50/p95: {karar_ozeti['gecikme_p50']:.1f}/{karar_ozeti['gecikme_p95']:.1f} ms",
+                    f"KARAR YAŞI: {karar_ozeti['yas']} kare (sınır {KARAR_BAYATLIK_SINIRI})",
+                    f"ATLANAN: {karar_ozeti['atlanan']}  BEKLEME: {karar_ozeti['bekleme']}")
+        for j, satir in enumerate(satirlar):
+            yazi_mini.ciz(ekran, satir, (150,150,150), (x_off + 210, y_off + j * 13))
+    y_off += 50
+
+    # Kare profili (ms): kayan p50 / p95 / p99
+    if profil_ozeti:
+        yazi_mini.ciz(ekran, "AŞAMA (ms)", (150,150,150), (COL1_X, y_off))
+        for j, baslik in enumerate(("p50", "p95", "p99")):
+            yazi_mini.ciz(ekran, baslik, (150,150,150), (COL2_X + j * 70, y_off))
+        y_off += 15
+        for ad, degerler in profil_ozeti.items():
+            renk = (255, 255, 255) if ad == "KARE" else (180, 180, 180)
+            yazi_mini.ciz(ekran, ad, renk, (COL1_X, y_off))
+            for j, deger in enumerate(degerler):
+                yazi_mini.ciz(ekran, f"{deger:6.2f}", renk, (COL2_X + j * 70, y_off))
+            y_off += 14
+
+    buton_renk = (255, 140, 0) if BUTON_RECT.collidepoint(pygame.mouse.get_pos()) else (200, 100, 0)
     pygame.draw.rect(ekran, buton_renk, BUTON_RECT, border_radius=10)
-    text_yuzey = font_buton.render("SİMÜLASYONU YENİLE", True, (255, 255, 255))
-    text_rect = text_yuzey.get_rect(center=BUTON_RECT.center)
-    ekran.blit(text_yuzey, text_rect)
-
-# GLOBAL
-arac = None; engeller = None; sensorler = None
-mcdm = MCDMKararVerici()
-yz_surucu = YapayZekaSurucusu() 
-
-simulasyonu_sifirla()
-kayit_aktif = False 
-
-#   ANA DÖNGÜ
-calisiyor = True
-aksiyon = "BEKLENİYOR"
-duraklatildi = False
-frame_sayac = 0
-topsis_gosterim = np.zeros(4); yz_gosterim = np.zeros(4); final_gosterim = np.zeros(4)
-lidar_cizim = []
-
-while calisiyor:
-    dt = saat.tick(FPS) / 1000.0
-    frame_sayac +=1
-    
-    for olay in pygame.event.get(): 
-        if olay.type == pygame.QUIT: calisiyor = False
-        if olay.type == pygame.MOUSEBUTTONDOWN:
-            if BUTON_RECT.collidepoint(olay.pos): simulasyonu_sifirla()
-
-        if olay.type == pygame.KEYDOWN:
-            if olay.key == pygame.K_r: simulasyonu_sifirla()
-            elif olay.key == pygame.K_k: 
-                kayit_aktif = not kayit_aktif
-                print(f"Veri Kaydı: {kayit_aktif}")
-            elif olay.key == pygame.K_p:
-                duraklatildi = not duraklatildi
-            
-    if not duraklatildi:
-        for e in engeller: e.adim(dt);
-        if any(e.rect.right < 0 for e in engeller): simulasyonu_sifirla() 
-
-        lidar_data = []; lidar_cizim = []
-        for aci in LIDAR_ACILAR:
-            gercek_aci = arac.yon + aci
-            dx, dy = math.cos(gercek_aci), math.sin(gercek_aci)
-            cx, cy = arac.x, arac.y
-            min_k = 1.0
-            for e in engeller:
-                k = line_rect_collision(cx, cy, cx + dx*LIDAR_MESAFE, cy + dy*LIDAR_MESAFE, e.rect)
-                if k and k < min_k: min_k = k
-            mesafe = min_k * LIDAR_MESAFE
-            lidar_data.append(mesafe)
-            lidar_cizim.append((cx + dx*mesafe, cy + dy*mesafe))
-        
-        sens_veri = sensorler.veri_oku()
-        
-        # 1. TOPSIS
-        dilim = len(lidar_data) // 3
-        sol = np.min(lidar_data[:dilim]); orta = np.min(lidar_data[dilim:2*dilim]); sag = np.min(lidar_data[2*dilim:])
-        m1 = [sol, arac.hiz*0.8, 4] ; m2 = [sag, arac.hiz*0.8, 4]
-        # Fren yapmayı en güvenli liman (Güvenlik=250) olarak ayarladık
-        m3 = [LIDAR_MESAFE, 0, 1] 
-        m4 = [orta, MAKS_HIZ, 0]
-        if orta < 60: m4[0] = 0; m4[2] = 100 # Engel çok yakınsa frene basacak
-        
-        topsis_scores = mcdm.topsis_hesapla([m1, m2, m3, m4])
-        topsis_gosterim = topsis_scores
-
-        # 2. YAPAY ZEKA (KNN)
-        yz_probs = yz_surucu.olasiliklari_getir(lidar_data, arac.hiz, arac.ivme)
-        yz_gosterim = yz_probs
-
-        # 3. FÜZYON
-        if yz_surucu.egitildi:
-            final_scores = (topsis_scores * 0.6) + (yz_probs * 0.4)
-        else:
-            final_scores = topsis_scores
-            
-        # KAYIT
-        if kayit_aktif and frame_sayac % 10 == 0:
-            idx = np.argmax(final_scores)
-            veri_kaydet(lidar_data, arac.hiz, arac.ivme, AKSIYON_LISTESI[idx])
-
-        final_gosterim = final_scores
-        best_idx = np.argmax(final_scores)
-        aksiyon = AKSIYON_LISTESI[best_idx]
-
-        # AKSİYON UYGULAMA
-        if aksiyon == "SOLA_KAÇIN": 
-            arac.yon -= 1.5 * dt; arac.ivme = -10
-        elif aksiyon == "SAĞA_KAÇIN": 
-            arac.yon += 1.5 * dt; arac.ivme = -10
-        elif aksiyon == "FREN": 
-            arac.ivme = -150
-        elif aksiyon == "SÜRDÜR":
-            # Adaptif Hız Kontrolü (Önümde engel varsa gazı kes)
-            if orta > 200:
-                arac.ivme = 50   # Yol temiz, tam gaz
-            elif orta > 120:
-                arac.ivme = 0    # bu kısımda engel var. gazı kes
-            else:
-                arac.ivme = -30  # Yaklaştım, hafif fren yap
-                
-            # Aracı şeritte tut
-            arac.yon += (0 - arac.yon) * 0.05
-        
-        arac.adim(dt)
-
-    # Çizim
-    ekran.fill(RENK_ZEMIN)
-    for x in range(0, SIM_GENISLIK, 50): pygame.draw.line(ekran, RENK_GRID, (x, 0), (x, EKRAN_Y))
-    for y in range(0, EKRAN_Y, 50): pygame.draw.line(ekran, RENK_GRID, (0, y), (SIM_GENISLIK, y))
+    text_yuzey = font_buton_yazi.yaz("SİMÜLASYONU YENİLE", (255, 255, 255))
+    ekran.blit(text_yuzey, text_yuzey.get_rect(center=BUTON_RECT.center))
+    return PANEL_ALANI
+
+def kayit_ozeti_yazdir(ozet):
+    print(f"BİLGİ: Kayıt: {ozet['yazilan']} satır yazıldı, {ozet['rezervuarda']} rezervuarda; "
+          f"{ozet['atlanan']} satır atlandı ({ozet['tekrar']} benzeri mevcut, {ozet['kota_disi']} kota dışı)"
+          + (f", {ozet['cikarilan']} rezervuar örneği değiştirildi" if ozet["cikarilan"] else ""))
+
+def ana():
+    rapor = BaslangicRaporu(_ICE_AKTARMA_BASLANGICI)
+    rapor.ekle("içe aktarma", time.perf_counter() - _ICE_AKTARMA_BASLANGICI)
+
+    with rapor.faz("pygame.init"):
+        pygame.init()
+    with rapor.faz("pencere"):
+        ekran = pygame.display.set_mode((EKRAN_G, EKRAN_Y))
+        pygame.display.set_caption("Otonom Araç: Adaptif Hız Kontrollü Karar Destek Sistemi")
+        saat = pygame.time.Clock()
+    with rapor.faz("fontlar"):
+        fontlari_yukle()
+
+    profil = KareProfilleyici(etkin=PROFIL_AKTIF)
+    with rapor.faz("model"):
+        yz_surucu = YapayZekaSurucusu(MODEL_DOSYASI)
+    with rapor.faz("simülasyon"):
+        sim = Simulasyon(yz_surucu=yz_surucu, profil=profil, asenkron=ASENKRON_KARAR,
+                         bayatlik_siniri=KARAR_BAYATLIK_SINIRI, tohum=BOLUM_TOHUMU, artimsal=ARTIMSAL_LIDAR)
+    with rapor.faz("kayıt"):
+        kayit_dosyasi = CSV_DOSYA_ADI if KAYIT_BICIMI == "csv" else IKILI_DOSYA_ADI
+        kaydedici = VeriKaydedici(kayit_dosyasi, bicim=KAYIT_BICIMI)
+        if YENILIK_ORNEKLEME:
+            kaydedici = YenilikOrnekleyici(kaydedici, *YENILIK_ADIMLARI, kota=EYLEM_KOTASI, rezervuar=KOTA_REZERVUAR)
+            try:
+                print(f"BİLGİ: Yenilik örneklemesi açık; '{kayit_dosyasi}' dosyasındaki {kaydedici.mevcudu_yukle(kayit_dosyasi)} satır biliniyor.")
+            except ValueError as e:
+                print(f"UYARI: Mevcut veri okunamadı, yalnızca bu oturumun satırları karşılaştırılacak ({e})")
+        arka_egitici = None
+        if ARKA_PLAN_EGITIMI:
+            arka_egitici = ArkaPlanEgitici(yz_surucu, kayit_dosyasi, MODEL_DOSYASI, esik=YENIDEN_EGITIM_ESIGI)
+        bolum_kaydedici = None
+        if BOLUM_KAYDI_DOSYASI:
+            bolum_kaydedici = BolumKaydedici(BOLUM_KAYDI_DOSYASI, sim)
+            sim.gozlemciler.append(bolum_kaydedici)
+            print(f"BİLGİ: Bölüm tohumu {sim.tohum}, kayıt: '{BOLUM_KAYDI_DOSYASI}'")
+    kayit_aktif = False 
+
+    # Önceden çizilen katmanlar
+    with rapor.faz("katmanlar"):
+        sim_kirli = KirliBolgeler(izgara_yuzeyi(SIM_GENISLIK, EKRAN_Y, 50, RENK_ZEMIN, RENK_GRID))
+        panel_zemini = panel_zemini_olustur()
+        duraklatma_yuzeyi = duraklatma_katmani()
+    rapor.yazdir()
+
+    #   ANA DÖNGÜ
+    calisiyor = True
+    aksiyon = "BEKLENİYOR"
+    duraklatildi = False
+    tam_yenile = True          # ilk kare, sıfırlama, duraklatma ve pencere olaylarında tüm ekran çizilir
+    panel_son_imza = None
+    frame_sayac = 0
+    topsis_gosterim = np.zeros(4); yz_gosterim = np.zeros(4); final_gosterim = np.zeros(4)
+    lidar_cizim = []
+    profil_ozeti = {}
+    karar_ozeti = None
+
+    while calisiyor:
+        dt = saat.tick(FPS) / 1000.0
+        frame_sayac +=1
+        profil.kare_baslat()
     
-    if lidar_cizim:
-        for p in lidar_cizim:
-            pygame.draw.line(ekran, (0, 40, 0), (arac.x, arac.y), p, 1)
-            if math.sqrt((p[0]-arac.x)**2 + (p[1]-arac.y)**2) < LIDAR_MESAFE - 5:
-                pygame.draw.circle(ekran, RENK_LIDAR, (int(p[0]), int(p[1])), 2)
+        with profil.asama("olay"):
+            for olay in pygame.event.get(): 
+                if olay.type == pygame.QUIT: calisiyor = False
+                if olay.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED): tam_yenile = True
+                if olay.type == pygame.MOUSEBUTTONDOWN:
+                    if BUTON_RECT.collidepoint(olay.pos): kaydedici.bosalt(); sim.sifirla(); tam_yenile = True
+
+                if olay.type == pygame.KEYDOWN:
+                    if olay.key == pygame.K_r: kaydedici.bosalt(); sim.sifirla(); tam_yenile = True
+                    elif olay.key == pygame.K_k: 
+                        kayit_aktif = not kayit_aktif
+                        if not kayit_aktif: kaydedici.bosalt()
+                        print(f"Veri Kaydı: {kayit_aktif}")
+                        if not kayit_aktif and YENILIK_ORNEKLEME: kayit_ozeti_yazdir(kaydedici.ozet())
+                    elif olay.key == pygame.K_p:
+                        duraklatildi = not duraklatildi
+                        tam_yenile = True
             
-    arac.ciz(ekran)
-    for e in engeller: e.ciz(ekran)
-    paneli_ciz(ekran, topsis_gosterim, yz_gosterim, final_gosterim, aksiyon, kayit_aktif, yz_surucu)
-    
-    if duraklatildi:
-        overlay = pygame.Surface((SIM_GENISLIK, EKRAN_Y), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 128)) 
-        ekran.blit(overlay, (0, 0))
-        txt = font_baslik.render("SİMÜLASYON DURDURULDU (Devam için 'P')", True, (255, 255, 255))
-        txt_rect = txt.get_rect(center=(SIM_GENISLIK/2, EKRAN_Y/2))
-        ekran.blit(txt, txt_rect)
-
-    pygame.display.flip()
-
-pygame.quit()
-sys.exit()
\ No newline at end of file
+        if not duraklatildi:
+            # Fizik, LIDAR, TOPSIS, KNN füzyonu ve aksiyon simulasyon.py'de
+            sonuc = sim.adim(dt)
+            lidar_cizim = sonuc["lidar_cizim"]
+            topsis_gosterim = sonuc["topsis"]; yz_gosterim = sonuc["yz"]; final_gosterim = sonuc["final"]
+            aksiyon = sonuc["aksiyon"]
+
+            # KAYIT
+            with profil.asama("kayit"):
+                if kayit_aktif and frame_sayac % KAYIT_ARALIGI == 0:
+                    kaydedici.kaydet(sonuc["lidar"], sonuc["hiz"], sonuc["ivme"], aksiyon)
+                if arka_egitici is not None and arka_egitici.guncelle(kaydedici):
+                    egitim = arka_egitici.son_sonuc
+                    print(f"BİLGİ: Yeni model devrede (v{arka_egitici.surum}, {egitim['satir']} satır, K={egitim['k']}, "
+                          f"%{egitim['dogruluk']*100:.1f}); eğitim {egitim['sure']:.1f} sn, motor "
+                          f"{egitim['motor_sure']*1000:.0f} ms, takas {arka_egitici.takas_ms:.3f} ms")
+                    if bolum_kaydedici is not None and arka_egitici.surum == 1:
+                        print(f"UYARI: Model bölüm sırasında değişti; '{BOLUM_KAYDI_DOSYASI}' bu kareden sonrası için "
+                              f"tekrar_oynat.py ile birebir yeniden üretilemez.")
+
+        # Çizim: simülasyon alanında yalnızca önceki ve bu karenin bölgeleri yenilenir
+        guncellenecek = []
+        with profil.asama("cizim"):
+            if tam_yenile or not duraklatildi:
+                arac = sim.arac
+                if tam_yenile: sim_kirli.zemini_ciz(ekran)
+                else: sim_kirli.sil(ekran)
+                ekran.set_clip(SIM_ALANI)
+                if lidar_cizim: sim_kirli.ekle(lidar_ciz(ekran, arac, lidar_cizim))
+                sim_kirli.ekle(arac_ciz(ekran, arac))
+                for e in sim.engeller: sim_kirli.ekle(engel_ciz(ekran, e))
+                if duraklatildi: ekran.blit(duraklatma_yuzeyi, (0, 0))
+                ekran.set_clip(None)
+                guncellenecek += sim_kirli.guncellenecekler()
+
+        with profil.asama("panel"):
+            # Yüzdelikler her karede değil, yarım saniyede bir güncellenir
+            if profil.etkin and frame_sayac % 30 == 0:
+                profil_ozeti = profil.yuzdelikler()
+            if sim.karar_iscisi is not None and frame_sayac % 30 == 0:
+                karar_ozeti = sim.karar_iscisi.ozet()
+            durum_satiri = f"KARE {sim.adim_sayac - 1}  TOHUM {sim.tohum}"
+            kayit_ozeti = kaydedici.ozet() if YENILIK_ORNEKLEME else None
+            egitim_ozeti = arka_egitici.ozet() if arka_egitici is not None else None
+            imza = panel_imzasi(topsis_gosterim, yz_gosterim, final_gosterim, aksiyon, kayit_aktif, yz_surucu,
+                                profil_ozeti, karar_ozeti, durum_satiri, kayit_ozeti, egitim_ozeti)
+            if tam_yenile or imza != panel_son_imza:
+                guncellenecek.append(paneli_ciz(ekran, panel_zemini, topsis_gosterim, yz_gosterim, final_gosterim,
+                                                aksiyon, kayit_aktif, yz_surucu, profil_ozeti, karar_ozeti, durum_satiri,
+                                                kayit_ozeti, egitim_ozeti))
+                panel_son_imza = imza
+
+        with profil.asama("flip"):
+            if tam_yenile: pygame.display.flip()
+            elif guncellenecek: pygame.display.update(guncellenecek)
+            tam_yenile = False
+        profil.kare_bitir()
+
+    if profil.etkin: profil.disa_aktar(PROFIL_DOSYA_ADI)
+    if arka_egitici is not None: arka_egitici.kapat()
+    kaydedici.kapat()
+    if YENILIK_ORNEKLEME: kayit_ozeti_yazdir(kaydedici.ozet())
+    if bolum_kaydedici is not None: bolum_kaydedici.kapat()
+    sim.kapat()
+    pygame.quit()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(ana())
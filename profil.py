@@ -0,0 +1,123 @@
+import csv
+import time
+from contextlib import contextmanager
+import numpy as np
+
+# ---------- KARE PROFİLLEYİCİ ----------
+# Her kare için boru hattı aşamalarının (LIDAR, TOPSIS, KNN, çizim, flip ...) süresini ölçer.
+# Süreler sabit boyutlu bir halka tamponda (kare x aşama) tutulur; panel için kayan p50/p95/p99
+# hesaplanır ve çıkışta iz dosyasına yazılır. Kapalıyken asama() paylaşılan boş bir bağlam döndürür.
+
+MAKS_ASAMA = 16
+
+class _BosOlcucu:
+    def __enter__(self): return self
+    def __exit__(self, *hata): return False
+
+_BOS_OLCUCU = _BosOlcucu()
+
+class _AsamaOlcucu:
+    __slots__ = ("satir", "sutun", "baslangic")
+    def __init__(self, satir, sutun):
+        self.satir = satir; self.sutun = sutun; self.baslangic = 0.0
+    def __enter__(self):
+        self.baslangic = time.perf_counter()
+        return self
+    def __exit__(self, *hata):
+        self.satir[self.sutun] += time.perf_counter() - self.baslangic
+        return False
+
+class KareProfilleyici:
+    def __init__(self, kapasite=1024, etkin=True):
+        self.etkin = etkin
+        self.kapasite = kapasite
+        self.asamalar = []                                   # sütun sırası ilk kullanıma göre
+        self.zamanlar = np.zeros((kapasite, MAKS_ASAMA + 1))  # son sütun: toplam kare süresi (sn)
+        self.indeks = 0
+        self.dolu = 0
+        self.toplam_kare = 0
+        self._satir = np.zeros(MAKS_ASAMA + 1)
+        self._olcucler = {}
+        self._kare_baslangic = None
+
+    def asama(self, ad):
+        if not self.etkin:
+            return _BOS_OLCUCU
+        olcucu = self._olcucler.get(ad)
+        if olcucu is None:
+            if len(self.asamalar) >= MAKS_ASAMA:
+                return _BOS_OLCUCU
+            self.asamalar.append(ad)
+            olcucu = self._olcucler[ad] = _AsamaOlcucu(self._satir, len(self.asamalar) - 1)
+        return olcucu
+
+    def kare_baslat(self):
+        if self.etkin:
+            self._satir[:] = 0
+            self._kare_baslangic = time.perf_counter()
+
+    def kare_bitir(self):
+        if not self.etkin or self._kare_baslangic is None:
+            return
+        self._satir[-1] = time.perf_counter() - self._kare_baslangic
+        self.zamanlar[self.indeks] = self._satir
+        self.indeks = (self.indeks + 1) % self.kapasite
+        self.dolu = min(self.dolu + 1, self.kapasite)
+        self.toplam_kare += 1
+
+    def _sirali(self):
+        # Halka tampondaki kareler eskiden yeniye
+        if self.dolu < self.kapasite:
+            return self.zamanlar[:self.dolu]
+        return np.roll(self.zamanlar, -self.indeks, axis=0)
+
+    def yuzdelikler(self, yuzdeler=(50, 95, 99)):
+        # {aşama: (p50, p95, p99) ms}; "KARE" toplam kare süresi
+        if self.dolu == 0:
+            return {}
+        veri = self.zamanlar[:self.dolu]
+        sutunlar = list(range(len(self.asamalar))) + [MAKS_ASAMA]
+        degerler = np.percentile(veri[:, sutunlar], yuzdeler, axis=0) * 1000.0
+        return {ad: tuple(degerler[:, i]) for i, ad in enumerate(self.asamalar + ["KARE"])}
+
+    def disa_aktar(self, yol):
+        # İzleri kare başına bir satır (ms) olarak CSV'ye yazar
+        if self.dolu == 0:
+            return
+        veri = self._sirali()
+        sutunlar = list(range(len(self.asamalar))) + [MAKS_ASAMA]
+        ilk_kare = self.toplam_kare - self.dolu
+        with open(yol, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["kare"] + [f"{ad}_ms" for ad in self.asamalar] + ["kare_ms"])
+            for i, satir in enumerate(veri[:, sutunlar] * 1000.0):
+                writer.writerow([ilk_kare + i] + [f"{v:.4f}" for v in satir])
+        print(f"BİLGİ: {self.dolu} karelik profil izi '{yol}' dosyasına yazıldı.")
+
+# Simulasyon'un varsayılanı: ölçüm yapmaz
+BOS_PROFILLEYICI = KareProfilleyici(kapasite=1, etkin=False)
+
+# ---------- BAŞLANGIÇ RAPORU ----------
+# Uygulama açılışındaki fazların (içe aktarma, pencere, fontlar, model ...) süreleri
+class BaslangicRaporu:
+    def __init__(self, baslangic=None):
+        self.baslangic = baslangic if baslangic is not None else time.perf_counter()
+        self.fazlar = []
+
+    def ekle(self, ad, sure):
+        self.fazlar.append((ad, sure))
+
+    @contextmanager
+    def faz(self, ad):
+        baslangic = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.ekle(ad, time.perf_counter() - baslangic)
+
+    def yazdir(self):
+        toplam = time.perf_counter() - self.baslangic
+        print("[BAŞLANGIÇ] Faz süreleri:")
+        for ad, sure in self.fazlar:
+            print(f"  {ad:<20}{sure * 1000:8.1f} ms")
+        print(f"  {'TOPLAM':<20}{toplam * 1000:8.1f} ms")
@@ -0,0 +1,467 @@
+import sys
+import math
+import time
+import argparse
+import numpy as np
+from collections import deque
+import random
+import os
+from lidar import engel_dizisi, lidar_tara, lidar_tara_izgara, UzamsalIzgara, ArtimsalLidar
+from profil import BOS_PROFILLEYICI
+from asenkron_karar import AsenkronKararVerici
+
+# ---------- AYARLAR ----------
+SIM_GENISLIK = 1000
+EKRAN_Y = 650
+FPS = 60
+
+# Dosya Adları
+CSV_DOSYA_ADI = "otonom_veri_seti.csv"
+IKILI_DOSYA_ADI = "otonom_veri_seti.f32"
+MODEL_DOSYA_ADI = "knn_model.pkl"
+KOMPAKT_MODEL_DOSYA_ADI = "knn_prototip.bin"   # egitici.py --kompakt çıktısı (float32 prototipler, memmap)
+
+# Fiziksel Parametreler
+MAKS_HIZ = 100.0
+LIDAR_MESAFE = 250
+LIDAR_ACILAR = np.linspace(-60, 60, 40) * math.pi/180
+ENGEL_SAYISI = 12
+# Bu engel sayısından itibaren LIDAR ızgara geniş fazını kullanır (az engelde tam vektörel tarama daha hızlı)
+IZGARA_ESIGI = 64
+
+# Aksiyon kısımları
+AKSIYON_LISTESI = ["SOLA_KAÇIN", "SAĞA_KAÇIN", "FREN", "SÜRDÜR"]
+AKSIYON_DICT = {aks: i for i, aks in enumerate(AKSIYON_LISTESI)}
+# Hibrit modda füzyon: final = TOPSIS * (1 - YZ_AGIRLIGI) + KNN * YZ_AGIRLIGI
+YZ_AGIRLIGI = 0.4
+# ----------------------------
+
+# Bu modül pygame'e bağlı değildir: fizik, LIDAR, TOPSIS, KNN füzyonu ve aksiyon mantığı
+# burada çalışır. Pencere/çizim main.py'de isteğe bağlı bir katmandır.
+
+# --- VERİ SETİ ŞEMASI ---
+CSV_BASLIKLARI = [f"Lidar_{i}" for i in range(len(LIDAR_ACILAR))] + ["HIZ", "IVME", "AKSIYON"]
+
+def kayit_satiri(lidar_verisi, arac_hizi, arac_ivmesi, aksiyon):
+    return [round(x, 1) for x in lidar_verisi] + [round(arac_hizi, 1), round(arac_ivmesi, 1), aksiyon]
+
+# --- YAPAY ZEKA SÜRÜCÜSÜ ---
+class YapayZekaSurucusu:
+    def __init__(self, model_dosyasi=MODEL_DOSYA_ADI):
+        self.model_dosyasi = model_dosyasi
+        self.modeli_ayarla(self._modeli_yukle())
+
+    def modeli_ayarla(self, model, motor=None):
+        # Bellekteki bir modeli (çıkarım motoruyla birlikte) devreye alır. Motor başka bir iş
+        # parçacığında önceden kurulduysa verilir; takas yalnızca atamalardan ibaret kalır
+        if motor is None:
+            motor = self._motoru_kur(model)
+        self.model, self.motor = model, motor
+        self.egitildi = model is not None
+
+    def _modeli_yukle(self):
+        if self.model_dosyasi is None:   # model sonradan modeli_ayarla ile verilecek
+            return None
+        # Kompakt prototip modeli (KOMPAKT_MODEL_DOSYA_ADI) yalnızca model_dosyasi ile açıkça istenirse yüklenir
+        try:
+            if self.model_dosyasi and os.path.exists(self.model_dosyasi):
+                baslangic = time.perf_counter()
+                from knn_cikarim import prototip_mi, prototip_yukle
+                if prototip_mi(self.model_dosyasi):
+                    model = prototip_yukle(self.model_dosyasi)
+                    ek = f" ({len(model.etiketler)} prototip, K={model.n_neighbors})"
+                else:
+                    import joblib   # sklearn'i de içe aktarır; yalnızca pkl model gerçekten yüklenirken
+                    model = joblib.load(self.model_dosyasi)
+                    ek = ""
+                print(f"BİLGİ: '{self.model_dosyasi}' yüklendi{ek}, {(time.perf_counter() - baslangic)*1000:.1f} ms. HİBRİT MOD devrede.")
+                return model
+            else:
+                print(f"UYARI: '{self.model_dosyasi}' yok. Sadece Matematik Modu çalışıyor.")
+                return None
+        except Exception as e:
+            print(f"HATA: Model yüklenemedi: {e}")
+            return None
+
+    def _motoru_kur(self, model):
+        # Destekleniyorsa düşük gecikmeli çıkarım motoru (knn_cikarim.py); yoksa predict_proba yolu
+        if model is None:
+            return None
+        try:
+            from knn_cikarim import KNNCikarimMotoru
+            if KNNCikarimMotoru.destekleniyor(model):
+                return KNNCikarimMotoru(model)
+        except Exception as e:
+            print(f"UYARI: Hızlı çıkarım motoru kurulamadı, predict_proba kullanılacak: {e}")
+        return None
+
+    def olasiliklari_getir(self, lidar_verisi, hiz, ivme):
+        if not self.egitildi:
+            return np.array([0.25, 0.25, 0.25, 0.25])
+
+        motor = self.motor   # takas sırasında tutarlı olsun diye bir kez okunur
+        if motor is not None:
+            return motor.olasiliklar(lidar_verisi, hiz, ivme)
+
+        giris_verisi = lidar_verisi + [hiz, ivme]
+
+        try:
+            model = self.model
+            ham_olasilik = model.predict_proba([giris_verisi])[0]
+            sirali_olasiliklar = np.zeros(4)
+            modelin_siniflari = model.classes_
+
+            for i, sinif_adi in enumerate(modelin_siniflari):
+                if sinif_adi in AKSIYON_DICT:
+                    target_idx = AKSIYON_DICT[sinif_adi]
+                    sirali_olasiliklar[target_idx] = ham_olasilik[i]
+            return sirali_olasiliklar
+        except Exception as e:
+            return np.array([0.25, 0.25, 0.25, 0.25])
+
+    def olasiliklari_getir_toplu(self, girdiler):
+        # (N, lidar + hız + ivme) girdiler için (N, 4) olasılık, AKSIYON_LISTESI sırasında
+        sirali_olasiliklar = np.full((len(girdiler), 4), 0.25)
+        if not self.egitildi:
+            return sirali_olasiliklar
+        motor = self.motor
+        if motor is not None:
+            return motor.olasiliklar_toplu(girdiler)
+        model = self.model
+        try:
+            ham_olasilik = model.predict_proba(girdiler)
+        except Exception as e:
+            return sirali_olasiliklar
+        sirali_olasiliklar[:] = 0
+        for i, sinif_adi in enumerate(model.classes_):
+            if sinif_adi in AKSIYON_DICT:
+                sirali_olasiliklar[:, AKSIYON_DICT[sinif_adi]] = ham_olasilik[:, i]
+        return sirali_olasiliklar
+
+#  KARAR VERİCİ
+class MCDMKararVerici:
+    def __init__(self, weights=(0.60, 0.20, 0.20), impacts=(1, 1, -1)):
+        self.weights = np.array(weights, dtype=float)
+        self.impacts = np.array(impacts)
+        self._tamponlar = None
+
+    def _tamponlari_hazirla(self, sekil):
+        # Tek matris yolu için ara diziler bir kez ayrılır
+        rows, cols = sekil
+        self._tamponlar = {"matris": np.empty(sekil), "agirlikli": np.empty(sekil), "fark": np.empty(sekil),
+                           "payda": np.empty(cols), "ideal": np.empty(cols), "negatif_ideal": np.empty(cols),
+                           "dist_pos": np.empty(rows), "dist_neg": np.empty(rows)}
+
+    def topsis_hesapla(self, karar_matrisi):
+        # Tek karar matrisi; her çağrıda yalnızca dönen skor dizisi ayrılır
+        t = self._tamponlar
+        if t is None or t["matris"].shape != np.shape(karar_matrisi):
+            self._tamponlari_hazirla(np.shape(karar_matrisi)); t = self._tamponlar
+        matris = t["matris"]; matris[...] = karar_matrisi
+        agirlikli = t["agirlikli"]; fark = t["fark"]
+        payda = t["payda"]; ideal = t["ideal"]; negatif_ideal = t["negatif_ideal"]
+        dist_pos = t["dist_pos"]; dist_neg = t["dist_neg"]
+
+        np.square(matris, out=agirlikli)
+        np.sqrt(agirlikli.sum(axis=0, out=payda), out=payda)
+        payda[payda == 0] = 1
+        np.divide(matris, payda, out=agirlikli)
+        agirlikli *= self.weights
+        agirlikli.max(axis=0, out=ideal); agirlikli.min(axis=0, out=negatif_ideal)
+        # Maliyet kriterlerinde (impact -1) ideal ile negatif ideal yer değiştirir
+        maliyet = self.impacts != 1
+        ideal[maliyet], negatif_ideal[maliyet] = negatif_ideal[maliyet], ideal[maliyet]
+
+        np.subtract(agirlikli, ideal, out=fark); np.square(fark, out=fark)
+        np.sqrt(fark.sum(axis=1, out=dist_pos), out=dist_pos)
+        np.subtract(agirlikli, negatif_ideal, out=fark); np.square(fark, out=fark)
+        np.sqrt(fark.sum(axis=1, out=dist_neg), out=dist_neg)
+        toplam_dist = dist_pos; toplam_dist += dist_neg
+        toplam_dist[toplam_dist == 0] = 1
+        return dist_neg / toplam_dist
+
+    def topsis_hesapla_toplu(self, matrisler, weights=None, impacts=None):
+        """(..., alternatif, kriter) karar matrisi yığınını tek vektörel çağrıda puanlar.
+
+        weights/impacts verilmezse nesnenin değerleri kullanılır; (..., kriter) biçiminde
+        verilerek her matris için ayrı ağırlık da tanımlanabilir. Sonuç (..., alternatif).
+        """
+        matrisler = np.asarray(matrisler, dtype=float)
+        weights = self.weights if weights is None else np.asarray(weights, dtype=float)
+        impacts = self.impacts if impacts is None else np.asarray(impacts)
+        payda = np.sqrt(np.sum(matrisler**2, axis=-2, keepdims=True))
+        payda[payda == 0] = 1
+        agirlikli = matrisler / payda * np.expand_dims(weights, -2)
+        en_buyuk = agirlikli.max(axis=-2, keepdims=True)
+        en_kucuk = agirlikli.min(axis=-2, keepdims=True)
+        fayda = np.expand_dims(impacts == 1, -2)
+        ideal = np.where(fayda, en_buyuk, en_kucuk)
+        negatif_ideal = np.where(fayda, en_kucuk, en_buyuk)
+        dist_pos = np.sqrt(np.sum((agirlikli - ideal)**2, axis=-1))
+        dist_neg = np.sqrt(np.sum((agirlikli - negatif_ideal)**2, axis=-1))
+        toplam_dist = dist_pos + dist_neg
+        toplam_dist[toplam_dist == 0] = 1
+        return dist_neg / toplam_dist
+
+def karar_matrisi_olustur(lidar_data, hiz):
+    # LIDAR'ı sol/orta/sağ dilimlere ayırıp 4 alternatifin karar matrisini kurar
+    dilim = len(lidar_data) // 3
+    sol = np.min(lidar_data[:dilim]); orta = np.min(lidar_data[dilim:2*dilim]); sag = np.min(lidar_data[2*dilim:])
+    m1 = [sol, hiz*0.8, 4] ; m2 = [sag, hiz*0.8, 4]
+    # Fren yapmayı en güvenli liman (Güvenlik=250) olarak ayarladık
+    m3 = [LIDAR_MESAFE, 0, 1]
+    m4 = [orta, MAKS_HIZ, 0]
+    if orta < 60: m4[0] = 0; m4[2] = 100 # Engel çok yakınsa frene basacak
+    return [m1, m2, m3, m4], orta
+
+def karar_matrisleri_toplu(lidar, hiz):
+    # karar_matrisi_olustur'un (N, R) LIDAR ve (N,) hız için (N, 4, 3) karşılığı
+    n = len(lidar)
+    dilim = lidar.shape[1] // 3
+    sol = lidar[:, :dilim].min(axis=1); orta = lidar[:, dilim:2*dilim].min(axis=1); sag = lidar[:, 2*dilim:].min(axis=1)
+    matrisler = np.empty((n, 4, 3))
+    matrisler[:, 0] = np.stack((sol, hiz * 0.8, np.full(n, 4.0)), axis=-1)
+    matrisler[:, 1] = np.stack((sag, hiz * 0.8, np.full(n, 4.0)), axis=-1)
+    matrisler[:, 2] = (LIDAR_MESAFE, 0, 1)
+    yakin = orta < 60
+    matrisler[:, 3, 0] = np.where(yakin, 0, orta)
+    matrisler[:, 3, 1] = MAKS_HIZ
+    matrisler[:, 3, 2] = np.where(yakin, 100, 0)
+    return matrisler, orta
+
+# ARAC, ENGEL, SENSOR SINIFLARI
+class SensorPaketi:
+    def __init__(self, arac, rng=random):
+        self.arac = arac
+        self.rng = rng
+        self.gps_noise = 2.0
+    def veri_oku(self):
+        gps_x = self.arac.x + self.rng.uniform(-self.gps_noise, self.gps_noise)
+        gps_y = self.arac.y + self.rng.uniform(-self.gps_noise, self.gps_noise)
+        ivme_x = self.arac.ivme * math.cos(self.arac.yon) / 10.0
+        return {"gps": (gps_x, gps_y), "imu_ivme": ivme_x}
+
+class Arac:
+    def __init__(self, x, y):
+        self.x = x; self.y = y; self.yon = 0.0; self.hiz = 30.0; self.ivme = 0.0
+        self.gecmis = deque(maxlen=100)
+    def adim(self, dt):
+        self.hiz += self.ivme * dt
+        self.hiz = max(0.0, min(MAKS_HIZ, self.hiz))
+        self.x += math.cos(self.yon) * self.hiz * dt
+        self.y += math.sin(self.yon) * self.hiz * dt
+        self.gecmis.append((self.x, self.y))
+
+class Kutu:
+    # pygame.Rect yerine kayan noktalı dikdörtgen (ekran olmadan çalışabilmek için)
+    __slots__ = ("x", "y", "w", "h")
+    def __init__(self, x, y, w, h):
+        self.x = float(x); self.y = float(y); self.w = float(w); self.h = float(h)
+    @property
+    def left(self): return self.x
+    @property
+    def top(self): return self.y
+    @property
+    def right(self): return self.x + self.w
+    @property
+    def bottom(self): return self.y + self.h
+
+class Engel:
+    def __init__(self, x, y, w, h, hiz_x=0):
+        self.rect = Kutu(x, y, w, h)
+        self.hiz_x = hiz_x; self.tip = "DINAMIK" if hiz_x != 0 else "STATIK"
+        self.izgara = None   # kayıtlıysa hareket ettikçe UzamsalIzgara güncellenir
+    def adim(self, dt):
+        self.rect.x += self.hiz_x * dt
+        if self.izgara is not None: self.izgara.guncelle(self)
+
+def lengthdir_x(len, dir): return len * math.cos(dir)
+def lengthdir_y(len, dir): return len * math.sin(dir)
+def line_rect_collision(x1, y1, x2, y2, rect):
+    min_t = 1.0; hit = False
+    lines = [((rect.left, rect.top), (rect.right, rect.top)),
+             ((rect.right, rect.top), (rect.right, rect.bottom)),
+             ((rect.right, rect.bottom), (rect.left, rect.bottom)),
+             ((rect.left, rect.bottom), (rect.left, rect.top))]
+    for p3, p4 in lines:
+        x3,y3 = p3; x4,y4 = p4
+        denom = (y4-y3)*(x2-x1) - (x4-x3)*(y2-y1)
+        if denom == 0: continue
+        ua = ((x4-x3)*(y1-y3) - (y4-y3)*(x1-x3)) / denom
+        ub = ((x2-x1)*(y1-y3) - (y2-y1)*(x1-x3)) / denom
+        if 0 <= ua <= 1 and 0 <= ub <= 1:
+            if ua < min_t: min_t = ua; hit = True
+    return min_t if hit else None
+
+def engelleri_rastgele_olustur(sayi, rng=random):
+    liste = []
+    for _ in range(sayi):
+        x = rng.randint(300, SIM_GENISLIK + 200)
+        y = rng.randint(50, EKRAN_Y - 100)
+        w = rng.randint(30, 60); h = rng.randint(30, 60)
+        hiz = rng.uniform(-80, -20) if rng.random() > 0.4 else 0
+        liste.append(Engel(x, y, w, h, hiz_x=hiz))
+    return liste
+
+# --- SİMÜLASYON MOTORU ---
+class Simulasyon:
+    def __init__(self, yz_surucu=None, mcdm=None, engel_sayisi=ENGEL_SAYISI, tohum=None, izgara=None, profil=None,
+                 asenkron=False, bayatlik_siniri=2, yz_agirligi=YZ_AGIRLIGI, artimsal=False):
+        # Engeller ve GPS gürültüsü kendi random.Random örneğinden çekilir; tohum verilmezse rastgele
+        # seçilir ve self.tohum'da saklanır (bölüm kaydından yeniden üretilebilsin diye)
+        self.tohum = tohum if tohum is not None else random.randrange(2**32)
+        self.rng = random.Random(self.tohum)
+        self.yz_agirligi = yz_agirligi
+        self.mcdm = mcdm if mcdm is not None else MCDMKararVerici()
+        self.yz_surucu = yz_surucu if yz_surucu is not None else YapayZekaSurucusu()
+        self.engel_sayisi = engel_sayisi
+        # izgara=None: engel sayısına göre otomatik seçim
+        self.izgara_kullan = engel_sayisi >= IZGARA_ESIGI if izgara is None else izgara
+        self.izgara = UzamsalIzgara() if self.izgara_kullan else None
+        # artimsal=True: LIDAR kareler arası isabet durumunu saklayarak taranır (bkz. lidar.ArtimsalLidar);
+        # sonuç tam taramayla aynıdır, ızgaranın yerine geçer
+        self.artimsal_lidar = ArtimsalLidar(LIDAR_ACILAR, LIDAR_MESAFE) if artimsal else None
+        # Aşama süreleri (profil.KareProfilleyici); varsayılan ölçüm yapmaz
+        self.profil = profil if profil is not None else BOS_PROFILLEYICI
+        # Her adımdan sonra gozlemci(sim, sonuc) çağrılır (çizim, kayıt vb.)
+        self.gozlemciler = []
+        self.adim_sayac = 0
+        self.sifirlama_sayaci = 0   # otomatik + elle sıfırlamalar
+        # asenkron=True: karar (TOPSIS + KNN + füzyon) arka plan iş parçacığında verilir, adım en son
+        # kararı kullanır (en fazla bayatlik_siniri kare eski); bkz. asenkron_karar.py
+        self.karar_iscisi = None
+        if asenkron:
+            self.karar_iscisi = AsenkronKararVerici(
+                lambda *girdiler: self.karar_ver(*girdiler, profil=BOS_PROFILLEYICI), bayatlik_siniri)
+        self.sifirla()
+
+    def sifirla(self):
+        self.sifirlama_sayaci += 1
+        self.arac = Arac(100, EKRAN_Y/2)
+        self.engeller = engelleri_rastgele_olustur(self.engel_sayisi, self.rng)
+        self.sensorler = SensorPaketi(self.arac, self.rng)
+        if self.artimsal_lidar is not None:
+            self.artimsal_lidar.gecersiz_kil()
+        if self.izgara is not None:
+            self.izgara.temizle()
+            for e in self.engeller:
+                e.izgara = self.izgara
+                self.izgara.ekle(e)
+
+    def algila(self):
+        if self.artimsal_lidar is not None:
+            kutular = [(e.rect.left, e.rect.top, e.rect.right, e.rect.bottom) for e in self.engeller]
+            mesafeler, noktalar = self.artimsal_lidar.tara(self.arac.x, self.arac.y, self.arac.yon, kutular)
+            return mesafeler.tolist(), [tuple(p) for p in noktalar.tolist()]
+        if self.izgara is not None:
+            mesafeler, noktalar = lidar_tara_izgara(self.arac.x, self.arac.y, self.arac.yon,
+                                                    self.izgara, LIDAR_ACILAR, LIDAR_MESAFE)
+            return mesafeler.tolist(), [tuple(p) for p in noktalar.tolist()]
+        mesafeler, noktalar = lidar_tara(self.arac.x, self.arac.y, self.arac.yon,
+                                         engel_dizisi(self.engeller), LIDAR_ACILAR, LIDAR_MESAFE)
+        return mesafeler.tolist(), [tuple(p) for p in noktalar.tolist()]
+
+    def karar_ver(self, lidar_data, hiz, ivme, profil=None):
+        profil = profil if profil is not None else self.profil
+        # 1. TOPSIS
+        with profil.asama("topsis"):
+            karar_matrisi, orta = karar_matrisi_olustur(lidar_data, hiz)
+            topsis_scores = self.mcdm.topsis_hesapla(karar_matrisi)
+
+        # 2. YAPAY ZEKA (KNN)
+        with profil.asama("knn"):
+            yz_probs = self.yz_surucu.olasiliklari_getir(lidar_data, hiz, ivme)
+
+        # 3. FÜZYON
+        if self.yz_surucu.egitildi:
+            final_scores = (topsis_scores * (1 - self.yz_agirligi)) + (yz_probs * self.yz_agirligi)
+        else:
+            final_scores = topsis_scores
+        return topsis_scores, yz_probs, final_scores, orta
+
+    def aksiyonu_uygula(self, aksiyon, orta, dt):
+        arac = self.arac
+        if aksiyon == "SOLA_KAÇIN":
+            arac.yon -= 1.5 * dt; arac.ivme = -10
+        elif aksiyon == "SAĞA_KAÇIN":
+            arac.yon += 1.5 * dt; arac.ivme = -10
+        elif aksiyon == "FREN":
+            arac.ivme = -150
+        elif aksiyon == "SÜRDÜR":
+            # Adaptif Hız Kontrolü (Önümde engel varsa gazı kes)
+            if orta > 200:
+                arac.ivme = 50   # Yol temiz, tam gaz
+            elif orta > 120:
+                arac.ivme = 0    # bu kısımda engel var. gazı kes
+            else:
+                arac.ivme = -30  # Yaklaştım, hafif fren yap
+
+            # Aracı şeritte tut
+            arac.yon += (0 - arac.yon) * 0.05
+
+    def adim(self, dt):
+        with self.profil.asama("fizik"):
+            for e in self.engeller: e.adim(dt)
+            sifirlandi = any(e.rect.right < 0 for e in self.engeller)
+            if sifirlandi: self.sifirla()
+
+        with self.profil.asama("lidar"):
+            lidar_data, lidar_cizim = self.algila()
+        sens_veri = self.sensorler.veri_oku()
+
+        # Kayıt için karar anındaki hız/ivme saklanır (aksiyon ivmeyi değiştirir)
+        hiz, ivme = self.arac.hiz, self.arac.ivme
+        arac_durumu = (self.arac.x, self.arac.y, self.arac.yon, hiz, ivme)
+        if self.karar_iscisi is not None:
+            with self.profil.asama("karar_bekle"):
+                self.karar_iscisi.gonder(self.adim_sayac, lidar_data, hiz, ivme)
+                topsis_scores, yz_probs, final_scores, orta = self.karar_iscisi.karar_al(self.adim_sayac)
+        else:
+            topsis_scores, yz_probs, final_scores, orta = self.karar_ver(lidar_data, hiz, ivme)
+        aksiyon = AKSIYON_LISTESI[int(np.argmax(final_scores))]
+
+        with self.profil.asama("aksiyon"):
+            self.aksiyonu_uygula(aksiyon, orta, dt)
+            self.arac.adim(dt)
+        self.adim_sayac += 1
+
+        sonuc = {"lidar": lidar_data, "lidar_cizim": lidar_cizim, "sensor": sens_veri,
+                 "hiz": hiz, "ivme": ivme, "topsis": topsis_scores, "yz": yz_probs,
+                 "final": final_scores, "aksiyon": aksiyon, "sifirlandi": sifirlandi,
+                 "arac": arac_durumu, "dt": dt}
+        for gozlemci in self.gozlemciler:
+            gozlemci(self, sonuc)
+        return sonuc
+
+    def kapat(self):
+        if self.karar_iscisi is not None:
+            self.karar_iscisi.kapat()
+
+    def calistir(self, adim_sayisi, dt=1.0 / FPS):
+        # Ekransız, saat kısıtı olmadan sabit dt ile koşturur
+        sonuc = None
+        for _ in range(adim_sayisi):
+            sonuc = self.adim(dt)
+        return sonuc
+
+def ana():
+    parser = argparse.ArgumentParser(description="Ekransız (headless) otonom araç simülasyonu")
+    parser.add_argument("--adim", type=int, default=10000, help="Simüle edilecek adım sayısı")
+    parser.add_argument("--dt", type=float, default=1.0 / FPS, help="Sabit zaman adımı (sn)")
+    parser.add_argument("--engel", type=int, default=ENGEL_SAYISI, help="Engel sayısı")
+    parser.add_argument("--asenkron", action="store_true", help="Kararı arka plan iş parçacığında ver")
+    parser.add_argument("--bayatlik", type=int, default=2, help="Asenkron modda kararın en fazla kaç kare eski olabileceği")
+    parser.add_argument("--artimsal", action="store_true", help="LIDAR'ı kareler arası artımsal tara")
+    args = parser.parse_args()
+
+    sim = Simulasyon(engel_sayisi=args.engel, asenkron=args.asenkron, bayatlik_siniri=args.bayatlik,
+                     artimsal=args.artimsal)
+    baslangic = time.perf_counter()
+    sim.calistir(args.adim, args.dt)
+    sure = time.perf_counter() - baslangic
+    sim.kapat()
+    print(f"[SONUÇ] {args.adim} adım {sure:.2f} sn'de tamamlandı ({args.adim / sure:.0f} adım/sn, "
+          f"gerçek zamanın {args.adim * args.dt / sure:.1f} katı)")
+
+if __name__ == "__main__":
+    sys.exit(ana())
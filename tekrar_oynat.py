@@ -0,0 +1,152 @@
+import sys
+import time
+import argparse
+import warnings
+import numpy as np
+from simulasyon import (Simulasyon, YapayZekaSurucusu, MCDMKararVerici, AKSIYON_LISTESI, karar_matrisleri_toplu)
+from bolum_kaydi import bolum_oku, OTOMATIK_SIFIRLAMA
+
+# ---------- BÖLÜM TEKRAR OYNATICI ----------
+# Bölüm kaydını (bolum_kaydi.py) ekransız ve saat kısıtı olmadan işler:
+#   karar   : kaydedilen girdilerle (lidar, hız, ivme) kararlar toplu olarak yeniden verilir; yeni bir
+#             model veya ağırlık setinin hangi karelerde kararı değiştirdiği raporlanır
+#   yeniden : bölüm tohum ve kaydedilen dt'lerle baştan simüle edilir; ilk ayrışma karesi bulunur
+#   --goster / --adimla: kareleri tek tek inceleme
+# Model/ağırlık verilmezse kayıt başlığındaki ayarlar kullanılır (aynı ayarlarla fark çıkmamalıdır).
+
+
+def karar_vericileri_kur(baslik, model=None, agirliklar=None, yz_agirligi=None):
+    model = model if model is not None else baslik["model"]
+    yz_surucu = YapayZekaSurucusu(model_dosyasi=model)
+    mcdm = MCDMKararVerici(weights=agirliklar if agirliklar is not None else baslik["agirliklar"],
+                           impacts=baslik["etkiler"])
+    return yz_surucu, mcdm, (yz_agirligi if yz_agirligi is not None else baslik["yz_agirligi"])
+
+def kararlari_yeniden_ver(kareler, yz_surucu, mcdm, yz_agirligi):
+    # Tüm kareler için (topsis, yz, final, aksiyon indeksleri); tek seferde toplu hesaplanır
+    lidar = np.asarray(kareler["lidar"]); hiz = np.asarray(kareler["hiz"]); ivme = np.asarray(kareler["ivme"])
+    matrisler, _ = karar_matrisleri_toplu(lidar, hiz)
+    topsis = mcdm.topsis_hesapla_toplu(matrisler)
+    if yz_surucu.egitildi:
+        yz = yz_surucu.olasiliklari_getir_toplu(np.column_stack((lidar, hiz, ivme)))
+        final = topsis * (1 - yz_agirligi) + yz * yz_agirligi
+    else:
+        yz = np.full_like(topsis, 0.25)
+        final = topsis
+    return topsis, yz, final, np.argmax(final, axis=1)
+
+def kare_yazdir(kare, yeni=None):
+    x, y, yon = kare["arac"]
+    print(f"--- KARE {kare['kare']}  dt={kare['dt']*1000:.1f} ms"
+          f"{'  [SIFIRLANDI]' if kare['bayraklar'] & OTOMATIK_SIFIRLAMA else ''}")
+    print(f"  araç: x={x:.1f} y={y:.1f} yon={yon:+.3f} hız={kare['hiz']:.1f} ivme={kare['ivme']:.1f}")
+    lidar = np.asarray(kare["lidar"]); dilim = len(lidar) // 3
+    print(f"  lidar min sol/orta/sağ: {lidar[:dilim].min():.1f} / {lidar[dilim:2*dilim].min():.1f} / {lidar[2*dilim:].min():.1f}")
+    print(f"  {'EYLEM':<12}{'TOPSIS':>8}{'YZ':>8}{'SONUÇ':>8}" + (f"{'YENİ':>8}" if yeni is not None else ""))
+    for i, ad in enumerate(AKSIYON_LISTESI):
+        isaret = "*" if i == kare["aksiyon"] else " "
+        satir = f" {isaret}{ad:<12}{kare['topsis'][i]:>8.3f}{kare['yz'][i]:>8.3f}{kare['final'][i]:>8.3f}"
+        if yeni is not None:
+            satir += f"{yeni[i]:>8.3f}" + (" <" if i == np.argmax(yeni) else "")
+        print(satir)
+
+def karar_raporu(baslik, kareler, yz_surucu, mcdm, yz_agirligi, en_fazla):
+    baslangic = time.perf_counter()
+    _, _, final, yeni_aksiyon = kararlari_yeniden_ver(kareler, yz_surucu, mcdm, yz_agirligi)
+    sure = time.perf_counter() - baslangic
+    eski_aksiyon = np.asarray(kareler["aksiyon"]).astype(np.intp)
+    farkli = np.flatnonzero(eski_aksiyon != yeni_aksiyon)
+    print(f"[SONUÇ] {len(kareler)} kare {sure*1000:.1f} ms'de yeniden değerlendirildi "
+          f"({len(kareler) / max(sure, 1e-9):.0f} kare/sn)")
+    print(f"[SONUÇ] Kararı değişen kare: {len(farkli)} (%{100 * len(farkli) / max(len(kareler), 1):.2f})")
+    if baslik.get("asenkron"):
+        print("UYARI: Kayıt asenkron kararla alınmış; kayıtlı kararlar daha eski karelere ait olabilir.")
+    if len(farkli) == 0:
+        return 0
+
+    n = len(AKSIYON_LISTESI)
+    gecis = np.bincount(eski_aksiyon[farkli] * n + yeni_aksiyon[farkli], minlength=n * n).reshape(n, n)
+    print("\nKayıtlı (satır) -> yeni (sütun) karar geçişleri:")
+    print(" " * 14 + "".join(f"{ad:>12}" for ad in AKSIYON_LISTESI))
+    for i, ad in enumerate(AKSIYON_LISTESI):
+        print(f"{ad:<14}" + "".join(f"{gecis[i, j]:>12}" for j in range(n)))
+
+    print(f"\nİlk {min(en_fazla, len(farkli))} farklı kare:")
+    for i in farkli[:en_fazla]:
+        kare_yazdir(kareler[i], final[i])
+    return len(farkli)
+
+def yeniden_simule_et(baslik, kareler, yz_surucu, mcdm, yz_agirligi):
+    # Bölümü tohum + kayıtlı dt'lerle baştan koşturur; ilk farklı kararda durur
+    sim = Simulasyon(yz_surucu=yz_surucu, mcdm=mcdm, engel_sayisi=baslik["engel_sayisi"], tohum=baslik["tohum"],
+                     izgara=baslik["izgara"], yz_agirligi=yz_agirligi)
+    dt = np.asarray(kareler["dt"]); aksiyonlar = np.asarray(kareler["aksiyon"])
+    sifirlama = np.asarray(kareler["sifirlama"]).astype(np.int64)
+    otomatik = (np.asarray(kareler["bayraklar"]) & OTOMATIK_SIFIRLAMA) != 0
+    baslangic = time.perf_counter()
+    for k in range(len(kareler)):
+        # Kayıtta karelerin arasında yapılmış elle sıfırlamalar ('R' / buton) aynen uygulanır
+        while sim.sifirlama_sayaci < sifirlama[k] - otomatik[k]:
+            sim.sifirla()
+        sonuc = sim.adim(float(dt[k]))
+        lidar_farki = np.abs(np.asarray(sonuc["lidar"]) - kareler["lidar"][k]).max()
+        if AKSIYON_LISTESI[aksiyonlar[k]] != sonuc["aksiyon"] or lidar_farki > 1e-6:
+            sure = time.perf_counter() - baslangic
+            print(f"[SONUÇ] Kare {kareler['kare'][k]}'de ayrıştı ({k} kare aynı, {k / max(sure, 1e-9):.0f} kare/sn); "
+                  f"kayıt: {AKSIYON_LISTESI[aksiyonlar[k]]}, yeni: {sonuc['aksiyon']}, lidar farkı: {lidar_farki:.3g}")
+            kare_yazdir(kareler[k], sonuc["final"])
+            sim.kapat()
+            return k
+    sure = time.perf_counter() - baslangic
+    print(f"[SONUÇ] {len(kareler)} kare birebir yeniden üretildi ({len(kareler) / max(sure, 1e-9):.0f} kare/sn).")
+    sim.kapat()
+    return None
+
+def adimla(kareler, final):
+    # Etkileşimli inceleme: Enter sonraki kare, sayı o kareye atla, q çıkış
+    i = 0
+    while 0 <= i < len(kareler):
+        kare_yazdir(kareler[i], None if final is None else final[i])
+        komut = input("[Enter: sonraki | <kare no>: atla | q: çık] ").strip()
+        if komut == "q":
+            break
+        i = int(komut) - int(kareler["kare"][0]) if komut.isdigit() else i + 1
+
+def ana():
+    parser = argparse.ArgumentParser(description="Bölüm kaydını ekransız tekrar oynatır ve kararları karşılaştırır")
+    parser.add_argument("kayit", help="Bölüm kaydı (.bkd)")
+    parser.add_argument("--mod", choices=("karar", "yeniden"), default="karar",
+                        help="karar: kayıtlı girdilerle karar karşılaştırma, yeniden: baştan simülasyon")
+    parser.add_argument("--model", default=None, help="Karşılaştırılacak model (varsayılan: kayıttaki)")
+    parser.add_argument("--agirliklar", type=float, nargs=3, default=None, help="TOPSIS ağırlıkları")
+    parser.add_argument("--yz-agirligi", type=float, default=None, help="Füzyonda KNN ağırlığı")
+    parser.add_argument("--en-fazla", type=int, default=10, help="Ayrıntısı yazılacak farklı kare sayısı")
+    parser.add_argument("--goster", default=None, help="Ayrıntılı yazılacak kare aralığı (örn. 120:130)")
+    parser.add_argument("--adimla", action="store_true", help="Kareleri tek tek etkileşimli incele")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    baslik, kareler = bolum_oku(args.kayit)
+    print(f"BİLGİ: {len(kareler)} kare, tohum {baslik['tohum']}, {baslik['engel_sayisi']} engel, "
+          f"model: {baslik['model']}, ağırlıklar: {baslik['agirliklar']}, YZ ağırlığı: {baslik['yz_agirligi']}")
+    yz_surucu, mcdm, yz_agirligi = karar_vericileri_kur(baslik, args.model, args.agirliklar, args.yz_agirligi)
+
+    if args.goster or args.adimla:
+        final = kararlari_yeniden_ver(kareler, yz_surucu, mcdm, yz_agirligi)[2]
+        ilk = int(kareler["kare"][0]) if len(kareler) else 0
+        if args.adimla:
+            adimla(kareler, final)
+        else:
+            bas, _, son = args.goster.partition(":")
+            bas = int(bas) - ilk; son = int(son) - ilk + 1 if son else bas + 1
+            for i in range(max(bas, 0), min(son, len(kareler))):
+                kare_yazdir(kareler[i], final[i])
+        return 0
+
+    if args.mod == "yeniden":
+        return 0 if yeniden_simule_et(baslik, kareler, yz_surucu, mcdm, yz_agirligi) is None else 1
+    karar_raporu(baslik, kareler, yz_surucu, mcdm, yz_agirligi, args.en_fazla)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(ana())
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+from sklearn.neighbors import KNeighborsClassifier
+from knn_cikarim import KNNCikarimMotoru
+from simulasyon import AKSIYON_LISTESI
+
+# KNNCikarimMotoru olasılıkları predict_proba ile aynı olmalı. Eşit uzaklıktaki komşular arasında seçim
+# farklı olabileceğinden karışık etiketli eşitliklerde geçerli bir seçim olduğu doğrulanır.
+
+BOS_YOL = [250.0] * 40 + [50.0, 0.0]   # tüm ışınlar menzilde: veri setinde birebir tekrar eden satır
+
+
+def rastgele_veri(rng, n):
+    X = np.empty((n, 42))
+    X[:, :40] = np.minimum(rng.uniform(20, 400, (n, 40)), 250.0)
+    X[:, 40] = rng.uniform(0, 100, n); X[:, 41] = rng.uniform(-20, 20, n)
+    return X, np.array(AKSIYON_LISTESI, dtype=object)[rng.integers(0, len(AKSIYON_LISTESI), n)]
+
+
+def sirali_olasilik(model, X):
+    # predict_proba (model.classes_ sırası) -> AKSIYON_LISTESI sırası
+    ham = model.predict_proba(X)
+    sonuc = np.zeros((len(X), len(AKSIYON_LISTESI)))
+    for i, sinif in enumerate(model.classes_):
+        sonuc[:, AKSIYON_LISTESI.index(sinif)] = ham[:, i]
+    return sonuc
+
+
+def motor_olasiliklari(motor, X):
+    tekil = np.array([motor.olasiliklar(list(x[:40]), x[40], x[41]) for x in X])
+    toplu = motor.olasiliklar_toplu(X)
+    np.testing.assert_array_equal(tekil, toplu)
+    return toplu
+
+
+@pytest.mark.parametrize("yontem", ["duz", "agac"])
+@pytest.mark.parametrize("k", [1, 5, 14])
+def test_predict_proba_ile_ayni(yontem, k):
+    rng = np.random.default_rng(k)
+    X, y = rastgele_veri(rng, 2000)
+    model = KNeighborsClassifier(n_neighbors=k).fit(X, y)
+    motor = KNNCikarimMotoru(model, yontem=yontem)
+    sorgular = np.vstack((rastgele_veri(rng, 300)[0], X[:50]))
+    np.testing.assert_array_equal(motor_olasiliklari(motor, sorgular), sirali_olasilik(model, sorgular))
+
+
+@pytest.mark.parametrize("yontem", ["duz", "agac"])
+def test_bos_yol_esitlikleri_tek_etiket(yontem):
+    # Tekrar eden satırların etiketi aynıysa hangi kopyanın seçildiği sonucu değiştirmez
+    rng = np.random.default_rng(0)
+    X, y = rastgele_veri(rng, 1000)
+    X = np.vstack((X, [BOS_YOL] * 30)); y = np.concatenate((y, ["SÜRDÜR"] * 30))
+    model = KNeighborsClassifier(n_neighbors=7).fit(X, y)
+    motor = KNNCikarimMotoru(model, yontem=yontem)
+    sorgular = np.array([BOS_YOL, BOS_YOL[:40] + [51.0, 0.0]])
+    np.testing.assert_array_equal(motor_olasiliklari(motor, sorgular), sirali_olasilik(model, sorgular))
+
+
+@pytest.mark.parametrize("yontem", ["duz", "agac"])
+@pytest.mark.parametrize("k", [3, 7, 14])
+def test_bos_yol_esitlikleri_karisik_etiket(yontem, k):
+    # Eşit uzaklıktaki kopyalar farklı etiketliyse: K-inci komşudan kesin yakın olanların hepsi sayılmalı,
+    # kalanlar K-inci uzaklıktakilerden seçilmeli (sınıf başına alt/üst sınır)
+    rng = np.random.default_rng(k)
+    X, y = rastgele_veri(rng, 1000)
+    X = np.vstack((X, [BOS_YOL] * 40)); y = np.concatenate((y, np.array(AKSIYON_LISTESI, dtype=object)[np.arange(40) % 4]))
+    model = KNeighborsClassifier(n_neighbors=k).fit(X, y)
+    motor = KNNCikarimMotoru(model, yontem=yontem)
+    sorgular = np.array([BOS_YOL, BOS_YOL[:40] + [49.5, 0.0], BOS_YOL[:40] + [50.0, 3.0]])
+    sayilar = np.rint(motor_olasiliklari(motor, sorgular) * k)
+    etiket_kodu = np.array([AKSIYON_LISTESI.index(s) for s in y])
+    for sorgu, sayi in zip(sorgular, sayilar):
+        uzaklik = np.linalg.norm(X - sorgu, axis=1)
+        esik = np.sort(uzaklik)[k - 1]
+        alt = np.bincount(etiket_kodu[uzaklik < esik], minlength=len(AKSIYON_LISTESI))
+        ust = np.bincount(etiket_kodu[uzaklik <= esik], minlength=len(AKSIYON_LISTESI))
+        assert sayi.sum() == k
+        assert np.all(alt <= sayi) and np.all(sayi <= ust), (sayi, alt, ust)
@@ -0,0 +1,88 @@
+import math
+import numpy as np
+import pytest
+from lidar import engel_dizisi, lidar_tara, lidar_tara_izgara, UzamsalIzgara, ArtimsalLidar
+from simulasyon import Engel, LIDAR_ACILAR, LIDAR_MESAFE, SIM_GENISLIK, EKRAN_Y, line_rect_collision
+
+# lidar_tara, özgün ışın başına line_rect_collision döngüsüyle kayan nokta toleransında; hızlı yollar ise
+# lidar_tara ile birebir aynı sonucu vermeli (tohumlu rastgele dünyalar)
+
+
+def rastgele_engeller(rng, sayi):
+    return [Engel(rng.uniform(-50, SIM_GENISLIK), rng.uniform(0, EKRAN_Y), rng.uniform(10, 80), rng.uniform(10, 80),
+                  hiz_x=rng.choice([0.0, rng.uniform(-80, -20)])) for _ in range(sayi)]
+
+
+def dongu_tara(x, y, yon, engeller):
+    # Vektörleştirme öncesi main.py döngüsü (ışın x engel, line_rect_collision)
+    mesafeler, noktalar = [], []
+    for aci in LIDAR_ACILAR:
+        dx, dy = math.cos(yon + aci), math.sin(yon + aci)
+        min_k = 1.0
+        for e in engeller:
+            k = line_rect_collision(x, y, x + dx*LIDAR_MESAFE, y + dy*LIDAR_MESAFE, e.rect)
+            if k and k < min_k: min_k = k
+        mesafe = min_k * LIDAR_MESAFE
+        mesafeler.append(mesafe)
+        noktalar.append((x + dx*mesafe, y + dy*mesafe))
+    return np.array(mesafeler), np.array(noktalar)
+
+
+@pytest.mark.parametrize("tohum", range(5))
+@pytest.mark.parametrize("sayi", [0, 1, 5, 20, 60])
+def test_tam_tarama_ozgun_donguyle_ayni(tohum, sayi):
+    rng = np.random.default_rng(100 + tohum)
+    for _ in range(40):
+        engeller = rastgele_engeller(rng, sayi)
+        x, y = rng.uniform(0, SIM_GENISLIK), rng.uniform(0, EKRAN_Y)
+        yon = rng.choice([0.0, math.pi / 2, -math.pi / 2, math.pi, rng.uniform(-math.pi, math.pi)])
+        beklenen, beklenen_noktalar = dongu_tara(x, y, yon, engeller)
+        mesafeler, noktalar = lidar_tara(x, y, yon, engel_dizisi(engeller), LIDAR_ACILAR, LIDAR_MESAFE)
+        np.testing.assert_allclose(mesafeler, beklenen, rtol=0, atol=1e-9)
+        np.testing.assert_allclose(noktalar, beklenen_noktalar, rtol=0, atol=1e-9)
+
+
+@pytest.mark.parametrize("tohum", range(5))
+@pytest.mark.parametrize("sayi", [0, 3, 12, 40])
+def test_izgara_tam_taramayla_ayni(tohum, sayi):
+    rng = np.random.default_rng(tohum)
+    engeller = rastgele_engeller(rng, sayi)
+    izgara = UzamsalIzgara(hucre_boyu=rng.choice([25, 50, 100]))
+    for e in engeller:
+        e.izgara = izgara
+        izgara.ekle(e)
+    for _ in range(60):
+        for e in engeller:
+            e.adim(1 / 60)   # hareket eden engeller ızgarada güncellenir
+        x, y = rng.uniform(0, SIM_GENISLIK), rng.uniform(0, EKRAN_Y)
+        # Eksene paralel ışınlar (yön 0, ±pi/2) da denensin
+        yon = rng.choice([0.0, math.pi / 2, -math.pi / 2, rng.uniform(-math.pi, math.pi)])
+        beklenen, beklenen_noktalar = lidar_tara(x, y, yon, engel_dizisi(engeller), LIDAR_ACILAR, LIDAR_MESAFE)
+        mesafeler, noktalar = lidar_tara_izgara(x, y, yon, izgara, LIDAR_ACILAR, LIDAR_MESAFE)
+        np.testing.assert_array_equal(mesafeler, beklenen)
+        np.testing.assert_array_equal(noktalar, beklenen_noktalar)
+
+
+@pytest.mark.parametrize("tohum", range(3))
+@pytest.mark.parametrize("sayi", [3, 12, 40])
+def test_artimsal_tam_taramayla_ayni(tohum, sayi):
+    rng = np.random.default_rng(tohum)
+    lidar = ArtimsalLidar(LIDAR_ACILAR, LIDAR_MESAFE)
+    kutular = np.array([(e.rect.left, e.rect.top, e.rect.right, e.rect.bottom) for e in rastgele_engeller(rng, sayi)])
+    hizlar = rng.choice([0.0, -1.0], size=sayi) * rng.uniform(0.3, 1.5, size=sayi)
+    x, y, yon = SIM_GENISLIK / 2, EKRAN_Y / 2, 0.0
+    for kare in range(400):
+        olay = rng.random()
+        if olay < 0.02:                      # sıçrama / sıfırlama: tam tarama yolu
+            x, y, yon = rng.uniform(0, SIM_GENISLIK), rng.uniform(0, EKRAN_Y), rng.uniform(-math.pi, math.pi)
+        elif olay < 0.04:
+            lidar.gecersiz_kil()
+        elif olay > 0.1:                     # aksi halde kare değişmez: önceki sonuç aynen dönmeli
+            x += math.cos(yon) * rng.uniform(0, 4); y += math.sin(yon) * rng.uniform(0, 4)
+            yon = math.remainder(yon + rng.normal(0, 0.03), math.tau)
+            kutular[:, [0, 2]] += hizlar[:, None]
+        beklenen, beklenen_noktalar = lidar_tara(x, y, yon, kutular, LIDAR_ACILAR, LIDAR_MESAFE)
+        mesafeler, noktalar = lidar.tara(x, y, yon, [tuple(k) for k in kutular.tolist()])
+        np.testing.assert_array_equal(mesafeler, beklenen, err_msg=f"kare {kare}")
+        np.testing.assert_array_equal(noktalar, beklenen_noktalar, err_msg=f"kare {kare}")
+    assert lidar.artimsal > 0 and lidar.ayni > 0 and lidar.tam > 0
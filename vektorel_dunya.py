@@ -0,0 +1,128 @@
+import sys
+import time
+import argparse
+import numpy as np
+from lidar import en_yakin_kesisim
+from simulasyon import (YapayZekaSurucusu, MCDMKararVerici, SIM_GENISLIK, EKRAN_Y, FPS, MAKS_HIZ,
+                        LIDAR_MESAFE, LIDAR_ACILAR, ENGEL_SAYISI, AKSIYON_DICT, YZ_AGIRLIGI, karar_matrisleri_toplu)
+
+# ---------- VEKTÖREL DÜNYA ----------
+# N bağımsız ortamı aynı anda adımlar. Araç durumu (x, y, yon, hiz, ivme) ve engel
+# kutuları/hızları NumPy dizilerinde tutulur (struct-of-arrays); Arac/Engel nesneleri yoktur.
+# Davranış simulasyon.Simulasyon.adim ile aynıdır (GPS gürültüsü karara girmediği için atlanır).
+
+SOLA, SAGA, FREN, SURDUR = (AKSIYON_DICT[a] for a in ("SOLA_KAÇIN", "SAĞA_KAÇIN", "FREN", "SÜRDÜR"))
+
+
+class VektorelDunya:
+    def __init__(self, ortam_sayisi, engel_sayisi=ENGEL_SAYISI, tohum=None, yz_surucu=None, mcdm=None):
+        self.n = ortam_sayisi
+        self.m = engel_sayisi
+        self.rng = np.random.default_rng(tohum)
+        self.mcdm = mcdm if mcdm is not None else MCDMKararVerici()
+        self.yz_surucu = yz_surucu if yz_surucu is not None else YapayZekaSurucusu()
+
+        self.x = np.zeros(self.n); self.y = np.zeros(self.n); self.yon = np.zeros(self.n)
+        self.hiz = np.zeros(self.n); self.ivme = np.zeros(self.n)
+        self.kutular = np.zeros((self.n, self.m, 4))   # [sol, üst, sağ, alt]
+        self.engel_hiz = np.zeros((self.n, self.m))
+        self.sifirlama_sayisi = np.zeros(self.n, dtype=np.int64)
+        self.adim_sayac = 0
+        self.sifirla(np.ones(self.n, dtype=bool))
+
+    def sifirla(self, maske):
+        # Yalnızca maskedeki ortamları yeniden başlatır (simulasyonu_sifirla karşılığı)
+        k = int(np.count_nonzero(maske))
+        if k == 0:
+            return
+        self.x[maske] = 100; self.y[maske] = EKRAN_Y / 2; self.yon[maske] = 0.0
+        self.hiz[maske] = 30.0; self.ivme[maske] = 0.0
+
+        # engelleri_rastgele_olustur ile aynı dağılımlar
+        sol = self.rng.integers(300, SIM_GENISLIK + 200, size=(k, self.m), endpoint=True)
+        ust = self.rng.integers(50, EKRAN_Y - 100, size=(k, self.m), endpoint=True)
+        w = self.rng.integers(30, 60, size=(k, self.m), endpoint=True)
+        h = self.rng.integers(30, 60, size=(k, self.m), endpoint=True)
+        dinamik = self.rng.random((k, self.m)) > 0.4
+        hiz = np.where(dinamik, self.rng.uniform(-80, -20, size=(k, self.m)), 0.0)
+
+        self.kutular[maske] = np.stack((sol, ust, sol + w, ust + h), axis=-1)
+        self.engel_hiz[maske] = hiz
+        self.sifirlama_sayisi[maske] += 1
+
+    def algila(self):
+        # (N, R) LIDAR mesafeleri, tüm ortamlar tek çağrıda
+        acilar = self.yon[:, None] + LIDAR_ACILAR[None, :]
+        dx = np.cos(acilar) * LIDAR_MESAFE; dy = np.sin(acilar) * LIDAR_MESAFE
+        ox = np.broadcast_to(self.x[:, None], dx.shape); oy = np.broadcast_to(self.y[:, None], dy.shape)
+        t, _ = en_yakin_kesisim(ox, oy, dx, dy, self.kutular)
+        return t * LIDAR_MESAFE
+
+    def karar_matrisleri(self, lidar):
+        return karar_matrisleri_toplu(lidar, self.hiz)
+
+    def karar_ver(self, lidar):
+        matrisler, orta = self.karar_matrisleri(lidar)
+        topsis_scores = self.mcdm.topsis_hesapla_toplu(matrisler)
+        if self.yz_surucu.egitildi:
+            girdiler = np.column_stack((lidar, self.hiz, self.ivme))
+            yz_probs = self.yz_surucu.olasiliklari_getir_toplu(girdiler)
+            final_scores = (topsis_scores * (1 - YZ_AGIRLIGI)) + (yz_probs * YZ_AGIRLIGI)
+        else:
+            yz_probs = np.full((self.n, 4), 0.25)
+            final_scores = topsis_scores
+        return topsis_scores, yz_probs, final_scores, orta
+
+    def aksiyonu_uygula(self, aksiyon, orta, dt):
+        sola = aksiyon == SOLA; saga = aksiyon == SAGA; fren = aksiyon == FREN; surdur = aksiyon == SURDUR
+        self.yon = self.yon - 1.5 * dt * sola + 1.5 * dt * saga
+        surdur_ivme = np.where(orta > 200, 50.0, np.where(orta > 120, 0.0, -30.0))
+        self.ivme = np.select([sola | saga, fren, surdur], [-10.0, -150.0, surdur_ivme], self.ivme)
+        # Aracı şeritte tut
+        self.yon = np.where(surdur, self.yon + (0 - self.yon) * 0.05, self.yon)
+
+    def adim(self, dt):
+        self.kutular[..., 0] += self.engel_hiz * dt
+        self.kutular[..., 2] += self.engel_hiz * dt
+        sifirlanan = (self.kutular[..., 2] < 0).any(axis=1)
+        self.sifirla(sifirlanan)
+
+        lidar = self.algila()
+        hiz, ivme = self.hiz.copy(), self.ivme.copy()
+        topsis_scores, yz_probs, final_scores, orta = self.karar_ver(lidar)
+        aksiyon = np.argmax(final_scores, axis=1)
+        self.aksiyonu_uygula(aksiyon, orta, dt)
+
+        # Arac.adim
+        self.hiz = np.clip(self.hiz + self.ivme * dt, 0.0, MAKS_HIZ)
+        self.x += np.cos(self.yon) * self.hiz * dt
+        self.y += np.sin(self.yon) * self.hiz * dt
+        self.adim_sayac += 1
+
+        return {"lidar": lidar, "hiz": hiz, "ivme": ivme, "topsis": topsis_scores, "yz": yz_probs,
+                "final": final_scores, "aksiyon": aksiyon, "sifirlandi": sifirlanan}
+
+    def calistir(self, adim_sayisi, dt=1.0 / FPS):
+        sonuc = None
+        for _ in range(adim_sayisi):
+            sonuc = self.adim(dt)
+        return sonuc
+
+def ana():
+    parser = argparse.ArgumentParser(description="N ortamlı vektörel simülasyon")
+    parser.add_argument("--ortam", type=int, default=256, help="Paralel ortam sayısı (N)")
+    parser.add_argument("--adim", type=int, default=1000, help="Ortam başına adım sayısı")
+    parser.add_argument("--engel", type=int, default=ENGEL_SAYISI, help="Ortam başına engel sayısı")
+    parser.add_argument("--dt", type=float, default=1.0 / FPS, help="Sabit zaman adımı (sn)")
+    parser.add_argument("--tohum", type=int, default=None, help="Rastgelelik tohumu")
+    args = parser.parse_args()
+
+    dunya = VektorelDunya(args.ortam, args.engel, tohum=args.tohum)
+    baslangic = time.perf_counter()
+    dunya.calistir(args.adim, args.dt)
+    sure = time.perf_counter() - baslangic
+    toplam = args.ortam * args.adim
+    print(f"[SONUÇ] {args.ortam} ortam x {args.adim} adım {sure:.2f} sn ({toplam / sure:.0f} ortam-adım/sn)")
+
+if __name__ == "__main__":
+    sys.exit(ana())
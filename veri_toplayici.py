@@ -0,0 +1,109 @@
+import sys
+import os
+import time
+import shutil
+import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from simulasyon import Simulasyon, YapayZekaSurucusu, CSV_BASLIKLARI, MODEL_DOSYA_ADI, FPS, ENGEL_SAYISI
+from kayit import VeriKaydedici, sema_yaz
+
+# ---------- PARALEL VERİ TOPLAYICI ----------
+# 'K' ile elle kayıt yerine, tohumlanmış bağımsız bölümleri tüm çekirdeklerde ekransız koşturur.
+# Bölüm i'nin tohumu (tohum + i); işçiler ardışık bölüm bloklarını alır ve parçalar sırayla
+# birleştirilir, böylece çıktı işçi sayısından bağımsız olarak aynıdır.
+# Her işçi kendi parçasını (parca_XXX.csv ya da parca_XXX.f32) bu çalıştırmaya ait geçici dizine
+# yazar; sonunda parçalar tek dosyada birleştirilir ve dizin silinir.
+
+def isci_hazirla():
+    # Süreç başına tek BLAS/OpenMP iş parçacığı: çekirdekler süreçler arasında paylaşılır
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(1)
+    except ImportError:
+        pass
+
+def _parca_calistir(gorev):
+    parca_no, bolumler, ayarlar = gorev
+    yz_surucu = YapayZekaSurucusu(ayarlar["model"])
+    uzanti = "f32" if ayarlar["cikti"].endswith(".f32") else "csv"
+    parca_yolu = os.path.join(ayarlar["parca_dizini"], f"parca_{parca_no:03d}.{uzanti}")
+    baslangic = time.perf_counter()
+    with VeriKaydedici(parca_yolu, blok_boyu=8192) as kaydedici:
+        for bolum_tohumu in bolumler:
+            sim = Simulasyon(yz_surucu=yz_surucu, engel_sayisi=ayarlar["engel"], tohum=bolum_tohumu)
+            for adim in range(1, ayarlar["adim"] + 1):
+                sonuc = sim.adim(ayarlar["dt"])
+                if adim % ayarlar["kayit_araligi"] == 0:
+                    kaydedici.kaydet(sonuc["lidar"], sonuc["hiz"], sonuc["ivme"], sonuc["aksiyon"])
+    satir_sayisi = kaydedici.toplam
+    sure = time.perf_counter() - baslangic
+    return parca_no, parca_yolu, satir_sayisi, sure
+
+def parcalari_birlestir(parca_yollari, cikti):
+    # Parçaları sırayla tek dosyaya ekler (egitici.py ile uyumlu)
+    ikili = cikti.endswith(".f32")
+    with open(cikti, "wb") as hedef:
+        if ikili:
+            sema_yaz(cikti)
+        else:
+            hedef.write((",".join(CSV_BASLIKLARI) + "\r\n").encode("utf-8"))
+        for yol in parca_yollari:
+            if not os.path.exists(yol): continue   # hiç satır üretmeyen parça
+            # CSV parçalarının başlığı atlanır
+            with open(yol, "rb") as kaynak:
+                if not ikili: kaynak.readline()
+                shutil.copyfileobj(kaynak, hedef, 1 << 20)
+
+def veri_topla(bolum_sayisi, adim, cikti, isci=None, tohum=0, kayit_araligi=10, engel=ENGEL_SAYISI,
+               dt=1.0 / FPS, model=MODEL_DOSYA_ADI, parca_dizini=None):
+    isci = isci or os.cpu_count() or 1
+    isci = max(1, min(isci, bolum_sayisi))
+    # Parçalar bu çalıştırmanın oluşturduğu geçici dizine yazılır (parca_dizini: geçici dizinin konumu,
+    # varsayılan çıktının dizini); aynı çıktıya yazan eşzamanlı çalıştırmalar birbirinin parçasını ezmez
+    parca_dizini = tempfile.mkdtemp(prefix=os.path.basename(os.path.splitext(cikti)[0]) + "_parcalar_",
+                                    dir=parca_dizini or os.path.dirname(cikti) or ".")
+    ayarlar = {"adim": adim, "kayit_araligi": kayit_araligi, "engel": engel, "dt": dt,
+               "model": model, "parca_dizini": parca_dizini, "cikti": cikti}
+
+    # Bölümleri işçilere ardışık bloklar halinde dağıt
+    sinirlar = [bolum_sayisi * w // isci for w in range(isci + 1)]
+    gorevler = [(w, [tohum + i for i in range(sinirlar[w], sinirlar[w + 1])], ayarlar) for w in range(isci)]
+
+    print(f"[İŞLEM] {bolum_sayisi} bölüm x {adim} adım, {isci} işçi ile toplanıyor...")
+    baslangic = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=isci, initializer=isci_hazirla) as havuz:
+            sonuclar = sorted(havuz.map(_parca_calistir, gorevler))
+        parcalari_birlestir([yol for _, yol, _, _ in sonuclar], cikti)
+    finally:
+        shutil.rmtree(parca_dizini, ignore_errors=True)
+    toplam_sure = time.perf_counter() - baslangic
+
+    toplam_satir = 0
+    for parca_no, _, satir_sayisi, sure in sonuclar:
+        toplam_satir += satir_sayisi
+        print(f"  İşçi {parca_no:03d}: {satir_sayisi} satır, {sure:.2f} sn ({satir_sayisi / max(sure, 1e-9):.0f} satır/sn)")
+
+    print(f"[SONUÇ] {toplam_satir} satır {toplam_sure:.2f} sn'de toplandı "
+          f"({toplam_satir / max(toplam_sure, 1e-9):.0f} satır/sn). Çıktı: {cikti}")
+    return toplam_satir
+
+def ana():
+    parser = argparse.ArgumentParser(description="Tohumlanmış paralel bölümlerle veri seti toplar")
+    parser.add_argument("--bolum", type=int, default=64, help="Bölüm (episode) sayısı")
+    parser.add_argument("--adim", type=int, default=3000, help="Bölüm başına adım sayısı")
+    parser.add_argument("--isci", type=int, default=None, help="İşçi süreç sayısı (varsayılan: çekirdek sayısı)")
+    parser.add_argument("--tohum", type=int, default=0, help="Temel tohum; bölüm i için tohum + i")
+    parser.add_argument("--kayit-araligi", type=int, default=10, help="Kaç adımda bir satır kaydedilir")
+    parser.add_argument("--engel", type=int, default=ENGEL_SAYISI, help="Engel sayısı")
+    parser.add_argument("--dt", type=float, default=1.0 / FPS, help="Sabit zaman adımı (sn)")
+    parser.add_argument("--model", default=MODEL_DOSYA_ADI, help="Etiketlemede kullanılacak KNN modeli ('' = Matematik Modu)")
+    parser.add_argument("--cikti", default="toplanan_veri_seti.csv", help="Birleştirilmiş çıktı (.csv veya ikili .f32)")
+    args = parser.parse_args()
+
+    veri_topla(args.bolum, args.adim, args.cikti, isci=args.isci, tohum=args.tohum,
+               kayit_araligi=args.kayit_araligi, engel=args.engel, dt=args.dt, model=args.model)
+
+if __name__ == "__main__":
+    sys.exit(ana())
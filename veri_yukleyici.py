@@ -0,0 +1,113 @@
+import os
+import io
+import numpy as np
+import pandas as pd
+from simulasyon import CSV_BASLIKLARI, AKSIYON_LISTESI
+from kayit import ikili_ac
+
+# ---------- AKAN (CHUNKED) VERİ YÜKLEYİCİ ----------
+# egitici.py ve analyze_data.py için ortak okuyucu. Veri seti bloklar halinde okunur:
+#   Lidar_*/HIZ/IVME -> float32, AKSIYON -> kategorik (AKSIYON_LISTESI sırasıyla int8 kod, bilinmeyen -1)
+# Başlık 40 ışınlı şemaya göre doğrulanır. Bellek kullanımı blok boyuyla sınırlıdır.
+# Paralel okuma için dosya parcalara_bol ile aralıklara bölünür (.f32: satır, .csv: bayt aralığı;
+# bir CSV satırı ilk baytının düştüğü aralığa aittir) ve her aralık bloklari_oku(..., aralik=) ile okunur.
+
+OZELLIK_SUTUNLARI = CSV_BASLIKLARI[:-1]
+SUTUN_TIPLERI = {**{s: np.float32 for s in OZELLIK_SUTUNLARI},
+                 "AKSIYON": pd.CategoricalDtype(categories=AKSIYON_LISTESI)}
+VARSAYILAN_BLOK = 65536
+
+def sema_dogrula(basliklar, yol=""):
+    basliklar = [b.strip() for b in basliklar]
+    if basliklar != CSV_BASLIKLARI:
+        eksik = [b for b in CSV_BASLIKLARI if b not in basliklar]
+        fazla = [b for b in basliklar if b not in CSV_BASLIKLARI]
+        raise ValueError(f"'{yol}' başlığı {len(CSV_BASLIKLARI) - 3} ışınlı şemayla uyuşmuyor "
+                         f"(eksik: {eksik[:5]}, fazla: {fazla[:5]})")
+
+def _csv_basligi(yol):
+    # Başlığı doğrular, başlık satırının bayt uzunluğunu döndürür
+    with open(yol, "rb") as f:
+        baslik = f.readline()
+    sema_dogrula(baslik.decode("utf-8").rstrip("\r\n").split(","), yol)
+    return len(baslik)
+
+def parcalara_bol(yol, parca_sayisi):
+    # Dosyayı yaklaşık eşit (bas, son) aralıklarına böler; .f32 için satır, .csv için bayt
+    if yol.endswith(".f32"):
+        bas, son = 0, len(ikili_ac(yol))
+    else:
+        bas, son = _csv_basligi(yol), os.path.getsize(yol)
+    sinirlar = [bas + (son - bas) * i // parca_sayisi for i in range(parca_sayisi + 1)]
+    return [(a, b) for a, b in zip(sinirlar[:-1], sinirlar[1:]) if b > a]
+
+def anlik_aralik(yol, boyut=None):
+    # Dosyanın ilk 'boyut' baytındaki (None: şu anki boyut) tam satırları kapsayan aralık, parcalara_bol
+    # birimleriyle. Dosyaya yazılmaya devam edilirken okuyan süreç sonradan eklenen satırları görmez
+    boyut = os.path.getsize(yol) if boyut is None else boyut
+    if yol.endswith(".f32"):
+        return 0, min(boyut // (len(CSV_BASLIKLARI) * 4), len(ikili_ac(yol)))
+    return _csv_basligi(yol), boyut
+
+def _csv_araligi_oku(yol, bas, son, blok_boyu):
+    with open(yol, "rb") as f:
+        if bas > 0:
+            # Önceki aralıkta başlayan satırın kalanı atlanır
+            f.seek(bas - 1)
+            f.readline()
+        while f.tell() < son:
+            ham = f.read(min(blok_boyu * 256, son - f.tell()))
+            if not ham.endswith(b"\n"):
+                ham += f.readline()
+            df = pd.read_csv(io.BytesIO(ham), header=None, names=CSV_BASLIKLARI, dtype=SUTUN_TIPLERI, engine="c")
+            yield df[OZELLIK_SUTUNLARI].to_numpy(dtype=np.float32), df["AKSIYON"].cat.codes.to_numpy(dtype=np.int8)
+
+def bloklari_oku(yol, blok_boyu=VARSAYILAN_BLOK, aralik=None):
+    """Veri setini (X float32 (n, 42), y int8 (n,)) blokları olarak üretir.
+
+    yol .csv ya da kayit.py'nin ikili .f32 biçimi olabilir. aralik verilirse yalnızca
+    parcalara_bol'un döndürdüğü o aralık okunur.
+    """
+    if yol.endswith(".f32"):
+        veri = ikili_ac(yol)
+        ilk, son = aralik or (0, len(veri))
+        for bas in range(ilk, son, blok_boyu):
+            blok = np.asarray(veri[bas:min(bas + blok_boyu, son)])
+            yield blok[:, :-1], blok[:, -1].astype(np.int8)
+        return
+
+    if aralik is not None:
+        _csv_basligi(yol)
+        yield from _csv_araligi_oku(yol, aralik[0], aralik[1], blok_boyu)
+        return
+    with open(yol, "r", encoding="utf-8") as f:
+        sema_dogrula(f.readline().rstrip("\r\n").split(","), yol)
+    okuyucu = pd.read_csv(yol, dtype=SUTUN_TIPLERI, chunksize=blok_boyu, engine="c")
+    for df in okuyucu:
+        X = df[OZELLIK_SUTUNLARI].to_numpy(dtype=np.float32)
+        y = df["AKSIYON"].cat.codes.to_numpy(dtype=np.int8)
+        yield X, y
+
+def tamamini_yukle(yol, blok_boyu=VARSAYILAN_BLOK, aralik=None):
+    # Tüm blokları (ya da aralığı) float32 olarak birleştirir (eğitim için); .f32 dosyada kopyasız memmap döner
+    if yol.endswith(".f32"):
+        veri = ikili_ac(yol)
+        if aralik is not None:
+            veri = veri[aralik[0]:aralik[1]]
+        return veri[:, :-1], veri[:, -1].astype(np.int8)
+    X_bloklar = []; y_bloklar = []
+    for X, y in bloklari_oku(yol, blok_boyu, aralik):
+        X_bloklar.append(X); y_bloklar.append(y)
+    if not X_bloklar:
+        return np.zeros((0, len(OZELLIK_SUTUNLARI)), dtype=np.float32), np.zeros(0, dtype=np.int8)
+    return np.concatenate(X_bloklar), np.concatenate(y_bloklar)
+
+def etiket_adlari(y):
+    # int8 kodları AKSIYON_LISTESI adlarına çevirir (model.classes_ metin kalsın diye). Bilinmeyen (-1) ve
+    # aralık dışı kodlar önceden ayıklanmalıdır; negatif indeksleme sessizce başka bir eyleme düşerdi
+    y = np.asarray(y)
+    gecersiz = (y < 0) | (y >= len(AKSIYON_LISTESI))
+    if gecersiz.any():
+        raise ValueError(f"{int(gecersiz.sum())} etiket kodu 0..{len(AKSIYON_LISTESI) - 1} aralığında değil "
+                         f"(örn. {np.unique(y[gecersiz])[:5].tolist()}); bilinmeyen etiketli satırları ayıklayın")
+    return np.array(AKSIYON_LISTESI, dtype=object)[y]